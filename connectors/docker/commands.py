@@ -1,17 +1,43 @@
-"""Utilities for running Docker commands."""
+"""Utilities for running Docker commands.
+
+Images and containers are managed through a Docker SDK client shared by the
+whole process, which keeps a pool of connections to the Docker daemon instead
+of spawning a Docker CLI process per operation, and returns structured
+results. Image archives are still loaded, saved, and pushed with the Docker
+CLI, whose output is streamed as is.
+"""
 
-import json
 import logging
 import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
+import docker
+from docker.errors import APIError, ImageNotFound
+
+from connectors.docker.docker_registry_connector import DOCKER_BASE_URL
+
 DOCKER_REGISTRY_URI = os.environ.get("DOCKER_REGISTRY_URI", "localhost:5000")
 DOCKER_USERNAME = os.environ.get("DOCKER_USERNAME", "")
 DOCKER_PASSWORD_FILE = os.environ.get("DOCKER_PASSWORD_FILE", "")
 DOCKER_REPOSITORY = os.environ.get("DOCKER_REPOSITORY", "simlab-systems")
+DOCKER_PREFETCH_WORKERS = int(os.environ.get("DOCKER_PREFETCH_WORKERS", "4"))
+
+# Registries logged in to by this process, with the credentials used
+_LOGGED_IN: Set[Tuple[str, str, str]] = set()
+_CLI_LOGGED_IN: Set[Tuple[str, str, str]] = set()
+_LOGIN_LOCK = threading.Lock()
+
+# Statuses of the events of a container that stopped running
+_EXIT_EVENTS = {"die", "destroy"}
+
+_DOCKER_CLIENT: Optional[docker.DockerClient] = None
+_DOCKER_CLIENT_LOCK = threading.Lock()
 
 
 @dataclass
@@ -24,6 +50,33 @@ class DockerRegistryMetadata:
     repository: str = DOCKER_REPOSITORY
 
 
+def get_docker_client() -> docker.DockerClient:
+    """Gets the Docker SDK client shared by the process.
+
+    The client is created on first use and is safe to use from several
+    threads.
+
+    Returns:
+        Docker client.
+    """
+    global _DOCKER_CLIENT
+    with _DOCKER_CLIENT_LOCK:
+        if _DOCKER_CLIENT is None:
+            _DOCKER_CLIENT = docker.DockerClient(base_url=DOCKER_BASE_URL)
+        return _DOCKER_CLIENT
+
+
+def close_docker_client() -> None:
+    """Closes the shared Docker SDK client, if any."""
+    global _DOCKER_CLIENT
+    with _DOCKER_CLIENT_LOCK:
+        if _DOCKER_CLIENT is not None:
+            _DOCKER_CLIENT.close()
+            _DOCKER_CLIENT = None
+    with _LOGIN_LOCK:
+        _LOGGED_IN.clear()
+
+
 def get_remote_image_tag(
     image: str,
     docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
@@ -49,20 +102,80 @@ def get_remote_image_tag(
     return f"{registry_host}/{docker_metadata.repository}/{name}", tag
 
 
+def get_image_tag(
+    image: str,
+    docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
+) -> str:
+    """Gets the full tag of an image in the remote Docker registry.
+
+    Args:
+        image: Image name.
+        docker_metadata: Docker registry metadata.
+
+    Returns:
+        Image tag.
+    """
+    remote_repo, tag = get_remote_image_tag(image, docker_metadata)
+    if not tag:
+        return remote_repo
+    return f"{remote_repo}:{tag}"
+
+
 def docker_login(
     docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
+    force: bool = False,
 ) -> None:
     """Logs in to the remote Docker registry.
 
+    The shared client is logged in once per set of credentials, and keeps
+    them for the following pulls.
+
     Args:
         docker_metadata: Docker registry metadata.
+        force: Whether to log in even if already logged in. Defaults to False.
     """
-    auth_command = (
-        f"cat {docker_metadata.password_file} | docker login --username "
-        f"{docker_metadata.username} --password-stdin "
-        f"{docker_metadata.registry_uri}"
+    credentials = (
+        docker_metadata.registry_uri,
+        docker_metadata.username,
+        docker_metadata.password_file,
     )
-    subprocess.run(auth_command, shell=True, check=True)
+    with _LOGIN_LOCK:
+        if credentials in _LOGGED_IN and not force:
+            return
+        with open(docker_metadata.password_file) as f:
+            password = f.read().strip()
+        get_docker_client().login(
+            username=docker_metadata.username,
+            password=password,
+            registry=docker_metadata.registry_uri,
+            reauth=force,
+        )
+        _LOGGED_IN.add(credentials)
+
+
+def _docker_cli_login(
+    docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
+) -> None:
+    """Logs the Docker CLI in to the remote Docker registry, once.
+
+    Args:
+        docker_metadata: Docker registry metadata.
+    """
+    credentials = (
+        docker_metadata.registry_uri,
+        docker_metadata.username,
+        docker_metadata.password_file,
+    )
+    with _LOGIN_LOCK:
+        if credentials in _CLI_LOGGED_IN:
+            return
+        auth_command = (
+            f"cat {docker_metadata.password_file} | docker login --username "
+            f"{docker_metadata.username} --password-stdin "
+            f"{docker_metadata.registry_uri}"
+        )
+        subprocess.run(auth_command, shell=True, check=True)
+        _CLI_LOGGED_IN.add(credentials)
 
 
 def inspect_image(image_name: str) -> Dict[str, Any]:
@@ -74,11 +187,7 @@ def inspect_image(image_name: str) -> Dict[str, Any]:
     Returns:
         Image information.
     """
-    inspect_command = f"docker image inspect -f json {image_name}"
-    result = subprocess.run(
-        inspect_command, shell=True, check=True, capture_output=True
-    )
-    return json.loads(result.stdout.decode())[0]
+    return get_docker_client().api.inspect_image(image_name)
 
 
 def load_image(image_path: str) -> Dict[str, Any]:
@@ -134,30 +243,112 @@ def stream_save_image(image_name: str):
         )
 
 
+def get_local_image_digests(image_tag: str) -> Set[str]:
+    """Gets the registry digests of a local image.
+
+    Args:
+        image_tag: Image tag.
+
+    Returns:
+        Digests of the image, empty if the image is not present locally.
+    """
+    try:
+        image = get_docker_client().images.get(image_tag)
+    except ImageNotFound:
+        return set()
+    return {
+        repo_digest.split("@")[-1]
+        for repo_digest in image.attrs.get("RepoDigests") or []
+    }
+
+
+def get_remote_image_digest(image_tag: str) -> Optional[str]:
+    """Gets the digest of an image in the remote Docker registry.
+
+    Only the manifest is fetched, not the layers.
+
+    Args:
+        image_tag: Image tag.
+
+    Returns:
+        Digest of the image, or None if it cannot be resolved.
+    """
+    try:
+        return get_docker_client().images.get_registry_data(image_tag).id
+    except APIError:
+        return None
+
+
+def is_image_up_to_date(image_tag: str) -> bool:
+    """Checks if a local image has the same digest as in the remote registry.
+
+    Args:
+        image_tag: Image tag.
+
+    Returns:
+        True if the image is present locally and up to date, False otherwise.
+    """
+    local_digests = get_local_image_digests(image_tag)
+    if not local_digests:
+        return False
+    return get_remote_image_digest(image_tag) in local_digests
+
+
 def docker_pull_image(
     image_name: str,
     docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
+    skip_up_to_date: bool = True,
 ) -> str:
     """Pulls an image from the remote Docker registry.
 
     Args:
         image_name: Image name.
         docker_metadata: Docker registry metadata.
+        skip_up_to_date: Whether to skip the pull if the local image has the
+          same digest as the remote one. Defaults to True.
 
     Returns:
         Image tag.
     """
     docker_login(docker_metadata)
+    image_tag = get_image_tag(image_name, docker_metadata)
+    if skip_up_to_date and is_image_up_to_date(image_tag):
+        return image_tag
+
     remote_repo, tag = get_remote_image_tag(image_name, docker_metadata)
+    get_docker_client().images.pull(remote_repo, tag=tag)
+    return image_tag
 
-    if not tag:
-        image_tag = remote_repo
-    else:
-        image_tag = f"{remote_repo}:{tag}"
 
-    pull_command = f"docker pull {image_tag}"
-    subprocess.run(pull_command, shell=True, check=True)
-    return image_tag
+def docker_prefetch_images(
+    image_names: Iterable[str],
+    docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
+    max_workers: int = DOCKER_PREFETCH_WORKERS,
+) -> Dict[str, str]:
+    """Pulls images from the remote Docker registry in parallel.
+
+    The registry is logged in to once, and images already up to date locally
+    are not pulled again.
+
+    Args:
+        image_names: Image names, duplicates are pulled once.
+        docker_metadata: Docker registry metadata.
+        max_workers: Maximum number of concurrent pulls. Defaults to
+          DOCKER_PREFETCH_WORKERS.
+
+    Returns:
+        Image tag per image name.
+    """
+    image_names = list(dict.fromkeys(image_names))
+    if not image_names:
+        return {}
+    docker_login(docker_metadata)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        image_tags = executor.map(
+            lambda image_name: docker_pull_image(image_name, docker_metadata),
+            image_names,
+        )
+        return dict(zip(image_names, image_tags))
 
 
 def docker_stream_push_image(
@@ -176,13 +367,8 @@ def docker_stream_push_image(
     Yields:
         Docker logs output.
     """
-    docker_login(docker_metadata)
-    remote_repo, tag = get_remote_image_tag(image_name, docker_metadata)
-
-    if not tag:
-        image_tag = remote_repo
-    else:
-        image_tag = f"{remote_repo}:{tag}"
+    _docker_cli_login(docker_metadata)
+    image_tag = get_image_tag(image_name, docker_metadata)
 
     # Add new tag to the image
     tag_command = f"docker tag {image_name} {image_tag}"
@@ -219,44 +405,39 @@ def image_exists(image_name: str) -> bool:
     Returns:
         True if the image exists, False otherwise.
     """
-    check_command = f"docker inspect {image_name}"
-    result = subprocess.run(check_command, shell=True)
-    return result.returncode == 0
+    try:
+        get_docker_client().images.get(image_name)
+    except ImageNotFound:
+        return False
+    return True
 
 
 def docker_run_container(
     image_name: str,
-    run_args: str = "",
+    ports: Optional[Dict[str, int]] = None,
     docker_metadata: DockerRegistryMetadata = DockerRegistryMetadata(),
 ) -> str:
     """Runs a container from an image.
 
     Args:
         image_name: Image name.
-        run_args: Arguments for the run command. Defaults to empty string.
+        ports: Local port bound to each port of the container, e.g.,
+          {"5000/tcp": 7000}. Defaults to None, i.e., no port is bound.
         docker_metadata: Docker registry metadata.
 
     Returns:
         Container ID.
     """
-    docker_login(docker_metadata)
-    remote_repo, tag = get_remote_image_tag(image_name, docker_metadata)
-
-    if not tag:
-        image_tag = remote_repo
-    else:
-        image_tag = f"{remote_repo}:{tag}"
+    image_tag = get_image_tag(image_name, docker_metadata)
 
     # Check if the image exists
     if not image_exists(image_tag):
         docker_pull_image(image_name, docker_metadata)
 
-    run_command = f"docker run -d {run_args} {image_tag}"
-    result = subprocess.run(
-        run_command, shell=True, check=True, capture_output=True
+    container = get_docker_client().containers.run(
+        image_tag, detach=True, ports=ports
     )
-    container_id = result.stdout.decode().strip()
-    return container_id
+    return container.id
 
 
 def docker_stop_container(container_id: str) -> None:
@@ -265,10 +446,100 @@ def docker_stop_container(container_id: str) -> None:
     Args:
         container_id: Container ID.
     """
-    stop_command = f"docker container stop {container_id}"
-    subprocess.run(stop_command, shell=True, check=True)
-    delete_command = f"docker container rm {container_id}"
-    subprocess.run(delete_command, shell=True, check=True)
+    container = get_docker_client().containers.get(container_id)
+    container.stop()
+    container.remove()
+
+
+def docker_container_events(
+    container_ids: List[str],
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Streams the events of containers from the Docker daemon.
+
+    The stream can be closed with its `close` method, including from another
+    thread to stop iterating over it.
+
+    Args:
+        container_ids: Container IDs.
+        since: Timestamp from which past events are included. Defaults to
+          None, i.e., only new events.
+        until: Timestamp after which the stream ends. Defaults to None, i.e.,
+          the stream has to be closed.
+
+    Returns:
+        Events, e.g., with "status" "start", "die", or "health_status".
+    """
+    return get_docker_client().events(
+        decode=True,
+        since=since,
+        until=until,
+        filters={"type": "container", "container": container_ids},
+    )
+
+
+@contextmanager
+def watch_container_exit(
+    container_id: str, since: Optional[float] = None
+) -> Iterator[threading.Event]:
+    """Watches the die events of a container in a background thread.
+
+    Args:
+        container_id: Container ID.
+        since: Timestamp from which past events are included, e.g., the start
+          time of the container. Defaults to None.
+
+    Yields:
+        Event set once the container exits.
+    """
+    exited = threading.Event()
+    events = docker_container_events([container_id], since=since)
+
+    def watch() -> None:
+        try:
+            for event in events:
+                if event.get("status") in _EXIT_EVENTS:
+                    exited.set()
+                    return
+        except Exception:
+            # The stream fails when it is closed
+            pass
+
+    thread = threading.Thread(target=watch, daemon=True)
+    thread.start()
+    try:
+        yield exited
+    finally:
+        events.close()
+
+
+def get_container_health(container_id: str) -> Optional[str]:
+    """Gets the status of the health check of a container.
+
+    Args:
+        container_id: Container ID.
+
+    Returns:
+        "starting", "healthy", or "unhealthy", or None if the container has
+        no health check.
+    """
+    state = get_docker_client().api.inspect_container(container_id)["State"]
+    return (state.get("Health") or {}).get("Status")
+
+
+def has_healthcheck(image_info: Dict[str, Any]) -> bool:
+    """Checks if an image declares a health check.
+
+    Args:
+        image_info: Image information, as returned by `inspect_image`.
+
+    Returns:
+        True if the image has a health check, False otherwise.
+    """
+    healthcheck = (image_info.get("Config") or {}).get("Healthcheck") or {}
+    test = healthcheck.get("Test") or []
+    return bool(test) and test[0] != "NONE"
 
 
 def delete_image(image_id: str) -> None:
@@ -277,76 +548,47 @@ def delete_image(image_id: str) -> None:
     Args:
         image_id: Image ID.
     """
-    delete_command = f"docker rmi {image_id}"
-    subprocess.run(delete_command, shell=True, check=True)
+    get_docker_client().images.remove(image_id)
 
 
 def clean_local_docker_registry() -> None:
-    """Cleans the local Docker registry."""
-    exited_containers_command = "docker ps -aq -f status=exited 2>/dev/null"
-    dangling_images_command = (
-        'docker images -q --filter "dangling=true" 2>/dev/null'
-    )
+    """Cleans the local Docker registry.
 
+    Stopped containers and dangling images are each removed with a single
+    request.
+
+    Raises:
+        APIError: If the Docker daemon fails to remove them.
+    """
+    client = get_docker_client()
     try:
-        result = subprocess.run(
-            exited_containers_command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True,
+        deleted_containers = (
+            client.containers.prune().get("ContainersDeleted") or []
         )
-        exited_container_ids = result.stdout.strip()
-
-        if exited_container_ids:
-            delete_containers_command = (
-                f"docker rm {exited_container_ids} 2>/dev/null"
-            )
-            subprocess.run(delete_containers_command, shell=True, check=True)
+        if deleted_containers:
             logging.info(
-                "Successfully cleaned up exited Docker containers: "
-                f"{exited_container_ids}"
+                "Successfully cleaned up stopped Docker containers: "
+                f"{deleted_containers}"
             )
         else:
             logging.info(
-                "No exited Docker containers found to clean up. "
+                "No stopped Docker containers found to clean up. "
                 "Skipping removal."
             )
 
-        result = subprocess.run(
-            dangling_images_command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True,
+        deleted_images = (
+            client.images.prune(filters={"dangling": True}).get("ImagesDeleted")
+            or []
         )
-        dangling_image_ids = result.stdout.strip()
-
-        if dangling_image_ids:
-            delete_images_command = (
-                f"docker rmi {dangling_image_ids} -f 2>/dev/null"
-            )
-            subprocess.run(delete_images_command, shell=True, check=True)
+        if deleted_images:
             logging.info(
                 "Successfully cleaned up dangling Docker images: "
-                f"{dangling_image_ids}"
+                f"{deleted_images}"
             )
         else:
             logging.info(
                 "No dangling Docker images found to clean up. Skipping removal."
             )
-
-    except subprocess.CalledProcessError as e:
+    except APIError as e:
         logging.error(f"Error during Docker cleanup: {e}")
-        logging.error(f"Command failed: {e.cmd}")
-        logging.error(f"Return code: {e.returncode}")
-        if e.stdout:
-            logging.error(f"Stdout: {e.stdout}")
-        if e.stderr:
-            logging.error(f"Stderr: {e.stderr}")
-        raise
-    except Exception as e:
-        logging.error(
-            f"An unexpected error occurred during Docker cleanup: {e}"
-        )
         raise
@@ -0,0 +1,165 @@
+"""Disk-budgeted cache of participant images on a worker.
+
+Images pulled for a run are kept in the local Docker registry afterwards, so
+that the next runs using them only check their digest instead of pulling them
+again. The last use and size of each cached image are stored in an SQLite
+database, shared by the runs of the worker. Once the total size of the cached
+images exceeds the disk budget, the least recently used ones are removed
+until it fits again.
+
+The cache is configured with the environment variables
+DOCKER_IMAGE_CACHE_PATH and DOCKER_IMAGE_CACHE_BUDGET_GB.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from docker.errors import APIError, ImageNotFound
+
+from connectors.docker.commands import get_docker_client
+
+DOCKER_IMAGE_CACHE_PATH = os.environ.get(
+    "DOCKER_IMAGE_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".simlab", "image_cache.sqlite"),
+)
+DOCKER_IMAGE_CACHE_BUDGET_GB = float(
+    os.environ.get("DOCKER_IMAGE_CACHE_BUDGET_GB", "20")
+)
+
+
+class ImageCache:
+    def __init__(
+        self,
+        path: str = DOCKER_IMAGE_CACHE_PATH,
+        budget_gb: float = DOCKER_IMAGE_CACHE_BUDGET_GB,
+    ) -> None:
+        """Initializes the image cache.
+
+        Args:
+            path: Path to the SQLite database, created if needed. Defaults to
+              DOCKER_IMAGE_CACHE_PATH.
+            budget_gb: Disk budget of the cached images in GB. Defaults to
+              DOCKER_IMAGE_CACHE_BUDGET_GB.
+        """
+        self.path = path
+        self.budget = int(budget_gb * 1024**3)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS images ("
+                "image_tag TEXT PRIMARY KEY, "
+                "image_id TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "last_use REAL NOT NULL)"
+            )
+
+    def record_use(self, image_tags: Iterable[str]) -> None:
+        """Records that images are used by the current run.
+
+        Images missing from the local Docker registry are ignored.
+
+        Args:
+            image_tags: Tags of the local images.
+        """
+        now = time.time()
+        rows = []
+        for image_tag in dict.fromkeys(image_tags):
+            try:
+                image = get_docker_client().images.get(image_tag)
+            except ImageNotFound:
+                logging.warning(f"Image {image_tag} to cache not found.")
+                continue
+            rows.append((image_tag, image.id, image.attrs.get("Size", 0), now))
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO images "
+                "(image_tag, image_id, size, last_use) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def total_size(self) -> int:
+        """Returns the size of the cached images in bytes.
+
+        Tags of the same image are counted once.
+        """
+        with self._lock:
+            (size,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size "
+                "FROM images GROUP BY image_id)"
+            ).fetchone()
+        return size
+
+    def evict(self, budget: Optional[int] = None) -> List[str]:
+        """Removes least recently used images until the budget is met.
+
+        Nothing is removed if the cached images fit in the budget. Images
+        used by a container cannot be removed and are skipped.
+
+        Args:
+            budget: Disk budget in bytes. Defaults to the budget of the cache.
+
+        Returns:
+            Tags of the removed images.
+        """
+        budget = self.budget if budget is None else budget
+        removed: List[str] = []
+        excess = self.total_size() - budget
+        if excess <= 0:
+            return removed
+
+        for image_tag, image_id, size in self._least_recently_used():
+            if excess <= 0:
+                break
+            try:
+                get_docker_client().images.remove(image_tag)
+            except ImageNotFound:
+                # Removed by someone else, it no longer takes up space
+                pass
+            except APIError as e:
+                logging.warning(f"Failed to evict image {image_tag}: {e}")
+                continue
+            removed.append(image_tag)
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "DELETE FROM images WHERE image_tag = ?", (image_tag,)
+                )
+                (remaining_tags,) = self._connection.execute(
+                    "SELECT COUNT(*) FROM images WHERE image_id = ?",
+                    (image_id,),
+                ).fetchone()
+            # The image is only deleted along with its last tag
+            if remaining_tags == 0:
+                excess -= size
+
+        if removed:
+            logging.info(f"Evicted cached Docker images: {removed}")
+        return removed
+
+    def _least_recently_used(self) -> List[Tuple[str, str, int]]:
+        """Returns the cached images from the least recently used.
+
+        Returns:
+            Tag, ID, and size of each cached image.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT image_tag, image_id, size FROM images "
+                "ORDER BY last_use"
+            ).fetchall()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,331 @@
+"""Persistent cache of utterance annotations.
+
+Annotations are stored in an SQLite database and addressed by the fingerprint
+of the component that produced them, the hash of the utterance text, and the
+participant. Identical utterances annotated by the same component are hence
+only processed once, including across runs. The number of entries is bounded,
+the least recently used ones are evicted first. As counting the entries scans
+the whole table, the bound is only checked every few inserts and may be
+exceeded by up to one percent in between.
+
+The default cache of the process is configured with the environment variables
+ANNOTATION_CACHE_PATH, which enables it, and ANNOTATION_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.intent import Intent
+from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
+
+ANNOTATION_CACHE_PATH = os.environ.get("ANNOTATION_CACHE_PATH")
+ANNOTATION_CACHE_MAX_ENTRIES = int(
+    os.environ.get("ANNOTATION_CACHE_MAX_ENTRIES", "1000000")
+)
+# Participant used for annotations that do not depend on the participant
+ANY_PARTICIPANT = "ANY"
+
+# Maximum number of entries looked up per query, below the limit of 999
+# parameters of older SQLite versions
+_QUERY_CHUNK_SIZE = 300
+# Maximum number of inserted entries between two checks of the size bound
+_EVICTION_CHECK_INTERVAL = 1000
+
+_CacheKey = Tuple[str, str]
+
+
+def hash_text(text: str) -> str:
+    """Hashes a text.
+
+    Args:
+        text: Text to hash.
+
+    Returns:
+        Hexadecimal SHA-256 digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def dialogue_acts_to_json(dialogue_acts: List[DialogueAct]) -> List[Any]:
+    """Converts dialogue acts to a JSON serializable format.
+
+    Args:
+        dialogue_acts: List of dialogue acts.
+
+    Returns:
+        Dialogue acts in the format of the dialogue exports.
+    """
+    return [
+        {
+            "intent": da.intent.label if da.intent is not None else None,
+            "slot_values": [
+                [
+                    annotation.slot,
+                    annotation.value,
+                    annotation.start,
+                    annotation.end,
+                ]
+                for annotation in da.annotations
+            ],
+        }
+        for da in dialogue_acts
+    ]
+
+
+def dialogue_acts_from_json(data: List[Any]) -> List[DialogueAct]:
+    """Converts dialogue acts from their JSON serializable format.
+
+    Args:
+        data: Dialogue acts in the format of the dialogue exports.
+
+    Returns:
+        List of dialogue acts.
+    """
+    return [
+        DialogueAct(
+            Intent(da["intent"]) if da["intent"] is not None else None,
+            [
+                SlotValueAnnotation(slot, value, start, end)
+                for slot, value, start, end in da["slot_values"]
+            ],
+        )
+        for da in data
+    ]
+
+
+def _keys_table(
+    fingerprint: str, hash_keys: List[_CacheKey]
+) -> Tuple[str, List[str]]:
+    """Builds a table of entry keys to join with the annotations.
+
+    Joining on the primary key looks each entry up in the index, whereas
+    filtering on a list of row values scans the whole table.
+
+    Args:
+        fingerprint: Fingerprint of the annotating component.
+        hash_keys: Pairs of utterance text hash and participant.
+
+    Returns:
+        SQL table of columns fingerprint, text hash, and participant, and its
+        parameters.
+    """
+    values = ", ".join(["(?, ?, ?)"] * len(hash_keys))
+    parameters = [
+        value
+        for text_hash, participant in hash_keys
+        for value in (fingerprint, text_hash, participant)
+    ]
+    return f"(VALUES {values})", parameters
+
+
+class AnnotationCache:
+    def __init__(
+        self, path: str, max_entries: int = ANNOTATION_CACHE_MAX_ENTRIES
+    ) -> None:
+        """Initializes the annotation cache.
+
+        Args:
+            path: Path to the SQLite database, created if needed.
+            max_entries: Maximum number of cached annotations. Defaults to
+              ANNOTATION_CACHE_MAX_ENTRIES.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._eviction_check_interval = max(
+            1, min(_EVICTION_CHECK_INTERVAL, max_entries // 100)
+        )
+        self._inserts_since_eviction = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS annotations ("
+                "fingerprint TEXT NOT NULL, "
+                "text_hash TEXT NOT NULL, "
+                "participant TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "last_access REAL NOT NULL, "
+                "PRIMARY KEY (fingerprint, text_hash, participant))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS annotations_last_access "
+                "ON annotations (last_access)"
+            )
+
+    def get_many(
+        self, fingerprint: str, keys: Iterable[_CacheKey]
+    ) -> Dict[_CacheKey, Any]:
+        """Gets the cached annotations of utterances.
+
+        Args:
+            fingerprint: Fingerprint of the annotating component.
+            keys: Pairs of utterance text and participant.
+
+        Returns:
+            Cached annotations per pair of utterance text and participant,
+            missing pairs are not included.
+        """
+        keys = list(dict.fromkeys(keys))
+        hashes = {
+            (hash_text(text), participant): (text, participant)
+            for text, participant in keys
+        }
+        hash_keys = list(hashes)
+        found: Dict[_CacheKey, Any] = {}
+        now = time.time()
+        with self._lock, self._connection:
+            for start in range(0, len(hash_keys), _QUERY_CHUNK_SIZE):
+                chunk = hash_keys[start : start + _QUERY_CHUNK_SIZE]
+                keys_table, parameters = _keys_table(fingerprint, chunk)
+                rows = self._connection.execute(
+                    "SELECT a.rowid, a.text_hash, a.participant, a.value "
+                    f"FROM {keys_table} AS k JOIN annotations AS a "
+                    "ON a.fingerprint = k.column1 AND a.text_hash = k.column2 "
+                    "AND a.participant = k.column3",
+                    parameters,
+                ).fetchall()
+                for _, text_hash, participant, value in rows:
+                    found[hashes[(text_hash, participant)]] = json.loads(value)
+                if rows:
+                    self._connection.execute(
+                        "UPDATE annotations SET last_access = ? WHERE rowid "
+                        f"IN ({', '.join(['?'] * len(rows))})",
+                        [now] + [row[0] for row in rows],
+                    )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(
+        self, fingerprint: str, text: str, participant: str = ANY_PARTICIPANT
+    ) -> Optional[Any]:
+        """Gets the cached annotation of an utterance.
+
+        Args:
+            fingerprint: Fingerprint of the annotating component.
+            text: Utterance text.
+            participant: Participant. Defaults to ANY_PARTICIPANT.
+
+        Returns:
+            Cached annotation, or None if not cached.
+        """
+        return self.get_many(fingerprint, [(text, participant)]).get(
+            (text, participant)
+        )
+
+    def set_many(self, fingerprint: str, values: Dict[_CacheKey, Any]) -> None:
+        """Caches the annotations of utterances.
+
+        Args:
+            fingerprint: Fingerprint of the annotating component.
+            values: JSON serializable annotations per pair of utterance text
+              and participant.
+        """
+        if not values:
+            return
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO annotations "
+                "(fingerprint, text_hash, participant, value, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        fingerprint,
+                        hash_text(text),
+                        participant,
+                        json.dumps(v),
+                        now,
+                    )
+                    for (text, participant), v in values.items()
+                ],
+            )
+            self._inserts_since_eviction += len(values)
+            if self._inserts_since_eviction >= self._eviction_check_interval:
+                self._evict()
+
+    def set(
+        self,
+        fingerprint: str,
+        text: str,
+        value: Any,
+        participant: str = ANY_PARTICIPANT,
+    ) -> None:
+        """Caches the annotation of an utterance.
+
+        Args:
+            fingerprint: Fingerprint of the annotating component.
+            text: Utterance text.
+            value: JSON serializable annotation.
+            participant: Participant. Defaults to ANY_PARTICIPANT.
+        """
+        self.set_many(fingerprint, {(text, participant): value})
+
+    def _evict(self) -> None:
+        """Deletes the least recently used entries exceeding the size bound.
+
+        Must be called within a transaction.
+        """
+        self._inserts_since_eviction = 0
+        (num_entries,) = self._connection.execute(
+            "SELECT COUNT(*) FROM annotations"
+        ).fetchone()
+        if num_entries <= self.max_entries:
+            return
+        self._connection.execute(
+            "DELETE FROM annotations WHERE rowid IN (SELECT rowid "
+            "FROM annotations ORDER BY last_access LIMIT ?)",
+            (num_entries - self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of cached annotations."""
+        with self._lock:
+            (num_entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM annotations"
+            ).fetchone()
+        return num_entries
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit and miss counters of the cache."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+_CACHES: Dict[str, AnnotationCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_default_annotation_cache() -> Optional[AnnotationCache]:
+    """Gets the annotation cache shared by the components of the process.
+
+    Returns:
+        Annotation cache, or None if ANNOTATION_CACHE_PATH is not set.
+    """
+    if not ANNOTATION_CACHE_PATH:
+        return None
+    with _CACHES_LOCK:
+        if ANNOTATION_CACHE_PATH not in _CACHES:
+            _CACHES[ANNOTATION_CACHE_PATH] = AnnotationCache(
+                ANNOTATION_CACHE_PATH
+            )
+        return _CACHES[ANNOTATION_CACHE_PATH]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from dialoguekit.core.annotation import Annotation
 from dialoguekit.core.utterance import Utterance
@@ -29,6 +29,18 @@ class Annotator(ABC):
         """
         raise NotImplementedError
 
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint identifying the output of the annotator.
+
+        Two annotators with the same fingerprint must produce the same output
+        for the same input, which allows caching it. Subclasses should
+        override this method to enable caching.
+
+        Returns:
+            Fingerprint, or None if the output cannot be cached.
+        """
+        return None
+
     @abstractmethod
     def save_annotator(self, path: str) -> None:
         """Saves the annotator to a given path.
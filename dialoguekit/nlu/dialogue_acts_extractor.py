@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from dialoguekit.core.dialogue_act import DialogueAct
 from dialoguekit.core.utterance import Utterance
@@ -29,6 +29,40 @@ class DialogueActsExtractor(ABC):
         """
         raise NotImplementedError
 
+    def extract_dialogue_acts_batch(
+        self, utterances: List[Utterance]
+    ) -> List[List[DialogueAct]]:
+        """Extracts dialogue acts from multiple utterances.
+
+        Subclasses should override this method if they can process several
+        utterances at once more efficiently than one by one.
+
+        Args:
+            utterances: List of utterances.
+
+        Returns:
+            List of dialogue acts per utterance.
+        """
+        return [
+            self.extract_dialogue_acts(utterance) for utterance in utterances
+        ]
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint identifying the output of the extractor.
+
+        Two extractors with the same fingerprint must produce the same output
+        for the same input, which allows caching it. Subclasses should
+        override this method to enable caching.
+
+        Returns:
+            Fingerprint, or None if the output cannot be cached.
+        """
+        return None
+
+    def close(self) -> None:
+        """Releases the resources held by the extractor, e.g., models."""
+        pass
+
     @abstractmethod
     def save(self, path: str) -> None:
         """Saves the dialogue act extractor to a given path.
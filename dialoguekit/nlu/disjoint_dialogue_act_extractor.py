@@ -8,12 +8,13 @@ slot-value annotators.
 from __future__ import annotations
 
 import os
-from typing import List, cast
+from typing import List, Optional, cast
 
 from dialoguekit.core.dialogue_act import DialogueAct
 from dialoguekit.core.intent import Intent
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
 from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.annotation_cache import hash_text
 from dialoguekit.nlu.dialogue_acts_extractor import DialogueActsExtractor
 from dialoguekit.nlu.intent_classifier import IntentClassifier
 from dialoguekit.nlu.slot_value_annotator import SlotValueAnnotator
@@ -70,6 +71,42 @@ class DisjointDialogueActExtractor(DialogueActsExtractor):
             return []
         return [DialogueAct(intent, annotations)]
 
+    def extract_dialogue_acts_batch(
+        self, utterances: List[Utterance]
+    ) -> List[List[DialogueAct]]:
+        """Extracts a single dialogue act from each of multiple utterances.
+
+        The intents of all the utterances are classified at once.
+
+        Args:
+            utterances: List of utterances.
+
+        Returns:
+            List with one dialogue act per utterance.
+        """
+        intents = self._intent_classifier.classify_intents(utterances)
+        dialogue_acts = []
+        for utterance, intent in zip(utterances, intents):
+            if intent is None:
+                dialogue_acts.append([])
+                continue
+            annotations = self.annotate_slot_values(utterance)
+            dialogue_acts.append([DialogueAct(intent, annotations)])
+        return dialogue_acts
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint combining those of the underlying models.
+
+        Returns:
+            Fingerprint, or None if a model cannot be fingerprinted.
+        """
+        fingerprints = [self._intent_classifier.fingerprint()] + [
+            annotator.fingerprint() for annotator in self._slot_value_annotators
+        ]
+        if any(fingerprint is None for fingerprint in fingerprints):
+            return None
+        return f"{type(self).__name__}:{hash_text('|'.join(fingerprints))}"
+
     def save(self, path: str) -> None:
         """Saves the intent classifier and slot-value annotators to a folder.
 
@@ -2,19 +2,59 @@
 
 from __future__ import annotations
 
+import json
+import os
 import re
 import string
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from transformers import pipeline
+from transformers import Pipeline, pipeline
 
 from dialoguekit.core.dialogue_act import DialogueAct
 from dialoguekit.core.intent import Intent
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
 from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.annotation_cache import hash_text
 from dialoguekit.nlu.dialogue_acts_extractor import DialogueActsExtractor
+from dialoguekit.utils.model_registry import get_model_registry
 
 DEFAULT_HF_MODEL = "HuggingFaceTB/SmolLM2-135M-Instruct"
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_MAX_NEW_TOKENS = 64
+LM_OUTPUT_MEMO_SIZE = int(os.environ.get("LM_OUTPUT_MEMO_SIZE", "10000"))
+
+_PUNCTUATION = (
+    string.punctuation.replace('"', "").replace("|", "").replace(".", "")
+)
+_OUTPUT_PATTERN = (
+    r"(\w+-?\w+\((\w+(=\"[\w\s" + _PUNCTUATION + r"]+\")?,?\s?)*\)\s*\|?\s*)*"
+)
+_DIALOGUE_ACT_PATTERN = r"(\w+-?\w+)\((.*)\)\s*"
+
+# Model outputs shared by the extractors of the process, keyed by model name,
+# prompt hash, generation settings, and utterance text
+_OUTPUT_MEMO: OrderedDict[Tuple[str, str, str, str], str] = OrderedDict()
+_OUTPUT_MEMO_LOCK = threading.Lock()
+
+
+def _load_generator(model_name: str) -> Pipeline:
+    """Loads a text generation pipeline set up for batched generation.
+
+    Inputs are padded on the left, as expected by decoder-only models.
+
+    Args:
+        model_name: Hugging Face model name.
+
+    Returns:
+        Text generation pipeline.
+    """
+    generator = pipeline("text-generation", model=model_name, device_map="auto")
+    generator.tokenizer.padding_side = "left"
+    if generator.tokenizer.pad_token_id is None:
+        generator.tokenizer.pad_token_id = generator.tokenizer.eos_token_id
+    return generator
 
 
 class LMDialogueActsExtractor(DialogueActsExtractor):
@@ -24,6 +64,8 @@ class LMDialogueActsExtractor(DialogueActsExtractor):
         intent_labels: List[str],
         slot_labels: List[str],
         model: str = DEFAULT_HF_MODEL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_new_tokens: int = DEFAULT_MAX_NEW_TOKENS,
     ) -> None:
         """Initializes the dialogue act extractor.
 
@@ -32,14 +74,45 @@ class LMDialogueActsExtractor(DialogueActsExtractor):
             intent_labels: List of intent labels.
             slot_labels: List of slot labels.
             model: Hugging Face model name. Defaults to DEFAULT_HF_MODEL.
+            batch_size: Number of utterances processed at a time by the
+              model. Defaults to DEFAULT_BATCH_SIZE.
+            max_new_tokens: Maximum number of tokens generated per utterance.
+              Defaults to DEFAULT_MAX_NEW_TOKENS.
         """
         super().__init__()
         self.extraction_prompt = extraction_prompt
         self.intent_labels = intent_labels
         self.slot_labels = slot_labels
         self.model_name = model
-        self.generator = pipeline(
-            "text-generation", model=self.model_name, device_map="auto"
+        # The generator is shared with other extractors using the same model
+        self.generator = get_model_registry().acquire(
+            "text-generation",
+            self.model_name,
+            lambda: _load_generator(self.model_name),
+            device="auto",
+        )
+        self.batch_size = batch_size
+        self.max_new_tokens = max_new_tokens
+        self._prompt_hash = hash_text(extraction_prompt)
+        self._output_pattern = re.compile(_OUTPUT_PATTERN)
+        self._dialogue_act_pattern = re.compile(_DIALOGUE_ACT_PATTERN)
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint of the model, prompt, and labels.
+
+        Returns:
+            Fingerprint.
+        """
+        return f"{type(self).__name__}:" + hash_text(
+            "|".join(
+                [
+                    self.model_name,
+                    self._prompt_hash,
+                    ",".join(self.intent_labels),
+                    ",".join(self.slot_labels),
+                    str(self.max_new_tokens),
+                ]
+            )
         )
 
     def filter_invalid_dialogue_acts(
@@ -90,9 +163,8 @@ class LMDialogueActsExtractor(DialogueActsExtractor):
             List of dialogue acts.
         """
         parsed_dialogue_acts = []
-        pattern = r"(\w+-?\w+)\((.*)\)\s*"
         for dialogue_act in dialogue_acts:
-            match = re.match(pattern, dialogue_act.strip())
+            match = self._dialogue_act_pattern.match(dialogue_act.strip())
             if match:
                 intent = Intent(match.group(1))
                 slot_value_pairs = match.group(2).split(",")
@@ -124,50 +196,145 @@ class LMDialogueActsExtractor(DialogueActsExtractor):
             List of dialogue acts in string format.
         """
         model_output = model_output.strip()
-        punctuation = (
-            string.punctuation.replace('"', "")
-            .replace("|", "")
-            .replace(".", "")
-        )
-        pattern = (
-            r"(\w+-?\w+\((\w+(=\"[\w\s"
-            + punctuation
-            + r"]+\")?,?\s?)*\)\s*\|?\s*)*"
-        )
-        match = re.fullmatch(pattern, model_output)
+        match = self._output_pattern.fullmatch(model_output)
         if match:
             return self._parse_dialogue_acts(model_output.split("|"))
         return []
 
-    def extract_dialogue_acts(self, utterance: Utterance) -> List[DialogueAct]:
-        """Extracts dialogue acts from an utterance.
+    def _build_model_input(self, text: str) -> List[Dict[str, str]]:
+        """Builds the chat input of the model for an utterance.
 
         Args:
-            utterance: Utterance.
-
-        Raises:
-            AssertionError: If the model fails to generate dialogue acts.
+            text: Utterance text.
 
         Returns:
-            List of dialogue acts.
+            Chat messages with the extraction prompt.
         """
-        model_input = [
+        return [
             {
                 "role": "user",
-                "content": self.extraction_prompt.format(
-                    utterance=utterance.text
-                ),
+                "content": self.extraction_prompt.format(utterance=text),
             }
         ]
-        output = self.generator(model_input, do_sample=False, return_text=True)[
-            0
-        ].get("generated_text", [])
+
+    def _get_model_output(self, output: List[Dict[str, str]]) -> str:
+        """Gets the generated answer from the output of the model.
+
+        Args:
+            output: Chat messages including the generated answer.
+
+        Raises:
+            AssertionError: If the model fails to generate dialogue acts.
+
+        Returns:
+            Generated answer.
+        """
         assert "user" != output[-1].get(
             "role", ""
         ), "Model failed to generate dialogue acts."
-        model_output = output[-1].get("content", "")
-        dialogue_acts = self._parse_model_output(model_output)
-        return self.filter_invalid_dialogue_acts(utterance.text, dialogue_acts)
+        return output[-1].get("content", "")
+
+    def _generation_settings(self) -> Dict[str, Any]:
+        """Returns the settings given to the model for generation.
+
+        Returns:
+            Keyword arguments of the text generation pipeline.
+        """
+        return {
+            "max_new_tokens": self.max_new_tokens,
+            "do_sample": False,
+            "return_text": True,
+        }
+
+    def _generate(self, texts: List[str]) -> Dict[str, str]:
+        """Generates the model outputs for utterance texts.
+
+        Outputs are memoized, hence only texts never seen with the same model,
+        prompt, and generation settings are given to the model, by batches.
+
+        Args:
+            texts: Utterance texts.
+
+        Returns:
+            Model output per utterance text.
+        """
+        settings = self._generation_settings()
+        memo_key = (
+            self.model_name,
+            self._prompt_hash,
+            json.dumps(settings, sort_keys=True),
+        )
+        outputs: Dict[str, str] = {}
+        with _OUTPUT_MEMO_LOCK:
+            for text in texts:
+                key = (*memo_key, text)
+                if key in _OUTPUT_MEMO:
+                    _OUTPUT_MEMO.move_to_end(key)
+                    outputs[text] = _OUTPUT_MEMO[key]
+
+        missing = [text for text in dict.fromkeys(texts) if text not in outputs]
+        if not missing:
+            return outputs
+
+        generated = self.generator(
+            [self._build_model_input(text) for text in missing],
+            batch_size=self.batch_size,
+            **settings,
+        )
+        with _OUTPUT_MEMO_LOCK:
+            for text, output in zip(missing, generated):
+                model_output = self._get_model_output(
+                    output[0].get("generated_text")
+                )
+                outputs[text] = model_output
+                _OUTPUT_MEMO[(*memo_key, text)] = model_output
+            while len(_OUTPUT_MEMO) > LM_OUTPUT_MEMO_SIZE:
+                _OUTPUT_MEMO.popitem(last=False)
+        return outputs
+
+    def extract_dialogue_acts(self, utterance: Utterance) -> List[DialogueAct]:
+        """Extracts dialogue acts from an utterance.
+
+        Args:
+            utterance: Utterance.
+
+        Returns:
+            List of dialogue acts.
+        """
+        return self.extract_dialogue_acts_batch([utterance])[0]
+
+    def extract_dialogue_acts_batch(
+        self, utterances: List[Utterance]
+    ) -> List[List[DialogueAct]]:
+        """Extracts dialogue acts from multiple utterances.
+
+        Utterances are deduplicated by text and the remaining ones are given
+        by batches to the model, which decodes greedily.
+
+        Args:
+            utterances: List of utterances.
+
+        Returns:
+            List of dialogue acts per utterance.
+        """
+        if not utterances:
+            return []
+        outputs = self._generate([utterance.text for utterance in utterances])
+        return [
+            self.filter_invalid_dialogue_acts(
+                utterance.text,
+                self._parse_model_output(outputs[utterance.text]),
+            )
+            for utterance in utterances
+        ]
+
+    def close(self) -> None:
+        """Releases the generator shared with other extractors."""
+        if self.generator is not None:
+            get_model_registry().release(
+                "text-generation", self.model_name, device="auto"
+            )
+            self.generator = None
 
     def save(self, path: str) -> None:
         """Saves the dialogue act extractor to a given path.
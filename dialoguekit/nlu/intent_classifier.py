@@ -6,7 +6,7 @@ multi-label classification is left to future work.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from dialoguekit.core.intent import Intent
 from dialoguekit.core.utterance import Utterance
@@ -51,6 +51,32 @@ class IntentClassifier(ABC):
         """
         raise NotImplementedError
 
+    def classify_intents(self, utterances: List[Utterance]) -> List[Intent]:
+        """Classifies the intents of multiple utterances.
+
+        Subclasses should override this method if they can classify several
+        utterances at once more efficiently than one by one.
+
+        Args:
+            utterances: List of utterances.
+
+        Returns:
+            Predicted intent per utterance.
+        """
+        return [self.classify_intent(utterance) for utterance in utterances]
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint identifying the output of the classifier.
+
+        Two classifiers with the same fingerprint must produce the same output
+        for the same input, which allows caching it. Subclasses should
+        override this method to enable caching.
+
+        Returns:
+            Fingerprint, or None if the output cannot be cached.
+        """
+        return None
+
     @abstractmethod
     def save_model(self, file_path: str) -> None:
         """Saves the trained model to a file.
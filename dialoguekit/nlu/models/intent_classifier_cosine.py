@@ -1,11 +1,18 @@
-"""Implements intent classification based on cosine similarity."""
+"""Implements intent classification based on cosine similarity.
 
-from typing import List
+TF-IDF vectors are kept in a sparse matrix with L2-normalized rows, hence the
+cosine similarity is a sparse dot product.
+"""
 
+import os
+from typing import List, Optional
+
+import joblib
 import numpy as np
 from joblib import dump, load
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 from dialoguekit.core.intent import Intent
 from dialoguekit.core.utterance import Utterance
@@ -22,7 +29,8 @@ class IntentClassifierCosine(IntentClassifier):
         super().__init__(intents)
         self._labels: List[Intent] = None
         self._tfidf_vectorizer = TfidfVectorizer()
-        self._tfidf_matrix = None
+        self._tfidf_matrix: csr_matrix = None
+        self._fingerprint: Optional[str] = None
 
     def train_model(
         self, utterances: List[Utterance], labels: List[Intent]
@@ -38,9 +46,10 @@ class IntentClassifierCosine(IntentClassifier):
         self._labels = labels
         # Converts the training utterances into a TF-IDF-weighted term-document
         # matrix.
-        self._tfidf_matrix = self._tfidf_vectorizer.fit_transform(
-            [u.text for u in utterances]
-        ).toarray()
+        self._tfidf_matrix = normalize(
+            self._tfidf_vectorizer.fit_transform([u.text for u in utterances])
+        ).tocsr()
+        self._fingerprint = None
 
     def classify_intent(self, utterance: Utterance) -> Intent:
         """Classifies the utterance's intent.
@@ -54,37 +63,95 @@ class IntentClassifierCosine(IntentClassifier):
         Returns:
             Predicted intent.
         """
-        # Calculates the cosine similarities between the input utterance and
-        # training utterances, based on TF-IDF vectors.
-        sim_vector = cosine_similarity(
-            self._tfidf_vectorizer.transform([utterance.text]).toarray(),
-            self._tfidf_matrix,
-        )[0]
+        return self.classify_intents([utterance])[0]
+
+    def classify_intents(self, utterances: List[Utterance]) -> List[Intent]:
+        """Classifies the intents of multiple utterances.
+
+        Args:
+            utterances: List of utterances.
+
+        Returns:
+            Predicted intent per utterance.
+        """
+        if not utterances:
+            return []
+        # Calculates the cosine similarities between the input utterances and
+        # training utterances, based on normalized TF-IDF vectors.
+        query_matrix = normalize(
+            self._tfidf_vectorizer.transform([u.text for u in utterances])
+        )
+        sim_matrix = query_matrix.dot(self._tfidf_matrix.T).tocsr()
         # Finds the most similar utterance based on cosine similarity, and
         # returns the corresponding intent as the prediction.
-        max_idx = np.argmax(sim_vector)
-        return self._labels[max_idx]
+        max_indices = np.asarray(sim_matrix.argmax(axis=1)).ravel()
+        return [self._labels[max_idx] for max_idx in max_indices]
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint of the trained model.
+
+        Returns:
+            Hash of the labels, vectorizer, and TF-IDF matrix, or None if the
+            model is not trained.
+        """
+        if self._labels is None:
+            return None
+        if self._fingerprint is None:
+            self._fingerprint = f"{type(self).__name__}:" + joblib.hash(
+                (
+                    [label.label for label in self._labels],
+                    # Arrays are hashed as plain arrays, hence a loaded model
+                    # with memory-mapped arrays has the same fingerprint
+                    self._tfidf_vectorizer.get_params(),
+                    sorted(self._tfidf_vectorizer.vocabulary_.items()),
+                    np.asarray(self._tfidf_vectorizer.idf_),
+                    np.asarray(self._tfidf_matrix.data),
+                    np.asarray(self._tfidf_matrix.indices),
+                    np.asarray(self._tfidf_matrix.indptr),
+                    self._tfidf_matrix.shape,
+                )
+            )
+        return self._fingerprint
 
     def save_model(self, file_path: str) -> None:
         """Saves the trained model to a file.
 
-        This method uses the joblib library to save the model.
+        This method uses the joblib library to save the model in a single
+        uncompressed file, which allows memory mapping the matrix on load.
 
         Args:
             file_path: File path.
         """
-        dump(self._tfidf_matrix, f"{file_path}_matrix.joblib")
-        dump(self._tfidf_vectorizer, f"{file_path}_vectorizer.joblib")
-        dump(self._labels, f"{file_path}_labels.joblib")
+        dump(
+            {
+                "labels": self._labels,
+                "vectorizer": self._tfidf_vectorizer,
+                "matrix": self._tfidf_matrix,
+            },
+            f"{file_path}.joblib",
+        )
 
     def load_model(self, file_path: str) -> None:
         """Loads a model from a file.
 
-        This method uses the joblib library to load the model.
+        This method uses the joblib library to load the model. The arrays of
+        the matrix are memory-mapped read-only. Models saved in separate
+        files by earlier versions are supported.
 
         Args:
             file_path: File path.
         """
-        self._tfidf_matrix = load(f"{file_path}_matrix.joblib")
-        self._tfidf_vectorizer = load(f"{file_path}_vectorizer.joblib")
-        self._labels = load(f"{file_path}_labels.joblib")
+        if not os.path.exists(f"{file_path}.joblib") and os.path.exists(
+            f"{file_path}_matrix.joblib"
+        ):
+            self._tfidf_matrix = normalize(
+                csr_matrix(load(f"{file_path}_matrix.joblib"))
+            )
+            self._tfidf_vectorizer = load(f"{file_path}_vectorizer.joblib")
+            self._labels = load(f"{file_path}_labels.joblib")
+        else:
+            model = load(f"{file_path}.joblib", mmap_mode="r")
+            self._tfidf_matrix = model["matrix"]
+            self._tfidf_vectorizer = model["vectorizer"]
+            self._labels = model["labels"]
+        self._fingerprint = None
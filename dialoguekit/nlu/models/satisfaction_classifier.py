@@ -4,16 +4,52 @@ The SVM model and data it was trained on are based on:
 https://github.com/sunnweiwei/user-satisfaction-simulation
 """
 
+import threading
+import warnings
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, List, Optional, Union
 
+import joblib
+import numpy as np
 from joblib import load
+from scipy.sparse import block_diag, csr_matrix, tril
+from sklearn.feature_extraction.text import CountVectorizer
 
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.nlu.annotation_cache import (
+    ANY_PARTICIPANT,
+    AnnotationCache,
+    get_default_annotation_cache,
+)
 
 _SATISFACTION_CLASSIFIER_MODEL_PATH = "LinearSVC_2_0.joblib"
 _SATISFACTION_TOKENIZER_PATH = "vectorizer_2_0.joblib"
+# Separator of the utterances of a dialogue classified as a whole
+_UTTERANCE_SEPARATOR = " ."
+
+
+def _load_artifact(path: Path) -> Any:
+    """Loads a joblib artifact, memory-mapping its arrays if possible.
+
+    Arrays of artifacts saved with joblib < 1.2 are not aligned, hence cannot
+    be safely memory-mapped; these artifacts are loaded in memory.
+
+    Args:
+        path: Path to the artifact.
+
+    Returns:
+        Loaded object.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "error", message=".*not byte aligned", category=UserWarning
+        )
+        try:
+            return load(str(path), mmap_mode="r")
+        except UserWarning:
+            pass
+    return load(str(path))
 
 
 class SatisfactionClassifier(ABC):
@@ -71,16 +107,64 @@ class SatisfactionClassifier(ABC):
         """
         raise NotImplementedError
 
+    def classify_dialogues(
+        self, dialogues: List[Dialogue], last_n: Optional[int] = None
+    ) -> List[int]:
+        """Classifies the last n utterances of multiple dialogues.
+
+        Subclasses should override this method if they can classify several
+        dialogues at once more efficiently than one by one.
+
+        Args:
+            dialogues: Dialogues to classify.
+            last_n: How many of the last utterances in each dialogue to use
+              for the classification. Defaults to None, i.e., all of them.
+
+        Returns:
+            Satisfaction classification per dialogue.
+        """
+        return [
+            self.classify_last_n_dialogue(dialogue, last_n)
+            for dialogue in dialogues
+        ]
+
+    def classify_prefixes(self, dialogues: List[Dialogue]) -> List[List[int]]:
+        """Classifies every prefix of multiple dialogues.
+
+        The satisfaction after each utterance of a dialogue is classified
+        based on the utterances up to and including it.
+
+        Args:
+            dialogues: Dialogues to classify.
+
+        Returns:
+            Satisfaction classification per utterance of each dialogue.
+        """
+        trajectories = []
+        for dialogue in dialogues:
+            texts = [utterance.text for utterance in dialogue.utterances]
+            trajectories.append(
+                self.classify_text(
+                    [
+                        _UTTERANCE_SEPARATOR.join(texts[: i + 1])
+                        for i in range(len(texts))
+                    ]
+                )
+            )
+        return trajectories
+
 
 class SatisfactionClassifierSVM(SatisfactionClassifier):
-    def __init__(self) -> None:
+    def __init__(
+        self, annotation_cache: Optional[AnnotationCache] = None
+    ) -> None:
         """SVM Satisfaction classifier.
 
         The SVM model is pre-trained on the English data from:
         https://github.com/sunnweiwei/user-satisfaction-simulation
 
         It classifies the users overall satisfaction with the system. Based on
-        the agents responses to the user.
+        the agents responses to the user. The model is loaded on first use.
 
         The scale:
             1: Very dissatisfied
@@ -88,19 +172,102 @@ class SatisfactionClassifierSVM(SatisfactionClassifier):
             3: Normal
             4: Satisfied
             5: Very Satisfied
+
+        Args:
+            annotation_cache: Cache of classifications. Defaults to None, in
+              which case the default annotation cache is used, if enabled.
         """
-        path_to_models = Path(__file__).parent / "satisfaction"
-        tokenizer_path = path_to_models.joinpath(_SATISFACTION_TOKENIZER_PATH)
-        classifier_path = path_to_models.joinpath(
-            _SATISFACTION_CLASSIFIER_MODEL_PATH
+        self._model_svm = None
+        self._tokenizer = None
+        self._fingerprint: str = None
+        self._load_lock = threading.Lock()
+        self._annotation_cache = (
+            annotation_cache
+            if annotation_cache is not None
+            else get_default_annotation_cache()
+        )
+
+    def _load(self) -> None:
+        """Loads the model and tokenizer if they are not loaded yet."""
+        with self._load_lock:
+            if self._model_svm is not None:
+                return
+            path_to_models = Path(__file__).parent / "satisfaction"
+            tokenizer = _load_artifact(
+                path_to_models.joinpath(_SATISFACTION_TOKENIZER_PATH)
+            )
+            model_svm = _load_artifact(
+                path_to_models.joinpath(_SATISFACTION_CLASSIFIER_MODEL_PATH)
+            )
+            self._fingerprint = f"{type(self).__name__}:" + joblib.hash(
+                (model_svm, tokenizer)
+            )
+            self._tokenizer = tokenizer
+            self._model_svm = model_svm
+
+    def _is_additive(self) -> bool:
+        """Checks whether the features of a text are the sum of its parts.
+
+        This holds for the counts of single words, in which case the features
+        of a dialogue are the sum of the features of its utterances.
+
+        Returns:
+            True if features are additive.
+        """
+        return (
+            type(self._tokenizer) is CountVectorizer
+            and self._tokenizer.analyzer == "word"
+            and tuple(self._tokenizer.ngram_range) == (1, 1)
         )
-        self._model_svm = load(str(classifier_path))
-        self._tokenizer = load(str(tokenizer_path))
 
     def _tokenize_predict(self, input_text: List[str]) -> List[int]:
+        """Tokenizes and classifies satisfaction, using the cache if enabled.
+
+        Args:
+            input_text: List of text to classify.
+
+        Returns:
+            List of classifications for every string in the input.
+        """
+        self._load()
+        if self._annotation_cache is None:
+            return self._predict(input_text)
+
+        keys = [(text, ANY_PARTICIPANT) for text in input_text]
+        cached = self._annotation_cache.get_many(self._fingerprint, keys)
+        missing = list(dict.fromkeys(k for k in keys if k not in cached))
+        if missing:
+            predictions = self._predict([text for text, _ in missing])
+            new_values = dict(zip(missing, predictions))
+            self._annotation_cache.set_many(self._fingerprint, new_values)
+            cached.update(new_values)
+        return [cached[key] for key in keys]
+
+    def _predict(self, input_text: List[str]) -> List[int]:
+        """Tokenizes and classifies satisfaction with the SVM model.
+
+        Args:
+            input_text: List of text to classify.
+
+        Returns:
+            List of classifications for every string in the input.
+        """
         transformed_strings = self._tokenizer.transform(input_text)
-        satisfaction = self._model_svm.predict(transformed_strings)
-        return list(satisfaction)
+        return self._predict_features(transformed_strings)
+
+    def _predict_features(self, features: csr_matrix) -> List[int]:
+        """Classifies satisfaction from the features of texts.
+
+        Args:
+            features: Feature matrix with one row per text.
+
+        Returns:
+            List of classifications for every row of the matrix.
+        """
+        if features.shape[0] == 0:
+            return []
+        satisfaction = self._model_svm.predict(features)
+        return [int(score) for score in satisfaction]
 
     def classify_text(
         self, dialogue_text: Union[str, List[str]]
@@ -136,13 +303,71 @@ class SatisfactionClassifierSVM(SatisfactionClassifier):
         Returns:
             Classification score.
         """
-        if last_n is None:
-            last_n = len(dialogue.utterances)
+        return self.classify_dialogues([dialogue], last_n)[0]
+
+    def classify_dialogues(
+        self, dialogues: List[Dialogue], last_n: Optional[int] = None
+    ) -> List[int]:
+        """Classifies the last n utterances of multiple dialogues at once.
+
+        Args:
+            dialogues: Dialogues to classify.
+            last_n: Number of the last utterances of each dialogue to use for
+              classification. Defaults to None.
+
+        Returns:
+            Classification score per dialogue.
+        """
+        dialogue_texts = []
+        for dialogue in dialogues:
+            n = len(dialogue.utterances) if last_n is None else last_n
+            dialogue_texts.append(
+                _UTTERANCE_SEPARATOR.join(
+                    utterance.text for utterance in dialogue.utterances[-n:]
+                )
+            )
+        return self._tokenize_predict(dialogue_texts)
+
+    def classify_prefixes(self, dialogues: List[Dialogue]) -> List[List[int]]:
+        """Classifies every prefix of multiple dialogues at once.
+
+        If word counts are additive, the utterances are vectorized once and
+        the features of all prefixes are obtained by cumulative sums,
+        computed as a single product with a block-diagonal lower-triangular
+        matrix.
+
+        Args:
+            dialogues: Dialogues to classify.
 
-        complete_dialogue_text = " .".join(
+        Returns:
+            Classification score per utterance of each dialogue.
+        """
+        self._load()
+        if not self._is_additive():
+            return super().classify_prefixes(dialogues)
+
+        lengths = [len(dialogue.utterances) for dialogue in dialogues]
+        counts = self._tokenizer.transform(
             [
-                annotated_utterance.text
-                for annotated_utterance in dialogue.utterances[-last_n:]
+                utterance.text
+                for dialogue in dialogues
+                for utterance in dialogue.utterances
             ]
         )
-        return int(self._tokenize_predict([complete_dialogue_text])[0])
+        if counts.shape[0] == 0:
+            return [[] for _ in dialogues]
+        cumulative_sum = block_diag(
+            [tril(np.ones((n, n), dtype=counts.dtype)) for n in lengths if n],
+            format="csr",
+        )
+        prefix_counts = csr_matrix(cumulative_sum.dot(counts))
+        if self._tokenizer.binary:
+            prefix_counts.data = np.minimum(prefix_counts.data, 1)
+        scores = self._predict_features(prefix_counts)
+
+        trajectories = []
+        start = 0
+        for n in lengths:
+            trajectories.append(scores[start : start + n])
+            start += n
+        return trajectories
@@ -12,11 +12,18 @@ We can extract the following annotations:
 - Sentiment: POSITIVE
 """
 
-from typing import List
+from typing import List, Optional
 
 from dialoguekit.core.annotation import Annotation
 from dialoguekit.core.dialogue_act import DialogueAct
 from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.annotation_cache import (
+    AnnotationCache,
+    dialogue_acts_from_json,
+    dialogue_acts_to_json,
+    get_default_annotation_cache,
+    hash_text,
+)
 from dialoguekit.nlu.annotator import Annotator
 from dialoguekit.nlu.dialogue_acts_extractor import DialogueActsExtractor
 
@@ -26,15 +33,26 @@ class NLU:
         self,
         dialogue_act_extractor: DialogueActsExtractor,
         annotators: List[Annotator] = None,
+        annotation_cache: Optional[AnnotationCache] = None,
     ) -> None:
         """Initializes the NLU module.
 
+        Dialogue acts are cached if the dialogue act extractor has a
+        fingerprint and a cache is available.
+
         Args:
             dialogue_act_extractor: Dialogue act extractor.
             annotators: List of annotators.
+            annotation_cache: Cache of dialogue acts. Defaults to None, in
+              which case the default annotation cache is used, if enabled.
         """
         self._dialogue_act_extractor = dialogue_act_extractor
         self._annotators = annotators if annotators is not None else []
+        self._annotation_cache = (
+            annotation_cache
+            if annotation_cache is not None
+            else get_default_annotation_cache()
+        )
 
     def extract_dialogue_acts(self, utterance: Utterance) -> List[DialogueAct]:
         """Extracts dialogue acts from an utterance.
@@ -45,7 +63,61 @@ class NLU:
         Returns:
             List of dialogue acts.
         """
-        return self._dialogue_act_extractor.extract_dialogue_acts(utterance)
+        return self.extract_dialogue_acts_batch([utterance])[0]
+
+    def extract_dialogue_acts_batch(
+        self, utterances: List[Utterance]
+    ) -> List[List[DialogueAct]]:
+        """Extracts dialogue acts from multiple utterances.
+
+        Only the utterances that are not cached, identified by their text and
+        participant, are given to the dialogue act extractor.
+
+        Args:
+            utterances: List of utterances.
+
+        Returns:
+            List of dialogue acts per utterance.
+        """
+        fingerprint = self._dialogue_act_extractor.fingerprint()
+        if self._annotation_cache is None or fingerprint is None:
+            return self._dialogue_act_extractor.extract_dialogue_acts_batch(
+                utterances
+            )
+
+        keys = [(u.text, u.participant.name) for u in utterances]
+        cached = self._annotation_cache.get_many(fingerprint, keys)
+        missing = {
+            key: utterance
+            for key, utterance in zip(keys, utterances)
+            if key not in cached
+        }
+        if missing:
+            extracted = (
+                self._dialogue_act_extractor.extract_dialogue_acts_batch(
+                    list(missing.values())
+                )
+            )
+            new_values = {
+                key: dialogue_acts_to_json(dialogue_acts)
+                for key, dialogue_acts in zip(missing, extracted)
+            }
+            self._annotation_cache.set_many(fingerprint, new_values)
+            cached.update(new_values)
+        return [dialogue_acts_from_json(cached[key]) for key in keys]
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint of the dialogue act extractor and annotators.
+
+        Returns:
+            Fingerprint, or None if a component cannot be fingerprinted.
+        """
+        fingerprints = [self._dialogue_act_extractor.fingerprint()] + [
+            annotator.fingerprint() for annotator in self._annotators
+        ]
+        if any(fingerprint is None for fingerprint in fingerprints):
+            return None
+        return f"{type(self).__name__}:{hash_text('|'.join(fingerprints))}"
 
     def get_annotations(self, utterance: Utterance) -> List[Annotation]:
         """Annotates an utterance.
@@ -60,3 +132,7 @@ class NLU:
         for annotator in self._annotators:
             annotation_list.extend(annotator.get_annotations(utterance))
         return annotation_list
+
+    def close(self) -> None:
+        """Releases the resources held by the dialogue act extractor."""
+        self._dialogue_act_extractor.close()
@@ -3,6 +3,12 @@ from dialoguekit.utils.annotation_converter import AnnotationConverter
 from dialoguekit.utils.annotation_converter_dialoguekit_to_rasa import (
     AnnotationConverterRasa,
 )
+from dialoguekit.utils.dialogue_columns import DialogueColumns
 from dialoguekit.utils.dialogue_evaluation import Evaluator
 
-__all__ = ["AnnotationConverterRasa", "AnnotationConverter", "Evaluator"]
+__all__ = [
+    "AnnotationConverterRasa",
+    "AnnotationConverter",
+    "DialogueColumns",
+    "Evaluator",
+]
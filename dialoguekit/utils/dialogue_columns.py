@@ -0,0 +1,226 @@
+"""Columnar representation of a collection of dialogues.
+
+The utterances of all the dialogues are stored in flat arrays, e.g., the index
+of their dialogue and the code of their participant, and so are their dialogue
+acts, e.g., the ID of their intent and their number of slot-value annotations.
+Offsets give the range of utterances of each dialogue and the range of
+dialogue acts of each utterance. Statistics over the dialogues can then be
+computed with vectorized NumPy operations instead of loops over utterances.
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.dialogue import Dialogue
+
+
+class DialogueColumns:
+    def __init__(
+        self,
+        utterance_offsets: np.ndarray,
+        participants: np.ndarray,
+        annotated: np.ndarray,
+        act_offsets: np.ndarray,
+        act_intents: np.ndarray,
+        act_num_slots: np.ndarray,
+        intent_labels: List[str],
+    ) -> None:
+        """Initializes the columns.
+
+        Args:
+            utterance_offsets: Offsets of the utterances of each dialogue, of
+              size number of dialogues + 1.
+            participants: Participant code of each utterance, i.e., the value
+              of its DialogueParticipant.
+            annotated: Whether each utterance is an AnnotatedUtterance.
+            act_offsets: Offsets of the dialogue acts of each utterance, of
+              size number of utterances + 1.
+            act_intents: Intent ID of each dialogue act, -1 if it has no
+              intent.
+            act_num_slots: Number of slot-value annotations of each dialogue
+              act.
+            intent_labels: Label of each intent ID.
+        """
+        self.utterance_offsets = utterance_offsets
+        self.participants = participants
+        self.annotated = annotated
+        self.act_offsets = act_offsets
+        self.act_intents = act_intents
+        self.act_num_slots = act_num_slots
+        self.intent_labels = intent_labels
+        self._intent_ids = {label: i for i, label in enumerate(intent_labels)}
+
+        self.num_dialogues = len(utterance_offsets) - 1
+        self.num_utterances = len(participants)
+        self.dialogue_indices = np.repeat(
+            np.arange(self.num_dialogues), np.diff(utterance_offsets)
+        )
+        self.num_acts = np.diff(act_offsets)
+        self.act_utterances = np.repeat(
+            np.arange(self.num_utterances), self.num_acts
+        )
+
+    @classmethod
+    def from_dialogues(cls, dialogues: Iterable[Dialogue]) -> "DialogueColumns":
+        """Builds the columns of dialogues.
+
+        Args:
+            dialogues: Dialogues.
+
+        Returns:
+            Columns of the dialogues.
+        """
+        utterance_counts: List[int] = []
+        participants: List[int] = []
+        annotated: List[bool] = []
+        act_counts: List[int] = []
+        act_intents: List[int] = []
+        act_num_slots: List[int] = []
+        intent_ids: Dict[str, int] = {}
+
+        for dialogue in dialogues:
+            utterance_counts.append(len(dialogue.utterances))
+            for utterance in dialogue.utterances:
+                participants.append(utterance.participant.value)
+                is_annotated = isinstance(utterance, AnnotatedUtterance)
+                annotated.append(is_annotated)
+                dialogue_acts = utterance.dialogue_acts if is_annotated else []
+                act_counts.append(len(dialogue_acts))
+                for dialogue_act in dialogue_acts:
+                    if dialogue_act.intent is None:
+                        act_intents.append(-1)
+                    else:
+                        act_intents.append(
+                            intent_ids.setdefault(
+                                dialogue_act.intent.label, len(intent_ids)
+                            )
+                        )
+                    act_num_slots.append(len(dialogue_act.annotations))
+
+        return cls(
+            utterance_offsets=_offsets(utterance_counts),
+            participants=np.asarray(participants, dtype=np.int8),
+            annotated=np.asarray(annotated, dtype=bool),
+            act_offsets=_offsets(act_counts),
+            act_intents=np.asarray(act_intents, dtype=np.int32),
+            act_num_slots=np.asarray(act_num_slots, dtype=np.int32),
+            intent_labels=list(intent_ids),
+        )
+
+    def intent_ids(self, labels: Iterable[str]) -> np.ndarray:
+        """Returns the IDs of intent labels, ignoring unknown ones.
+
+        Args:
+            labels: Intent labels.
+
+        Returns:
+            Intent IDs.
+        """
+        return np.asarray(
+            [
+                self._intent_ids[label]
+                for label in labels
+                if label in self._intent_ids
+            ],
+            dtype=np.int32,
+        )
+
+    def utterance_counts(self, mask: np.ndarray) -> np.ndarray:
+        """Counts the utterances of each dialogue satisfying a condition.
+
+        Args:
+            mask: Boolean mask over the utterances.
+
+        Returns:
+            Number of utterances per dialogue.
+        """
+        return np.bincount(
+            self.dialogue_indices[mask], minlength=self.num_dialogues
+        )
+
+    def has_intent(self, labels: Iterable[str]) -> np.ndarray:
+        """Checks which utterances have any of the given intents.
+
+        Args:
+            labels: Intent labels.
+
+        Returns:
+            Boolean mask over the utterances.
+        """
+        act_mask = np.isin(self.act_intents, self.intent_ids(labels))
+        return (
+            np.bincount(
+                self.act_utterances[act_mask], minlength=self.num_utterances
+            )
+            > 0
+        )
+
+    def slot_counts(self) -> np.ndarray:
+        """Returns the number of slot-value annotations of each utterance."""
+        return np.bincount(
+            self.act_utterances,
+            weights=self.act_num_slots,
+            minlength=self.num_utterances,
+        ).astype(np.int64)
+
+    def first_utterances(self) -> np.ndarray:
+        """Returns a boolean mask of the first utterance of each dialogue."""
+        first = np.zeros(self.num_utterances, dtype=bool)
+        starts = self.utterance_offsets[:-1]
+        first[starts[starts < self.num_utterances]] = True
+        return first
+
+    def same_participant_as_previous(self) -> np.ndarray:
+        """Checks which utterances have the same participant as the previous.
+
+        Returns:
+            Boolean mask over the utterances.
+        """
+        same = np.zeros(self.num_utterances, dtype=bool)
+        same[1:] = self.participants[1:] == self.participants[:-1]
+        return same & ~self.first_utterances()
+
+    def same_intents_as_previous(self) -> np.ndarray:
+        """Checks which utterances have the same intents as the previous one.
+
+        The intents are compared in order. The first utterance of each
+        dialogue has no previous utterance.
+
+        Returns:
+            Boolean mask over the utterances.
+        """
+        same = np.zeros(self.num_utterances, dtype=bool)
+        same[1:] = self.num_acts[1:] == self.num_acts[:-1]
+        same &= ~self.first_utterances()
+
+        # The acts of the previous utterance are right before, hence an act
+        # is compared with the one as many positions before as the number of
+        # acts of its utterance
+        compared_acts = np.flatnonzero(same[self.act_utterances])
+        previous_acts = (
+            compared_acts - self.num_acts[self.act_utterances[compared_acts]]
+        )
+        differs = (
+            self.act_intents[compared_acts] != self.act_intents[previous_acts]
+        )
+        mismatches = np.bincount(
+            self.act_utterances[compared_acts[differs]],
+            minlength=self.num_utterances,
+        )
+        return same & (mismatches == 0)
+
+
+def _offsets(counts: List[int]) -> np.ndarray:
+    """Computes the offsets of consecutive ranges.
+
+    Args:
+        counts: Size of each range.
+
+    Returns:
+        Offsets, of size number of ranges + 1.
+    """
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
@@ -2,16 +2,17 @@
 
 import warnings
 from collections import defaultdict
-from copy import deepcopy
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
 
-from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.core.dialogue import Dialogue
 from dialoguekit.core.intent import Intent
 from dialoguekit.nlu.models.satisfaction_classifier import (
     SatisfactionClassifierSVM,
 )
 from dialoguekit.participant.participant import DialogueParticipant
+from dialoguekit.utils.dialogue_columns import DialogueColumns
 
 # REWARD CONFIG PARAMETERS
 # Initial points before deduction.
@@ -35,7 +36,8 @@ class Evaluator:
     ) -> None:
         """Dialogue evaluator.
 
-        Evaluates a set of dialogues using standard metrics.
+        Evaluates a set of dialogues using standard metrics. The statistics
+        are computed with NumPy on a columnar view of the dialogues.
 
         Args:
             dialogues: A list of Dialogue objects to be evaluated.
@@ -51,6 +53,14 @@ class Evaluator:
         assert _CONFIG_INTENTS in self._reward_config
         assert _REPEAT_PENALTY in self._reward_config
         assert _COST in self._reward_config
+        self._columns: Optional[DialogueColumns] = None
+
+    @property
+    def columns(self) -> DialogueColumns:
+        """Returns the columnar view of the dialogues, built on first use."""
+        if self._columns is None:
+            self._columns = DialogueColumns.from_dialogues(self._dialogues)
+        return self._columns
 
     def avg_turns(self) -> float:
         """Calculates the AvgTurns for the dialogues.
@@ -61,18 +71,12 @@ class Evaluator:
         Returns:
             The computed metric as a float value.
         """
-        for dialogue in self._dialogues:
-            dialogue_turns = 0
-            for i in range(len(dialogue.utterances)):
-                if (
-                    i == 0
-                    or dialogue.utterances[i - 1].participant
-                    == dialogue.utterances[i].participant
-                ):
-                    continue
-                else:
-                    dialogue_turns += 1
-            self._dialogue_lengths.append(dialogue_turns / 2)
+        columns = self.columns
+        turn_changes = ~(
+            columns.same_participant_as_previous() | columns.first_utterances()
+        )
+        dialogue_turns = columns.utterance_counts(turn_changes)
+        self._dialogue_lengths = (dialogue_turns / 2).tolist()
 
         return sum(self._dialogue_lengths) / len(self._dialogue_lengths)
 
@@ -85,27 +89,28 @@ class Evaluator:
         Returns:
             A dictionary with participant and ActRatio as key-value pairs.
         """
+        codes, first_indices, counts = np.unique(
+            self.columns.participants, return_index=True, return_counts=True
+        )
+        # Participants are listed in order of first appearance
+        order = np.argsort(first_indices)
         statistics: Dict[str, float] = defaultdict(float)
-
-        for dialogue in self._dialogues:
-            for utterance in dialogue.utterances:
-                sender = utterance.participant.name
-                statistics[sender] += 1
+        for code, count in zip(codes[order], counts[order]):
+            statistics[DialogueParticipant(int(code)).name] = float(count)
 
         if len(statistics.keys()) > 2:
             raise TypeError(
                 f"There are more than 2 participants: {statistics.keys()}"
             )
-        statistics_copy = deepcopy(statistics)
-        for sender in statistics.keys():
-            for other_sender in statistics.keys():
-                if sender == other_sender:
-                    continue
-                statistics_copy[f"{sender}/{other_sender}"] = statistics.get(
-                    sender
-                ) / statistics.get(other_sender)
-
-        return statistics_copy
+        ratios = {
+            f"{sender}/{other_sender}": statistics[sender]
+            / statistics[other_sender]
+            for sender in statistics
+            for other_sender in statistics
+            if sender != other_sender
+        }
+        statistics.update(ratios)
+        return statistics
 
     def reward(self) -> Dict[str, List[Dict[str, float]]]:
         """Computes reward for the dialogues, according to the reward config.
@@ -132,11 +137,7 @@ class Evaluator:
         """
         warnings.warn("This function does not yet penalize 'Repeat' actions.")
 
-        if not all(
-            isinstance(utterance, AnnotatedUtterance)
-            for dialogue in self._dialogues
-            for utterance in dialogue.utterances
-        ):
+        if not self.columns.annotated.all():
             raise TypeError(
                 "Some utterances are not instance of 'AnnotatedUtterance'."
             )
@@ -145,37 +146,11 @@ class Evaluator:
         results = self._check_included_intents()
 
         # Check for Repeats
-        for i, dialogue in enumerate(self._dialogues):
-            previous_intents = None
-            previous_sender = None
-            n_repeat_intents = 0
-
-            # Start dialogue with Agent first.
-            for j, utterance in enumerate(dialogue.utterances):
-                if utterance.participant == DialogueParticipant.AGENT:
-                    dialogue_utterances_start_agent: List[
-                        AnnotatedUtterance
-                    ] = dialogue.utterances[
-                        j:
-                    ]  # type: ignore[assignment]
-                    break
-            previous_sender = dialogue_utterances_start_agent[0].participant
-            previous_intents = dialogue_utterances_start_agent[0].get_intents()
-            for j, annotated_utterance in enumerate(
-                dialogue_utterances_start_agent, start=1
-            ):
-                if (
-                    annotated_utterance.participant == previous_sender
-                    and previous_intents == annotated_utterance.get_intents()
-                ):
-                    n_repeat_intents += 1
-                    previous_intents = None
-                    continue
-                previous_intents = annotated_utterance.get_intents()
-                previous_sender = annotated_utterance.participant
-
-            results["dialogues"][i]["repeats"] = n_repeat_intents
-            results["dialogues"][i]["reward"] -= n_repeat_intents
+        for results_dialogue, n_repeat_intents in zip(
+            results["dialogues"], self._count_repeats().tolist()
+        ):
+            results_dialogue["repeats"] = n_repeat_intents
+            results_dialogue["reward"] -= n_repeat_intents
 
         # * Calculate USER/AGENT ratios.
         results = self._user_agent_ratio(results=results)
@@ -185,6 +160,47 @@ class Evaluator:
 
         return results
 
+    def _count_repeats(self) -> np.ndarray:
+        """Counts the repeated intents in each dialogue.
+
+        Dialogues are considered from the first agent utterance, which is
+        counted as a repeat of itself. An utterance repeats the previous one
+        if they have the same participant and intents, unless the previous
+        one is a repeat itself. Hence, a run of n consecutive repeated
+        utterances counts n // 2 repeats.
+
+        Returns:
+            Number of repeats per dialogue.
+        """
+        columns = self.columns
+        positions = np.arange(columns.num_utterances)
+        agent_positions = np.flatnonzero(
+            columns.participants == DialogueParticipant.AGENT.value
+        )
+        agent_dialogues, first_agent_indices = np.unique(
+            columns.dialogue_indices[agent_positions], return_index=True
+        )
+        dialogue_starts = np.full(columns.num_dialogues, columns.num_utterances)
+        dialogue_starts[agent_dialogues] = agent_positions[first_agent_indices]
+        starts = dialogue_starts[columns.dialogue_indices]
+
+        active = positions >= starts
+        repeats_previous = (
+            (positions > starts)
+            & columns.same_participant_as_previous()
+            & columns.same_intents_as_previous()
+        )
+        run_starts = np.flatnonzero(active & ~repeats_previous)
+        run_ids = np.cumsum(active & ~repeats_previous) - 1
+        run_lengths = np.bincount(run_ids[active], minlength=len(run_starts))
+        # The first agent utterance is also compared with itself
+        run_lengths += run_starts == starts[run_starts]
+        return np.bincount(
+            columns.dialogue_indices[run_starts],
+            weights=run_lengths // 2,
+            minlength=columns.num_dialogues,
+        ).astype(int)
+
     def _check_included_intents(self) -> Dict[str, Any]:
         """Sets initial reward.
 
@@ -205,22 +221,17 @@ class Evaluator:
             ],
         }
 
-        dialogue_intents: List[Intent] = []
-        reward = self._reward_config["full_set_points"]
-        for dialogue in self._dialogues:
-            for utterance in dialogue.utterances:
-                if (
-                    isinstance(utterance, AnnotatedUtterance)
-                    and utterance.participant == DialogueParticipant.USER
-                ):
-                    intents = [
-                        Intent(intent.label.split(".")[0])
-                        for intent in utterance.get_intents()
-                    ]
-                    dialogue_intents.extend(intents)
-
-        dialogue_intents_set = set(dialogue_intents)
+        columns = self.columns
+        user_acts = (
+            columns.participants[columns.act_utterances]
+            == DialogueParticipant.USER.value
+        ) & (columns.act_intents >= 0)
+        dialogue_intents_set = {
+            Intent(columns.intent_labels[intent_id].split(".")[0])
+            for intent_id in np.unique(columns.act_intents[user_acts])
+        }
 
+        reward = self._reward_config["full_set_points"]
         for intent_str, penalty in self._reward_config.get("intents").items():
             if Intent(intent_str) not in dialogue_intents_set:
                 reward -= penalty
@@ -242,14 +253,15 @@ class Evaluator:
             Returns results, a dictionary to hold measured metrics. See reward
             function for structure of this dictionary.
         """
-        for i, dialogue in enumerate(self._dialogues):
-            num_user_acts = sum(
-                1
-                for utterance in dialogue.utterances
-                if utterance.participant == DialogueParticipant.USER
-            )
-            results["dialogues"][i]["user_turns"] = num_user_acts
-            results["dialogues"][i][
+        columns = self.columns
+        user_acts = columns.utterance_counts(
+            columns.participants == DialogueParticipant.USER.value
+        )
+        for results_dialogue, num_user_acts in zip(
+            results["dialogues"], user_acts.tolist()
+        ):
+            results_dialogue["user_turns"] = num_user_acts
+            results_dialogue[
                 "reward"
             ] -= num_user_acts * self._reward_config.get("cost")
         return results
@@ -265,13 +277,4 @@ class Evaluator:
         Returns:
             A list with satisfaction score for each dialogue.
         """
-        satisfactions = []
-
-        for dialogue in self._dialogues:
-            satisfactions.append(
-                satisfaction_classifier.classify_last_n_dialogue(
-                    dialogue=dialogue
-                )
-            )
-
-        return satisfactions
+        return satisfaction_classifier.classify_dialogues(self._dialogues)
@@ -1,7 +1,7 @@
 """Methods for reading dialogue exports."""
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
 
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.core.annotation import Annotation
@@ -26,6 +26,9 @@ _FIELD_AGENT = "agent"
 _FIELD_USER = "user"
 _FIELD_METADATA = "metadata"
 
+# Size in characters of the chunks read when parsing a JSON array
+_CHUNK_SIZE = 64 * 1024
+
 
 def json_to_annotated_utterance(
     json_utterance: Dict[Any, Any]
@@ -109,15 +112,205 @@ def json_to_annotated_utterance(
     )
 
 
+def _read_array_start(f: TextIO, chunk_size: int) -> str:
+    """Reads a file up to the opening bracket of a JSON array.
+
+    Args:
+        f: File containing a JSON array.
+        chunk_size: Number of characters read at a time.
+
+    Raises:
+        ValueError: If the file does not start with a JSON array.
+
+    Returns:
+        Characters read after the opening bracket.
+    """
+    # The leading whitespace may span several chunks
+    buffer = f.read(chunk_size).lstrip()
+    while not buffer:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("The file does not contain a JSON array.")
+    return buffer[1:]
+
+
+def _iter_json_array(
+    f: TextIO, chunk_size: int = _CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """Incrementally parses the elements of a JSON array.
+
+    The file is read by chunks and each element is decoded as soon as it is
+    complete, hence only one element is held in memory at a time.
+
+    Args:
+        f: File containing a JSON array.
+        chunk_size: Number of characters read at a time. Defaults to
+          _CHUNK_SIZE.
+
+    Raises:
+        ValueError: If the file does not contain a JSON array.
+        JSONDecodeError: If the array is malformed or truncated.
+
+    Yields:
+        Elements of the array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _read_array_start(f, chunk_size)
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(","):
+            buffer = buffer[1:].lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            element, end = decoder.raw_decode(buffer)
+            # A number ending the buffer may continue in the next chunk
+            complete = eof or end < len(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # The chunk grows with the buffer to avoid decoding large
+            # elements many times
+            chunk = f.read(max(chunk_size, len(buffer)))
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield element
+        buffer = buffer[end:]
+
+
+def _read_dialogues_data(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """Reads the dialogues from a JSON or JSONL file.
+
+    The format is detected from the first character of the file: a JSON file
+    contains an array of dialogues, while a JSONL file contains one dialogue
+    per line. In both cases, dialogues are read one at a time.
+
+    Args:
+        f: File containing the dialogues.
+
+    Yields:
+        Dialogues in dictionary format.
+    """
+    first_char = f.read(1)
+    while first_char.isspace():
+        first_char = f.read(1)
+    if not first_char:
+        return
+    f.seek(0)
+
+    if first_char == "[":
+        yield from _iter_json_array(f)
+        return
+
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def dialogue_from_dict(
+    dialogue_data: Dict[str, Any], fields: Iterable[str] = None
+) -> Dialogue:
+    """Builds a dialogue from its dictionary format.
+
+    Args:
+        dialogue_data: Dialogue in dictionary format.
+        fields: Utterance fields to load, the utterance text and participant
+          are always loaded. Defaults to None, in which case all the fields
+          are loaded.
+
+    Returns:
+        Dialogue object.
+    """
+    dialogue = Dialogue(
+        dialogue_data.get(_FIELD_AGENT, {}).get("id", "Agent"),
+        dialogue_data.get(_FIELD_USER, {}).get("id", "User"),
+        dialogue_data.get(_FIELD_CONVERSATION_ID, None),
+    )
+    metadata = dialogue_data.get(_FIELD_METADATA, None)
+    if metadata:
+        dialogue._metadata = metadata
+
+    if fields is not None:
+        fields = set(fields) | {_FIELD_UTTERANCE, _FIELD_PARTICIPANT}
+
+    for utterance_data in dialogue_data.get(_FIELD_CONVERSATION):
+        if fields is not None:
+            utterance_data = {
+                k: v for k, v in utterance_data.items() if k in fields
+            }
+        annotated_utterance = json_to_annotated_utterance(utterance_data)
+        dialogue.add_utterance(annotated_utterance)
+        utterance_feedback = utterance_data.get(_FIELD_UTTERANCE_FEEDBACK, None)
+        if utterance_feedback is not None:
+            dialogue.add_utterance_feedback(
+                UtteranceFeedback(
+                    utterance_id=annotated_utterance.utterance_id,
+                    feedback=(
+                        BinaryFeedback.POSITIVE
+                        if utterance_feedback == 1
+                        else BinaryFeedback.NEGATIVE
+                    ),
+                ),
+                annotated_utterance.utterance_id,
+            )
+    return dialogue
+
+
+def iter_dialogues(
+    filepath: str,
+    agent_ids: List[str] = None,
+    user_ids: List[str] = None,
+    fields: Iterable[str] = None,
+) -> Iterator[Dialogue]:
+    """Lazily parses a JSON or JSONL file containing dialogues.
+
+    Dialogues are read and built one at a time. Those discarded by the filters
+    are skipped before any object is built.
+
+    Args:
+        filepath: Path to JSON file containing an array of dialogues, or to
+          JSONL file containing one dialogue per line.
+        agent_ids: List of agents' id to filter loaded dialogues. Defaults to
+          None.
+        user_ids: List of users' id to filter loaded dialogues. Defaults to
+          None.
+        fields: Utterance fields to load, e.g., ["utterance", "participant"].
+          The utterance text and participant are always loaded. Defaults to
+          None, in which case all the fields are loaded.
+
+    Yields:
+        Dialogue objects.
+    """
+    with open(filepath, encoding="utf-8") as f:
+        for dialogue_data in _read_dialogues_data(f):
+            agent_id = dialogue_data.get(_FIELD_AGENT, {}).get("id", "Agent")
+            user_id = dialogue_data.get(_FIELD_USER, {}).get("id", "User")
+            if (agent_ids and agent_id not in agent_ids) or (
+                user_ids and user_id not in user_ids
+            ):
+                # Filter loaded dialogues based on agent_ids and/or user_ids if
+                # provided
+                continue
+            yield dialogue_from_dict(dialogue_data, fields)
+
+
 def json_to_dialogues(
     filepath: str,
     agent_ids: List[str] = None,
     user_ids: List[str] = None,
 ) -> List[Dialogue]:
-    """Parses a JSON file containing dialogues.
+    """Parses a JSON or JSONL file containing dialogues.
 
     Args:
-        filepath: Path to JSON file containing the dialogues.
+        filepath: Path to JSON file containing an array of dialogues, or to
+          JSONL file containing one dialogue per line.
         agent_ids: List of agents' id to filter loaded dialogues. Defaults to
           None.
         user_ids: List of users' id to filter loaded dialogues. Defaults to
@@ -126,43 +319,4 @@ def json_to_dialogues(
     Returns:
         A list of Dialogue objects.
     """
-    f = open(filepath, encoding="utf-8")
-    data = json.load(f)
-
-    dialogues = []
-    for dialogue_data in data:
-        conversation_id = dialogue_data.get(_FIELD_CONVERSATION_ID, None)
-        agent_id = dialogue_data.get(_FIELD_AGENT, {}).get("id", "Agent")
-        user_id = dialogue_data.get(_FIELD_USER, {}).get("id", "User")
-        if (agent_ids and agent_id not in agent_ids) or (
-            user_ids and user_id not in user_ids
-        ):
-            # Filter loaded dialogues based on agent_ids and/or user_ids if
-            # provided
-            continue
-        dialogue = Dialogue(agent_id, user_id, conversation_id)
-        metadata = dialogue_data.get(_FIELD_METADATA, None)
-        if metadata:
-            dialogue._metadata = metadata
-
-        for utterance_data in dialogue_data.get(_FIELD_CONVERSATION):
-            annotated_utterance = json_to_annotated_utterance(utterance_data)
-            dialogue.add_utterance(annotated_utterance)
-            utterance_feedback = utterance_data.get(
-                _FIELD_UTTERANCE_FEEDBACK, None
-            )
-            if utterance_feedback is not None:
-                dialogue.add_utterance_feedback(
-                    UtteranceFeedback(
-                        utterance_id=annotated_utterance.utterance_id,
-                        feedback=(
-                            BinaryFeedback.POSITIVE
-                            if utterance_feedback == 1
-                            else BinaryFeedback.NEGATIVE
-                        ),
-                    ),
-                    annotated_utterance.utterance_id,
-                )
-        dialogues.append(dialogue)
-
-    return dialogues
+    return list(iter_dialogues(filepath, agent_ids, user_ids))
@@ -0,0 +1,166 @@
+"""Process-wide registry of loaded models.
+
+Components using the same model, e.g., metrics computing different features
+with the same language model, acquire it from the registry instead of loading
+their own copy. Models are identified by their kind, name, device, and data
+type, and are reference counted. Models no longer used are kept for later
+reuse unless eviction is enabled or explicitly requested.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+_Key = Tuple[str, str, str, str]
+
+
+class _Entry:
+    def __init__(self) -> None:
+        """Initializes a registry entry."""
+        self.model: Any = None
+        self.refcount = 0
+        # Held while loading, hence different models can load concurrently
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    def __init__(self, evict_on_release: bool = False) -> None:
+        """Initializes the model registry.
+
+        Args:
+            evict_on_release: Whether to drop models as soon as they are no
+              longer referenced. Defaults to False.
+        """
+        self.evict_on_release = evict_on_release
+        self._entries: Dict[_Key, _Entry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(kind: str, name: str, device: Any, dtype: Any) -> _Key:
+        """Builds the key of a model.
+
+        Args:
+            kind: Kind of model, e.g., "text-generation".
+            name: Name of the model.
+            device: Device of the model.
+            dtype: Data type of the model.
+
+        Returns:
+            Key of the model.
+        """
+        return (kind, name, str(device), str(dtype))
+
+    def acquire(
+        self,
+        kind: str,
+        name: str,
+        loader: Callable[[], Any],
+        device: Any = None,
+        dtype: Any = None,
+    ) -> Any:
+        """Acquires a model, loading it if it is not in the registry.
+
+        Each call must be matched by a call to `release`.
+
+        Args:
+            kind: Kind of model, e.g., "text-generation".
+            name: Name of the model.
+            loader: Function loading the model.
+            device: Device of the model. Defaults to None.
+            dtype: Data type of the model. Defaults to None.
+
+        Returns:
+            Model.
+        """
+        key = self._key(kind, name, device, dtype)
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            entry.refcount += 1
+
+        try:
+            with entry.lock:
+                if entry.model is None:
+                    entry.model = loader()
+        except Exception:
+            self.release(kind, name, device, dtype)
+            raise
+        return entry.model
+
+    def release(
+        self, kind: str, name: str, device: Any = None, dtype: Any = None
+    ) -> None:
+        """Releases a model acquired previously.
+
+        Args:
+            kind: Kind of model, e.g., "text-generation".
+            name: Name of the model.
+            device: Device of the model. Defaults to None.
+            dtype: Data type of the model. Defaults to None.
+
+        Raises:
+            ValueError: If the model is not acquired.
+        """
+        key = self._key(kind, name, device, dtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount == 0:
+                raise ValueError(f"Model {key} is not acquired.")
+            entry.refcount -= 1
+            if entry.refcount == 0 and (
+                self.evict_on_release or entry.model is None
+            ):
+                del self._entries[key]
+
+    def evict_unused(self) -> int:
+        """Drops the models that are no longer referenced.
+
+        Returns:
+            Number of models dropped.
+        """
+        with self._lock:
+            unused = [
+                key
+                for key, entry in self._entries.items()
+                if entry.refcount == 0
+            ]
+            for key in unused:
+                del self._entries[key]
+        return len(unused)
+
+    def refcount(
+        self, kind: str, name: str, device: Any = None, dtype: Any = None
+    ) -> int:
+        """Returns the number of references to a model.
+
+        Args:
+            kind: Kind of model, e.g., "text-generation".
+            name: Name of the model.
+            device: Device of the model. Defaults to None.
+            dtype: Data type of the model. Defaults to None.
+
+        Returns:
+            Number of references, 0 if the model is not in the registry.
+        """
+        key = self._key(kind, name, device, dtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.refcount if entry else 0
+
+    def __contains__(self, key: _Key) -> bool:
+        """Checks whether a model is in the registry.
+
+        Args:
+            key: Tuple of kind, name, device, and data type.
+
+        Returns:
+            True if the model is loaded or being loaded.
+        """
+        with self._lock:
+            return self._key(*key) in self._entries
+
+
+_MODEL_REGISTRY = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the model registry of the process."""
+    return _MODEL_REGISTRY
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import os
 from typing import TYPE_CHECKING
 from uuid import uuid4
@@ -11,6 +10,7 @@ from dialoguekit.connector.dialogue_connector import DialogueConnector
 from dialoguekit.participant.agent import Agent
 from dialoguekit.participant.user import User
 from simlab.participant.wrapper_user_simulator import WrapperUserSimulator
+from simlab.utils.dialogue_writer import get_dialogue_writer
 
 if TYPE_CHECKING:
     from simlab.simulation_platform import SimulationPlatform
@@ -32,20 +32,27 @@ class SimulationDialogueConnector(DialogueConnector):
             user: An instance of User.
             platform: An instance of SimulationPlatform.
             output_dir: Output directory to save the dialogue.
-            conversation_id: Conversation ID. Defaults to None.
+            conversation_id: Conversation ID. Defaults to None, in which case
+              a unique ID is generated.
         """
         super().__init__(
-            agent, user, platform, conversation_id, save_dialogue_history=True
+            agent,
+            user,
+            platform,
+            conversation_id or str(uuid4()),
+            save_dialogue_history=True,
         )
         self._output_dir = output_dir
 
     def _dump_dialogue_history(self) -> None:
         """Exports the dialogue history.
 
-        The exported files will be named as 'AgentID_UserID.json'
+        The exported files will be named as 'AgentID_UserID.jsonl'. The
+        listeners of the platform are notified with each exported dialogue.
 
         If the two participants have had a conversation previously, the new
-        conversation will be appended to the same export document.
+        conversation will be appended as a new line to the same export
+        document.
 
         Per dialogue, the dialogue metadata will be added. Also per utterance
         the utterance metadata, will be added to the same level as the utterance
@@ -56,27 +63,16 @@ class SimulationDialogueConnector(DialogueConnector):
             return
 
         history = self._dialogue_history
-        history._conversation_id = str(uuid4())
         file_name = os.path.join(
-            self._output_dir, f"{self._agent.id}_{self._user.id}.json"
+            self._output_dir, f"{self._agent.id}_{self._user.id}.jsonl"
         )
-        json_file = []
-
-        # Check directory and read if exists.
-        if not os.path.exists(self._output_dir):
-            os.makedirs(self._output_dir)
-        if os.path.exists(file_name):
-            with open(file_name, encoding="utf-8") as json_file_out:
-                json_file = json.load(json_file_out)
 
         dialogue_as_dict = history.to_dict()
         dialogue_as_dict["agent"] = self._agent.to_dict()
         dialogue_as_dict["user"] = self._user.to_dict()
 
-        json_file.append(dialogue_as_dict)
-
-        with open(file_name, "w", encoding="utf-8") as outfile:
-            json.dump(json_file, outfile)
+        get_dialogue_writer(file_name).write(dialogue_as_dict)
+        self._platform.notify_dialogue_finished(dialogue_as_dict)
 
         # Empty dialogue history to avoid duplicate save
         for _ in range(len(self._dialogue_history.utterances)):
@@ -2,22 +2,45 @@
 
 Workflow:
 1. Load simulation configuration and save it for future reference.
-2. Instantiate all components required for the simulation.
+2. Instantiate all components required for the simulation and pull the images
+   of all the participants in parallel.
 For each agent-user simulator pair:
     3. Start containers for the agent and user simulator.
     4. Generate synthetic conversations.
     5. Evaluate the performance of the agent based on the synthetic
        conversations.
 6. Aggregate and save the evaluation results.
+
+Containers are kept warm across pairs: each one is started once, reconfigured
+for every pair needing its image, and stopped after the last of them.
+
+In streaming mode, step 5 overlaps with step 4: each finished dialogue is
+evaluated while the next ones are generated, instead of reading the exported
+dialogues back once all of them are generated.
+
+Agent-user simulator pairs are independent from each other and can be evaluated
+concurrently. In that case, each container is assigned its own range of local
+ports and each pair its own dialogue export file.
 """
 
 import argparse
+import copy
+import functools
 import itertools
 import os
-from statistics import mean, median, stdev
-from typing import Any, Dict, List, Tuple
-
-import numpy as np
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from uuid import uuid4
 
 from connectors.docker.commands import (
     DOCKER_PASSWORD_FILE,
@@ -26,10 +49,20 @@ from connectors.docker.commands import (
     DOCKER_USERNAME,
     DockerRegistryMetadata,
     clean_local_docker_registry,
+    close_docker_client,
+    docker_prefetch_images,
     docker_pull_image,
     docker_run_container,
     docker_stop_container,
+    get_container_health,
+    has_healthcheck,
     inspect_image,
+    watch_container_exit,
+)
+from connectors.docker.image_cache import (
+    DOCKER_IMAGE_CACHE_BUDGET_GB,
+    DOCKER_IMAGE_CACHE_PATH,
+    ImageCache,
 )
 from connectors.mongo.mongo_connector import (
     DEFAULT_DB,
@@ -37,25 +70,43 @@ from connectors.mongo.mongo_connector import (
     MongoDBConnector,
 )
 from connectors.mongo.utils import insert_record, update_record
-from dialoguekit.utils.dialogue_reader import json_to_dialogues
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.utils.dialogue_reader import iter_dialogues
 from simlab.core.information_need import InformationNeed
 from simlab.core.run_configuration import (
     ParticipantConfiguration,
     RunConfiguration,
 )
+from simlab.metrics.evaluation_cache import (
+    EvaluationCache,
+    MongoEvaluationCache,
+    SQLiteEvaluationCache,
+)
 from simlab.participant.wrapper_agent import WrapperAgent
 from simlab.participant.wrapper_user_simulator import WrapperUserSimulator
 from simlab.simulation_platform import SimulationPlatform
+from simlab.tasks.streaming_evaluator import StreamingEvaluator
 from simlab.tasks.task import Task
+from simlab.utils.aggregation import aggregate_scores, information_need_key
 from simlab.utils.configuration_readers.base_configuration_reader import (
     BaseConfigurationReader,
 )
+from simlab.utils.container_pool import ContainerPool, WarmContainer
+from simlab.utils.dialogue_writer import close_dialogue_writer
 from simlab.utils.participant_api.utils_api_calls import (
     configure_participant,
     wait_for_participant,
 )
+from simlab.utils.port_allocator import DEFAULT_BASE_PORT, PortAllocator
+from simlab.utils.time_to_ready import (
+    get_time_to_ready_stats,
+    record_time_to_ready,
+)
 
 _NUM_ITER_PER_INFORMATION_NEED = 3
+# Image label declaring the route of the API answering once the participant is
+# ready
+_READINESS_PATH_LABEL = "readiness_path"
 
 
 def parse_args() -> argparse.Namespace:
@@ -116,6 +167,52 @@ def parse_args() -> argparse.Namespace:
         default="data/dialogue_export",
         help="Path to the output directory for the task.",
     )
+    # Scheduling arguments
+    parser.add_argument(
+        "--max_parallel_pairs",
+        type=int,
+        default=1,
+        help="Maximum number of agent-user simulator pairs evaluated at once.",
+    )
+    parser.add_argument(
+        "--max_concurrent_dialogues",
+        type=int,
+        default=1,
+        help="Maximum number of dialogues held at once by a pair.",
+    )
+    parser.add_argument(
+        "--base_port",
+        type=int,
+        default=DEFAULT_BASE_PORT,
+        help="First local port that can be bound to a participant container.",
+    )
+    parser.add_argument(
+        "--streaming_evaluation",
+        action="store_true",
+        help="Evaluate dialogues while the next ones are generated.",
+    )
+    parser.add_argument(
+        "--evaluation_cache",
+        type=str,
+        choices=["none", "local", "mongo"],
+        default="none",
+        help="Where to cache evaluation scores: nowhere, in a local SQLite "
+        "database in the output directory, or in MongoDB.",
+    )
+    # Image cache arguments
+    parser.add_argument(
+        "--image_cache_path",
+        type=str,
+        default=DOCKER_IMAGE_CACHE_PATH,
+        help="Path to the database of the images cached on the worker.",
+    )
+    parser.add_argument(
+        "--image_cache_budget",
+        type=float,
+        default=DOCKER_IMAGE_CACHE_BUDGET_GB,
+        help="Disk budget in GB of the images cached on the worker, the least "
+        "recently used ones are removed when it is exceeded.",
+    )
     return parser.parse_args()
 
 
@@ -137,28 +234,88 @@ def generate_synthetic_dialogues(
     agent: WrapperAgent,
     information_needs: List[InformationNeed],
     output_dir: str,
+    max_concurrent_dialogues: int = 1,
 ) -> None:
     """Generates synthetic dialogues for the given agent-user simulator pair.
 
+    If more than one dialogue is allowed at a time, each conversation is held
+    by dedicated copies of the participants and identified by a unique
+    conversation ID, which is sent to the participants along with each request
+    so they can keep the state of concurrent conversations apart.
+
     Args:
         simulation_platform: Simulation platform.
         user_simulator: User simulator.
         agent: Agent.
         information_needs: List of information needs.
         output_dir: Path to the output directory for the task.
+        max_concurrent_dialogues: Maximum number of conversations held at the
+          same time. Defaults to 1.
     """
-    for information_need in information_needs:
-        user_simulator.set_information_need(information_need)
-        simulation_platform.connect(
-            user_simulator.id, user_simulator, agent, output_dir
-        )
-        simulation_platform.disconnect(user_simulator.id, agent.id)
+    if max_concurrent_dialogues <= 1:
+        for information_need in information_needs:
+            user_simulator.set_information_need(information_need)
+            simulation_platform.connect(
+                user_simulator.id, user_simulator, agent, output_dir
+            )
+            simulation_platform.disconnect(user_simulator.id, agent.id)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concurrent_dialogues) as executor:
+        futures = [
+            executor.submit(
+                _generate_synthetic_dialogue,
+                simulation_platform,
+                user_simulator,
+                agent,
+                information_need,
+                output_dir,
+            )
+            for information_need in information_needs
+        ]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _generate_synthetic_dialogue(
+    simulation_platform: SimulationPlatform,
+    user_simulator: WrapperUserSimulator,
+    agent: WrapperAgent,
+    information_need: InformationNeed,
+    output_dir: str,
+) -> None:
+    """Generates a single synthetic dialogue in its own conversation.
+
+    Args:
+        simulation_platform: Simulation platform.
+        user_simulator: User simulator.
+        agent: Agent.
+        information_need: Information need.
+        output_dir: Path to the output directory for the task.
+    """
+    conversation_id = str(uuid4())
+    user_simulator = user_simulator.for_conversation(conversation_id)
+    agent = agent.for_conversation(conversation_id)
+    # The platform identifies active conversations by agent and user IDs
+    user_key = f"{user_simulator.id}_{conversation_id}"
+
+    user_simulator.set_information_need(information_need)
+    simulation_platform.connect(
+        user_key, user_simulator, agent, output_dir, conversation_id
+    )
+    simulation_platform.disconnect(user_key, agent.id)
 
 
 def start_participant(
     registry_metadata: DockerRegistryMetadata,
     participant_configuration: ParticipantConfiguration,
     port: int,
+    max_port: int = None,
 ) -> Tuple[str, List[int]]:
     """Starts a container for a participant.
 
@@ -166,6 +323,8 @@ def start_participant(
         registry_metadata: Docker registry metadata.
         participant_configuration: Participant configuration.
         port: Local port to bind the container to.
+        max_port: Last local port the container may be bound to. Defaults to
+          None, i.e., no limit.
 
     Raises:
         RuntimeError: If the participant fails to start.
@@ -201,29 +360,42 @@ def start_participant(
             exposed_ports.remove(flask_exposed_port)
 
         ports_used.append(port)
-        run_args = f"-p {port}:{flask_exposed_port}"
+        container_ports = {f"{flask_exposed_port}/tcp": port}
 
         # Configure the participant
-        participant_configuration.participant._uri = f"http://localhost:{port}"
+        participant_configuration.participant.uri = f"http://localhost:{port}"
 
         for exposed_port in exposed_ports:
             port += 1
             ports_used.append(port)
-            run_args += f" -p {port}:{exposed_port}"
+            container_ports[f"{exposed_port}/tcp"] = port
+
+        if max_port is not None and max(ports_used) > max_port:
+            raise ValueError(
+                f"Ports {ports_used} exceed the allocated range (max port: "
+                f"{max_port})"
+            )
 
+        started_at = time.time()
         container_id = docker_run_container(
-            participant_configuration.image, run_args, registry_metadata
+            participant_configuration.image, container_ports, registry_metadata
         )
 
         # Wait for participant to be ready
-        wait_for_participant(participant_configuration.participant._uri)
+        _wait_for_container(
+            container_id, participant_configuration, image_info, started_at
+        )
 
-        configure_participant(
-            participant_configuration.participant._uri,
-            participant_configuration.participant.id,
-            participant_configuration.custom_parameters,
+        participant_configuration.participant.context_mode = (
+            configure_participant(
+                participant_configuration.participant.uri,
+                participant_configuration.participant.id,
+                participant_configuration.custom_parameters,
+            )
         )
     except Exception as e:
+        if container_id is not None:
+            docker_stop_container(container_id)
         raise RuntimeError(
             "Failed to start participant "
             f"{participant_configuration.participant.id}: {e}"
@@ -231,6 +403,41 @@ def start_participant(
     return container_id, ports_used
 
 
+def _wait_for_container(
+    container_id: str,
+    participant_configuration: ParticipantConfiguration,
+    image_info: Dict[str, Any],
+    started_at: float,
+) -> None:
+    """Waits for the participant of a container to be ready.
+
+    The health check of the image is used if it has one, otherwise the
+    readiness path declared by its labels, if any. Waiting stops as soon as
+    the container exits. The time to ready is recorded per image.
+
+    Args:
+        container_id: Container ID.
+        participant_configuration: Participant configuration.
+        image_info: Information of the image of the container.
+        started_at: Timestamp at which the container was started.
+    """
+    health_status = None
+    if has_healthcheck(image_info):
+        health_status = functools.partial(get_container_health, container_id)
+    labels = (image_info.get("Config") or {}).get("Labels") or {}
+
+    with watch_container_exit(container_id, since=started_at) as exited:
+        wait_for_participant(
+            participant_configuration.participant.uri,
+            readiness_path=labels.get(_READINESS_PATH_LABEL),
+            health_status=health_status,
+            stopped=exited,
+        )
+    record_time_to_ready(
+        participant_configuration.image, time.time() - started_at
+    )
+
+
 def evaluate_participant_pair(
     agent_configuration: ParticipantConfiguration,
     user_simulator_configuration: ParticipantConfiguration,
@@ -238,6 +445,10 @@ def evaluate_participant_pair(
     configuration: RunConfiguration,
     output_dir: str,
     registry_metadata: DockerRegistryMetadata,
+    container_pool: Optional[ContainerPool] = None,
+    max_concurrent_dialogues: int = 1,
+    streaming_evaluation: bool = False,
+    evaluation_cache: Optional[EvaluationCache] = None,
 ) -> Dict[str, Any]:
     """Evaluates the performance of an agent-user simulator pair.
 
@@ -248,49 +459,93 @@ def evaluate_participant_pair(
         configuration: Simulation configuration.
         output_dir: Path to the output directory for the task.
         registry_metadata: Docker registry metadata.
+        container_pool: Pool of containers shared with other pairs, in which
+          the images of the pair are reserved. Defaults to None, i.e., the
+          containers are started for this pair only.
+        max_concurrent_dialogues: Maximum number of dialogues held at the same
+          time. Defaults to 1.
+        streaming_evaluation: Whether to evaluate dialogues while the next
+          ones are generated. Defaults to False.
+        evaluation_cache: Cache of evaluation scores. Defaults to None.
 
     Returns:
         Evaluation record.
     """
-    # Pull images for the agent and user simulator and start the containers
-    # TODO: This solution is suboptimal. See issue:
-    #
-    agent_port = 7000
-    agent_container_id, agent_ports = start_participant(
-        registry_metadata, agent_configuration, agent_port
-    )
-
-    simulator_port = max(agent_ports) + 1
-    simulator_container_id, _ = start_participant(
-        registry_metadata,
-        user_simulator_configuration,
-        simulator_port,
-    )
+    if container_pool is None:
+        with _create_container_pool(
+            registry_metadata,
+            PortAllocator(),
+            [(agent_configuration, user_simulator_configuration)],
+        ) as container_pool:
+            return evaluate_participant_pair(
+                agent_configuration,
+                user_simulator_configuration,
+                simulation_platform,
+                configuration,
+                output_dir,
+                registry_metadata,
+                container_pool,
+                max_concurrent_dialogues,
+                streaming_evaluation,
+                evaluation_cache,
+            )
 
     agent = agent_configuration.participant
     user_simulator = user_simulator_configuration.participant
 
-    # Generate synthetic dialogues
-    # For each information need, generate N synthetic dialogues to account for
-    # non-determinism of dialogue participants
-    for _ in range(_NUM_ITER_PER_INFORMATION_NEED):
-        generate_synthetic_dialogues(
-            simulation_platform,
-            user_simulator,  # type: ignore[arg-type]
-            agent,  # type: ignore[arg-type]
-            configuration.task.information_needs,
-            output_dir,
-        )
-
-    # Stop the containers
-    docker_stop_container(agent_container_id)
-    docker_stop_container(simulator_container_id)
+    streaming_evaluator = None
+    containers: List[WarmContainer] = []
+    reuse = False
+    try:
+        if streaming_evaluation:
+            streaming_evaluator = StreamingEvaluator(
+                configuration.task, cache=evaluation_cache
+            )
+            simulation_platform.add_dialogue_listener(
+                streaming_evaluator.submit
+            )
+
+        # Get warm containers for the agent and user simulator, or start them
+        containers.append(container_pool.acquire(agent_configuration))
+        containers.append(container_pool.acquire(user_simulator_configuration))
+
+        # Generate synthetic dialogues
+        # For each information need, generate N synthetic dialogues to account
+        # for non-determinism of dialogue participants
+        for _ in range(_NUM_ITER_PER_INFORMATION_NEED):
+            generate_synthetic_dialogues(
+                simulation_platform,
+                user_simulator,  # type: ignore[arg-type]
+                agent,  # type: ignore[arg-type]
+                configuration.task.information_needs,
+                output_dir,
+                max_concurrent_dialogues,
+            )
+        reuse = True
+    finally:
+        try:
+            # Hand the containers over to the next pairs, or stop them
+            for container in containers:
+                container_pool.release(container, reuse)
+        finally:
+            # Stop the evaluation worker, also when the generation failed
+            if streaming_evaluator is not None:
+                streaming_evaluator.close()
 
     # Evaluate the performance of the agent
     dialogues_dir = os.path.join(
-        output_dir, f"{agent.id}_{user_simulator.id}.json"
+        output_dir, f"{agent.id}_{user_simulator.id}.jsonl"
     )
-    results = _dialogues_evaluation(dialogues_dir, configuration.task)
+    close_dialogue_writer(dialogues_dir)
+    if streaming_evaluator is not None:
+        results = _aggregate_results(
+            streaming_evaluator.finish(),
+            streaming_evaluator.information_needs(),
+        )
+    else:
+        results = _dialogues_evaluation(
+            dialogues_dir, configuration.task, evaluation_cache
+        )
 
     evaluation_summary = {
         "run_name": configuration.name,
@@ -304,33 +559,171 @@ def evaluate_participant_pair(
     return evaluation_summary
 
 
-def _dialogues_evaluation(dialogues_dir: str, task: Task) -> Dict[str, Any]:
+def _dialogues_evaluation(
+    dialogues_dir: str,
+    task: Task,
+    evaluation_cache: Optional[EvaluationCache] = None,
+) -> Dict[str, Any]:
     """Evaluates the dialogues in the given directory.
 
     Args:
         dialogues_dir: Path to the directory containing the dialogues.
         task: Evaluation task.
+        evaluation_cache: Cache of evaluation scores. Defaults to None.
 
     Returns:
        Evaluation results.
     """
-    synthetic_dialogues = json_to_dialogues(dialogues_dir)
-    agent_evaluation_results = task.evaluation(synthetic_dialogues)
-
-    results = {}
-    # Aggregate the evaluation results
-    for metric, values in agent_evaluation_results.items():
-        results[metric] = {
-            "values": values,
-            "mean": mean(values),
-            "std": stdev(values),
-            "median": median(values),
-            "min": min(values),
-            "max": max(values),
-            "q1": np.quantile(values, 0.25),
-            "q3": np.quantile(values, 0.75),
-        }
-    return results
+    synthetic_dialogues = iter_dialogues(
+        dialogues_dir, fields=task.required_fields
+    )
+    information_needs: List[Optional[str]] = []
+    evaluation_results = task.evaluation(
+        _track_information_needs(synthetic_dialogues, information_needs),
+        cache=evaluation_cache,
+    )
+    return _aggregate_results(evaluation_results, information_needs)
+
+
+def _track_information_needs(
+    dialogues: Iterable[Dialogue], information_needs: List[Optional[str]]
+) -> Iterator[Dialogue]:
+    """Yields dialogues, recording their information needs along the way.
+
+    Args:
+        dialogues: Dialogues.
+        information_needs: List to which the information need key of each
+          dialogue is appended.
+
+    Yields:
+        Dialogues.
+    """
+    for dialogue in dialogues:
+        information_needs.append(information_need_key(dialogue))
+        yield dialogue
+
+
+def _aggregate_results(
+    evaluation_results: Dict[str, List[float]],
+    information_needs: Optional[List[Optional[str]]] = None,
+) -> Dict[str, Any]:
+    """Aggregates the evaluation scores of each metric.
+
+    Scores are grouped by information need, which the confidence intervals
+    account for.
+
+    Args:
+        evaluation_results: Evaluation scores for each metric.
+        information_needs: Information need key of each dialogue. Defaults to
+          None, i.e., dialogues are independent.
+
+    Returns:
+        Evaluation results.
+    """
+    return {
+        metric: aggregate_scores(values, information_needs)
+        for metric, values in evaluation_results.items()
+    }
+
+
+def _evaluate_scheduled_pair(
+    agent_configuration: ParticipantConfiguration,
+    user_simulator_configuration: ParticipantConfiguration,
+    configuration: RunConfiguration,
+    output_dir: str,
+    registry_metadata: DockerRegistryMetadata,
+    container_pool: ContainerPool,
+    max_concurrent_dialogues: int = 1,
+    streaming_evaluation: bool = False,
+    evaluation_cache: Optional[EvaluationCache] = None,
+) -> Dict[str, Any]:
+    """Evaluates a pair scheduled alongside other pairs.
+
+    The participants are copied as their URI depends on the container they
+    are given, and the same participant can be part of several pairs running
+    at the same time.
+
+    Args:
+        agent_configuration: Agent configuration.
+        user_simulator_configuration: User simulator configuration.
+        configuration: Simulation configuration.
+        output_dir: Path to the output directory for the task.
+        registry_metadata: Docker registry metadata.
+        container_pool: Pool of containers shared by all pairs.
+        max_concurrent_dialogues: Maximum number of dialogues held at the same
+          time by the pair. Defaults to 1.
+        streaming_evaluation: Whether to evaluate dialogues while the next
+          ones are generated. Defaults to False.
+        evaluation_cache: Cache of evaluation scores. Defaults to None.
+
+    Returns:
+        Evaluation record.
+    """
+    agent_configuration = _copy_participant_configuration(agent_configuration)
+    user_simulator_configuration = _copy_participant_configuration(
+        user_simulator_configuration
+    )
+
+    return evaluate_participant_pair(
+        agent_configuration,
+        user_simulator_configuration,
+        SimulationPlatform(WrapperAgent),
+        configuration,
+        output_dir,
+        registry_metadata,
+        container_pool,
+        max_concurrent_dialogues,
+        streaming_evaluation,
+        evaluation_cache,
+    )
+
+
+def _copy_participant_configuration(
+    participant_configuration: ParticipantConfiguration,
+) -> ParticipantConfiguration:
+    """Copies a participant configuration and its participant.
+
+    Args:
+        participant_configuration: Participant configuration.
+
+    Returns:
+        Copy of the participant configuration.
+    """
+    participant_configuration = copy.copy(participant_configuration)
+    participant_configuration.participant = copy.copy(
+        participant_configuration.participant
+    )
+    return participant_configuration
+
+
+def _create_container_pool(
+    registry_metadata: DockerRegistryMetadata,
+    port_allocator: PortAllocator,
+    participant_pairs: List[
+        Tuple[ParticipantConfiguration, ParticipantConfiguration]
+    ],
+) -> ContainerPool:
+    """Creates a pool of containers for agent-user simulator pairs.
+
+    Args:
+        registry_metadata: Docker registry metadata.
+        port_allocator: Allocator of local port ranges for the containers.
+        participant_pairs: Agent and user simulator configurations of the
+          pairs, whose images are reserved in the pool.
+
+    Returns:
+        Container pool.
+    """
+    container_pool = ContainerPool(
+        registry_metadata,
+        port_allocator,
+        start_participant,
+        docker_stop_container,
+    )
+    for participant_configurations in participant_pairs:
+        for participant_configuration in participant_configurations:
+            container_pool.reserve(participant_configuration.image)
+    return container_pool
 
 
 def main(
@@ -338,6 +731,12 @@ def main(
     mongo_connector: MongoDBConnector,
     registry_metadata: DockerRegistryMetadata,
     output_dir: str,
+    max_parallel_pairs: int = 1,
+    base_port: int = DEFAULT_BASE_PORT,
+    max_concurrent_dialogues: int = 1,
+    streaming_evaluation: bool = False,
+    evaluation_cache: Optional[EvaluationCache] = None,
+    image_cache: Optional[ImageCache] = None,
 ) -> None:
     """Runs the simulation-based evaluation given a configuration.
 
@@ -346,6 +745,22 @@ def main(
         mongo_connector: MongoDB connector.
         registry_metadata: Docker registry metadata.
         output_dir: Path to the output directory for the task.
+        max_parallel_pairs: Maximum number of agent-user simulator pairs
+          evaluated concurrently. Defaults to 1.
+        base_port: First local port that can be bound to a participant
+          container. Defaults to DEFAULT_BASE_PORT.
+        max_concurrent_dialogues: Maximum number of dialogues held at the same
+          time by each pair. Defaults to 1.
+        streaming_evaluation: Whether to evaluate dialogues while the next
+          ones are generated. Defaults to False.
+        evaluation_cache: Cache of evaluation scores shared by the pairs.
+          Defaults to None.
+        image_cache: Cache of the images on the worker, recording the use of
+          the images of the pairs. Defaults to None.
+
+    Raises:
+        ValueError: If several pairs share the same agent and user simulator
+          IDs, as their dialogues would be exported to the same file.
     """
     # Generate all possible agent-user simulator pairs
     participant_pairs = list(
@@ -355,23 +770,83 @@ def main(
         )
     )
 
-    simulation_platform = SimulationPlatform(WrapperAgent)
-
-    for agent, user_simulator in participant_pairs:
-        agent_evaluation_summary = evaluate_participant_pair(
-            agent,
-            user_simulator,
-            simulation_platform,
-            configuration,
-            output_dir,
-            registry_metadata,
-        )
-        insert_record(
-            mongo_connector,
-            "evaluation_results",
-            agent_evaluation_summary,
+    pair_ids = [
+        (agent.participant.id, user_simulator.participant.id)
+        for agent, user_simulator in participant_pairs
+    ]
+    if len(set(pair_ids)) != len(pair_ids):
+        raise ValueError(
+            "Agent-user simulator pairs must have unique IDs to keep their "
+            "dialogue exports separate."
         )
 
+    # Pull all the images at once instead of one pair at a time
+    image_tags = docker_prefetch_images(
+        (
+            participant_configuration.image
+            for participant_configurations in participant_pairs
+            for participant_configuration in participant_configurations
+        ),
+        registry_metadata,
+    )
+    if image_cache is not None:
+        image_cache.record_use(image_tags.values())
+
+    container_pool = _create_container_pool(
+        registry_metadata,
+        PortAllocator(base_port=base_port),
+        participant_pairs,
+    )
+
+    # Idle containers are stopped once all the pairs are done
+    executor = ThreadPoolExecutor(max_parallel_pairs)
+    try:
+        with container_pool, executor:
+            futures = [
+                executor.submit(
+                    _evaluate_scheduled_pair,
+                    agent,
+                    user_simulator,
+                    configuration,
+                    output_dir,
+                    registry_metadata,
+                    container_pool,
+                    max_concurrent_dialogues,
+                    streaming_evaluation,
+                    evaluation_cache,
+                )
+                for agent, user_simulator in participant_pairs
+            ]
+            try:
+                for future in as_completed(futures):
+                    insert_record(
+                        mongo_connector,
+                        "evaluation_results",
+                        future.result(),
+                    )
+            except Exception:
+                # Do not start pending pairs if one of the pairs failed
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        # The models of the metrics are no longer needed
+        configuration.task.close()
+
+
+def _run_cleanup_steps(steps: Iterable[Callable[[], None]]) -> None:
+    """Runs cleanup steps, each one even if the previous ones failed.
+
+    Args:
+        steps: Functions releasing resources, run in order.
+    """
+    for step in steps:
+        try:
+            step()
+        except Exception as e:
+            name = getattr(step, "__qualname__", repr(step))
+            print(f"Error during cleanup ({name}): {e}")
+
 
 if __name__ == "__main__":
     args = parse_args()
@@ -383,6 +858,10 @@ if __name__ == "__main__":
         print(f"Error connecting to MongoDB: {e}")
         exit(1)
 
+    image_cache = ImageCache(args.image_cache_path, args.image_cache_budget)
+
+    configuration: Optional[RunConfiguration] = None
+    evaluation_cache: Optional[EvaluationCache] = None
     try:
         configuration = load_configuration(args.config_file)
 
@@ -394,18 +873,39 @@ if __name__ == "__main__":
             args.registry_repository,
         )
 
+        if args.evaluation_cache == "local":
+            evaluation_cache = SQLiteEvaluationCache(
+                os.path.join(args.output_dir, "evaluation_cache.sqlite")
+            )
+        elif args.evaluation_cache == "mongo":
+            evaluation_cache = MongoEvaluationCache(mongo_connector)
+
         output_dir = os.path.join(
             args.output_dir,
             configuration.task.name,
             configuration.task.batch_id,
         )
 
-        main(configuration, mongo_connector, registry_metadata, output_dir)
+        main(
+            configuration,
+            mongo_connector,
+            registry_metadata,
+            output_dir,
+            max_parallel_pairs=args.max_parallel_pairs,
+            base_port=args.base_port,
+            max_concurrent_dialogues=args.max_concurrent_dialogues,
+            streaming_evaluation=args.streaming_evaluation,
+            evaluation_cache=evaluation_cache,
+            image_cache=image_cache,
+        )
         update_record(
             mongo_connector,
             "runs",
             {"name": configuration.name},
-            {"status": "completed"},
+            {
+                "status": "completed",
+                "time_to_ready": get_time_to_ready_stats(),
+            },
         )
     except Exception as e:
         print(f"Error during simulation: {e}")
@@ -416,5 +916,19 @@ if __name__ == "__main__":
             {"status": "failed", "error": str(e)},
         )
     finally:
-        # Delete containers and images from the local Docker registry
-        clean_local_docker_registry()
+        cleanup_steps: List[Callable[[], None]] = []
+        # Release the models of the metrics, if the run failed before they
+        # were, and the evaluation cache
+        if configuration is not None:
+            cleanup_steps.append(configuration.task.close)
+        if evaluation_cache is not None:
+            cleanup_steps.append(evaluation_cache.close)
+        # Delete stopped containers and dangling images, and keep the cached
+        # images within their disk budget
+        cleanup_steps += [
+            clean_local_docker_registry,
+            image_cache.evict,
+            image_cache.close,
+            close_docker_client,
+        ]
+        _run_cleanup_steps(cleanup_steps)
@@ -19,30 +19,512 @@ DialoGPT. arXiv preprint arXiv:2006.12719. 2020.
 Adapted from original implementation: https://github.com/Shikib/fed
 """
 
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 
 import torch
+import torch.nn.functional as F
 from transformers import AutoModelWithLMHead, AutoTokenizer
 
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.utils.model_registry import get_model_registry
 from simlab.metrics.metric import Metric
+from simlab.metrics.preprocessing import PreprocessingStage
+
+DEFAULT_MODEL_NAME = "microsoft/DialoGPT-large"
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_CACHE_SIZE = 1024
+# Maximum number of tokens in the input of DialoGPT
+_MAX_INPUT_LENGTH = 1024
+_EOU_TOKEN = " <|endoftext|> "  # End of utterance token
+
+
+class FEDScorer:
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL_NAME,
+        device: str = None,
+        dtype: str = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Initializes a scorer shared by the FED metrics of all features.
+
+        The model runs once over each dialogue and the cached keys and values
+        are reused to score the continuation of every example registered by
+        the FED metrics. Scores are kept per dialogue, hence the features
+        evaluated after the first one do not need any forward pass.
+
+        Args:
+            model_name: Name of the DialoGPT model. Defaults to
+              DEFAULT_MODEL_NAME.
+            device: Device to run the model on. Defaults to None, in which
+              case a GPU is used if available.
+            dtype: Data type of the model weights, e.g., "float16". Defaults
+              to None, in which case the default data type is used.
+            cache_size: Number of dialogues for which scores are kept.
+              Defaults to DEFAULT_CACHE_SIZE.
+        """
+        self.model_name = model_name
+        self.device = device or _default_device()
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelWithLMHead.from_pretrained(
+            model_name, torch_dtype=getattr(torch, dtype) if dtype else None
+        )
+        self.model.to(self.device)
+        self.model.eval()
+
+        self._examples: Dict[str, None] = {}
+        self._example_ids: Dict[str, List[int]] = {}
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, Dict[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register_examples(self, examples: Iterable[str]) -> None:
+        """Registers examples to score for every dialogue.
+
+        Args:
+            examples: Example texts.
+        """
+        with self._lock:
+            for example in examples:
+                self._examples[example] = None
+
+    def score(
+        self, dialogue_texts: List[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[Dict[str, float]]:
+        """Computes the loss of generating the examples after dialogues.
+
+        Args:
+            dialogue_texts: Dialogues formatted as single strings.
+            batch_size: Number of continuations scored at a time. Defaults to
+              DEFAULT_BATCH_SIZE.
+
+        Returns:
+            Loss of each registered example per dialogue.
+        """
+        results = []
+        with self._lock:
+            # Dialogues are scored together to batch their forward passes
+            to_score: Dict[str, List[str]] = {}
+            for dialogue_text in dialogue_texts:
+                scores = self._cache.get(dialogue_text, {})
+                missing = [e for e in self._examples if e not in scores]
+                if missing:
+                    to_score[dialogue_text] = missing
+            new_scores = self._score_dialogues(
+                list(to_score.items()), batch_size
+            )
+
+            for dialogue_text in dialogue_texts:
+                scores = self._cache.pop(dialogue_text, {})
+                scores.update(new_scores.pop(dialogue_text, {}))
+                self._cache[dialogue_text] = scores
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+                results.append(dict(scores))
+        return results
+
+    def _tokenize_prefix(self, dialogue_text: str) -> List[int]:
+        """Tokenizes a dialogue followed by an end of utterance token.
+
+        The special end of utterance token delimits the text tokenized, hence
+        the tokens of a dialogue followed by an example are the tokens of the
+        dialogue prefix followed by the tokens of the example.
+
+        Args:
+            dialogue_text: Dialogue formatted as a single string.
+
+        Returns:
+            Token IDs of the dialogue prefix.
+        """
+        if not dialogue_text.startswith(_EOU_TOKEN):
+            dialogue_text = f"{_EOU_TOKEN}{dialogue_text}"
+        prefix = f"{dialogue_text}{_EOU_TOKEN}".strip()
+        return self.tokenizer.convert_tokens_to_ids(
+            self.tokenizer.tokenize(prefix)
+        )
+
+    def _tokenize_example(self, example: str) -> List[int]:
+        """Tokenizes an example following a dialogue prefix.
+
+        Args:
+            example: Example text.
+
+        Returns:
+            Token IDs of the example.
+        """
+        if example not in self._example_ids:
+            self._example_ids[example] = self.tokenizer.convert_tokens_to_ids(
+                self.tokenizer.tokenize(f" {example}")
+            )
+        return self._example_ids[example]
+
+    def _truncate(self, input_ids: List[int]) -> List[int]:
+        """Keeps the end of inputs exceeding the maximum length of the model.
+
+        Args:
+            input_ids: Token IDs.
+
+        Returns:
+            Token IDs starting with an end of utterance token if truncated.
+        """
+        if len(input_ids) < _MAX_INPUT_LENGTH:
+            return input_ids
+        return [self.tokenizer.eos_token_id] + input_ids[
+            -(_MAX_INPUT_LENGTH - 1) :
+        ]
+
+    def _score_dialogue(
+        self, dialogue_text: str, examples: List[str], batch_size: int
+    ) -> Dict[str, float]:
+        """Computes the loss of generating examples after a dialogue.
+
+        Args:
+            dialogue_text: Dialogue formatted as a single string.
+            examples: Example texts.
+            batch_size: Number of sequences scored at a time.
+
+        Returns:
+            Loss per example.
+        """
+        return self._score_dialogues([(dialogue_text, examples)], batch_size)[
+            dialogue_text
+        ]
+
+    def _score_dialogues(
+        self, dialogues: List[Tuple[str, List[str]]], batch_size: int
+    ) -> Dict[str, Dict[str, float]]:
+        """Computes the loss of generating examples after dialogues.
+
+        The prefixes of dialogues of similar lengths are run through the
+        model together, and so are the continuations of their examples.
+        Inputs that have to be truncated do not share the dialogue prefix,
+        they are scored in full instead, by batches across dialogues.
+
+        Args:
+            dialogues: Dialogue formatted as a single string and examples to
+              score after it, for each dialogue.
+            batch_size: Number of sequences scored at a time.
+
+        Returns:
+            Loss per example, per dialogue.
+        """
+        prefixes: List[Tuple[str, List[int], List[Tuple[str, List[int]]]]] = []
+        truncated: List[Tuple[str, str, List[int]]] = []
+        for dialogue_text, examples in dialogues:
+            prefix_ids = self._tokenize_prefix(dialogue_text)
+            continuations = []
+            for example in examples:
+                example_ids = self._tokenize_example(example)
+                if len(prefix_ids) + len(example_ids) < _MAX_INPUT_LENGTH:
+                    continuations.append((example, example_ids))
+                else:
+                    truncated.append(
+                        (
+                            dialogue_text,
+                            example,
+                            self._truncate(prefix_ids + example_ids),
+                        )
+                    )
+            if continuations:
+                prefixes.append((dialogue_text, prefix_ids, continuations))
+
+        scores: Dict[str, Dict[str, float]] = {
+            dialogue_text: {} for dialogue_text, _ in dialogues
+        }
+        # Sorting by length limits the padding of the prefixes
+        prefixes.sort(key=lambda prefix: len(prefix[1]))
+        for start in range(0, len(prefixes), batch_size):
+            batch = prefixes[start : start + batch_size]
+            losses = self._score_prefixes(
+                [prefix_ids for _, prefix_ids, _ in batch],
+                [
+                    [ids for _, ids in continuations]
+                    for _, _, continuations in batch
+                ],
+                batch_size,
+            )
+            for (dialogue_text, _, continuations), prefix_losses in zip(
+                batch, losses
+            ):
+                scores[dialogue_text].update(
+                    zip(
+                        [example for example, _ in continuations], prefix_losses
+                    )
+                )
+        if truncated:
+            losses = self._score_sequences(
+                [input_ids for _, _, input_ids in truncated], batch_size
+            )
+            for (dialogue_text, example, _), loss in zip(truncated, losses):
+                scores[dialogue_text][example] = loss
+        return scores
+
+    def _score_continuations(
+        self,
+        prefix_ids: List[int],
+        continuations: List[List[int]],
+        batch_size: int,
+    ) -> List[float]:
+        """Computes the loss of sequences sharing a prefix.
+
+        Args:
+            prefix_ids: Token IDs of the shared prefix.
+            continuations: Token IDs of the continuations.
+            batch_size: Number of continuations scored at a time.
+
+        Returns:
+            Loss of each prefix and continuation sequence, averaged over its
+            tokens.
+        """
+        return self._score_prefixes([prefix_ids], [continuations], batch_size)[
+            0
+        ]
+
+    def _score_prefixes(
+        self,
+        prefixes: List[List[int]],
+        continuations: List[List[List[int]]],
+        batch_size: int,
+    ) -> List[List[float]]:
+        """Computes the loss of sequences sharing prefixes.
+
+        The prefixes are run once through the model, as a right-padded batch.
+        Their losses and cached keys and values are then combined with the
+        loss of each of their continuations, which are batched across
+        prefixes. This gives the same result as scoring each full sequence.
+
+        Args:
+            prefixes: Token IDs of the prefixes.
+            continuations: Token IDs of the continuations of each prefix.
+            batch_size: Number of continuations scored at a time.
+
+        Returns:
+            Loss of each prefix and continuation sequence, averaged over its
+            tokens, per prefix.
+        """
+        prefix_ids, prefix_mask = self._pad(prefixes)
+        lengths = prefix_mask.sum(dim=1)
+        rows = torch.arange(len(prefixes), device=self.device)
+        with torch.no_grad():
+            output = self.model(
+                prefix_ids, attention_mask=prefix_mask, use_cache=True
+            )
+            prefix_losses = (
+                F.cross_entropy(
+                    output.logits[:, :-1].transpose(1, 2),
+                    prefix_ids[:, 1:],
+                    reduction="none",
+                )
+                * prefix_mask[:, 1:]
+            ).sum(dim=1)
+            last_log_probs = F.log_softmax(
+                output.logits[rows, lengths - 1], dim=-1
+            )
+
+            pairs = [
+                (i, continuation)
+                for i, prefix_continuations in enumerate(continuations)
+                for continuation in prefix_continuations
+            ]
+            losses: List[float] = []
+            for start in range(0, len(pairs), batch_size):
+                batch = pairs[start : start + batch_size]
+                indices = torch.tensor(
+                    [i for i, _ in batch], device=self.device
+                )
+                input_ids, mask = self._pad([ids for _, ids in batch])
+                # Positions continue after the prefix, whose padding is masked
+                position_ids = lengths[indices].unsqueeze(1) + torch.arange(
+                    input_ids.shape[1], device=self.device
+                )
+                logits = self.model(
+                    input_ids,
+                    attention_mask=torch.cat(
+                        [prefix_mask[indices], mask], dim=1
+                    ),
+                    position_ids=position_ids,
+                    past_key_values=_select_past(
+                        output.past_key_values, indices
+                    ),
+                ).logits
+                token_losses = F.cross_entropy(
+                    logits[:, :-1].transpose(1, 2),
+                    input_ids[:, 1:],
+                    reduction="none",
+                )
+                continuation_losses = (token_losses * mask[:, 1:]).sum(
+                    dim=1
+                ) - last_log_probs[indices, input_ids[:, 0]]
+                num_tokens = mask.sum(dim=1) + lengths[indices] - 1
+                losses.extend(
+                    (
+                        (prefix_losses[indices] + continuation_losses)
+                        / num_tokens
+                    ).tolist()
+                )
+
+        results = []
+        for prefix_continuations in continuations:
+            results.append(losses[: len(prefix_continuations)])
+            losses = losses[len(prefix_continuations) :]
+        return results
+
+    def _score_sequences(
+        self, sequences: List[List[int]], batch_size: int
+    ) -> List[float]:
+        """Computes the loss of independent sequences by batches.
+
+        Sequences are sorted by length before batching to limit padding.
+
+        Args:
+            sequences: Token IDs of the sequences.
+            batch_size: Number of sequences scored at a time.
+
+        Returns:
+            Loss of each sequence averaged over its tokens, in the order of
+            the input.
+        """
+        order = sorted(range(len(sequences)), key=lambda i: len(sequences[i]))
+        losses = [0.0] * len(sequences)
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            input_ids, mask = self._pad([sequences[i] for i in batch])
+            with torch.no_grad():
+                logits = self.model(input_ids, attention_mask=mask).logits
+                token_losses = F.cross_entropy(
+                    logits[:, :-1].transpose(1, 2),
+                    input_ids[:, 1:],
+                    reduction="none",
+                )
+                batch_losses = (token_losses * mask[:, 1:]).sum(dim=1) / mask[
+                    :, 1:
+                ].sum(dim=1).clamp(min=1)
+            for i, loss in zip(batch, batch_losses.tolist()):
+                losses[i] = loss
+        return losses
+
+    def _pad(
+        self, sequences: List[List[int]]
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Pads sequences on the right.
+
+        Args:
+            sequences: Token IDs of the sequences.
+
+        Returns:
+            Padded token IDs and attention mask.
+        """
+        max_length = max(len(sequence) for sequence in sequences)
+        input_ids = torch.full(
+            (len(sequences), max_length), self.tokenizer.eos_token_id
+        )
+        mask = torch.zeros_like(input_ids)
+        for i, sequence in enumerate(sequences):
+            input_ids[i, : len(sequence)] = torch.tensor(sequence)
+            mask[i, : len(sequence)] = 1
+        return input_ids.to(self.device), mask.to(self.device)
+
+
+def _select_past(past_key_values: Any, rows: torch.Tensor) -> Any:
+    """Selects the cached keys and values of sequences of a batch.
+
+    A new cache object is returned as the model appends the keys and values
+    of the batch to the cache it is given.
+
+    Args:
+        past_key_values: Cache returned by the model, either as a legacy tuple
+          or a cache object.
+        rows: Index in the batch of the cached sequence of each row of the
+          new batch.
+
+    Returns:
+        Cache of the same type for the new batch.
+    """
+    is_legacy = isinstance(past_key_values, tuple)
+    legacy = past_key_values if is_legacy else past_key_values.to_legacy_cache()
+    selected = tuple(
+        tuple(t.index_select(0, rows) for t in layer) for layer in legacy
+    )
+    if is_legacy:
+        return selected
+    return type(past_key_values).from_legacy_cache(selected)
+
+
+def _default_device() -> str:
+    """Returns the GPU device if available, the CPU otherwise."""
+    return "cuda" if torch.cuda.is_available() else "cpu"
 
 
 class FED(Metric):
-    def __init__(self, feature: str, name: str = "fed") -> None:
+    required_fields = {"utterance", "participant"}
+    requires_torch = True
+
+    def __init__(
+        self,
+        feature: str,
+        name: str = "fed",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        num_threads: int = None,
+        device: str = None,
+        dtype: str = None,
+    ) -> None:
         """Initializes the FED metric for a specific feature.
 
+        The scorer, and hence the model, is acquired from the model registry
+        and shared by the FED metrics of all the features, which are computed
+        together the first time a dialogue is evaluated.
+
         Args:
             feature: The feature to evaluate.
             name: Name of the metric. Defaults to "fed".
+            batch_size: Number of sequences scored at a time by the model.
+              Defaults to DEFAULT_BATCH_SIZE.
+            num_threads: Number of threads used by torch for intra-op
+              parallelism on CPU. Note that this setting is global to the
+              process. Defaults to None, in which case it is left unchanged.
+            device: Device to run the model on. Defaults to None, in which
+              case a GPU is used if available.
+            dtype: Data type of the model weights, e.g., "float16". Defaults
+              to None, in which case the default data type is used.
         """
         super().__init__(f"{name}_{feature}")
         self.feature = feature
+        self.batch_size = batch_size
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self._model_name = DEFAULT_MODEL_NAME
+        self._eou_token = _EOU_TOKEN
+        # Transcripts are shared by the FED metrics of all the features
+        self._transcripts_stage = PreprocessingStage(
+            ("fed_transcripts", self._eou_token), self._format_dialogues
+        )
+        self._scorer_key = (
+            "fed_scorer",
+            self._model_name,
+            device or _default_device(),
+            dtype,
+        )
+        kind, model_name, device, dtype = self._scorer_key
+        self._scorer: FEDScorer = get_model_registry().acquire(
+            kind,
+            model_name,
+            lambda: FEDScorer(model_name, device, dtype),
+            device,
+            dtype,
+        )
+        self.tokenizer = self._scorer.tokenizer
+        self.model = self._scorer.model
+        self._model_revision = str(self.model.config._commit_hash)
 
-        self._model_name = "microsoft/DialoGPT-large"
-        self._eou_token = " <|endoftext|> "  # End of utterance token
-        self.tokenizer = AutoTokenizer.from_pretrained(self._model_name)
-        self.model = AutoModelWithLMHead.from_pretrained(self._model_name)
+        examples = self.features.get(self.feature, {})
+        self._positive_examples = examples.get("positive", [])
+        self._negative_examples = examples.get("negative", [])
+        self._scorer.register_examples(
+            self._positive_examples + self._negative_examples
+        )
 
     @property
     def features(self) -> Dict[str, Dict[str, List[str]]]:
@@ -153,32 +635,25 @@ class FED(Metric):
             dialogue_text += f"{self._eou_token}{utterance.text}"
         return dialogue_text
 
-    def _score(self, dialogue: str, example: str) -> float:
-        """Computes log-likelihood score of DialoGPT generating a response.
+    def _format_dialogues(self, dialogues: List[Dialogue]) -> List[str]:
+        """Formats multiple dialogues as single strings.
 
         Args:
-            dialogue: Dialogue text.
-            example: Example text.
+            dialogues: Dialogues to format.
 
         Returns:
-            Log-likelihood score.
+            Formatted dialogues.
         """
-        if not dialogue.startswith(self._eou_token):
-            dialogue = f"{self._eou_token}{dialogue}"
+        return [self._format_dialogue(dialogue) for dialogue in dialogues]
 
-        input_text = f"{dialogue}{self._eou_token}{example}"
-        input_text = input_text.strip()
+    @property
+    def preprocessing_stages(self) -> List[PreprocessingStage]:
+        """Returns the formatting of the dialogues."""
+        return [self._transcripts_stage]
 
-        tokenize_input = self.tokenizer.tokenize(input_text)
-        if len(tokenize_input) >= 1024:
-            tokenize_input = [self._eou_token] + tokenize_input[-1024:]
-        tensor_input = torch.tensor(
-            [self.tokenizer.convert_tokens_to_ids(tokenize_input)]
-        )
-        with torch.no_grad():
-            output = self.model(tensor_input, labels=tensor_input)
-            loss, _ = output[:2]
-        return loss.item()
+    def model_revisions(self) -> List[str]:
+        """Returns the revision of the DialoGPT model."""
+        return [self._model_revision]
 
     def evaluate_dialogue(self, dialogue: Dialogue) -> float:
         """Evaluates a dialogue with respect to the specified feature.
@@ -189,22 +664,44 @@ class FED(Metric):
         Returns:
             Evaluation score.
         """
-        examples = self.features.get(self.feature, {})
-        positive_examples = examples.get("positive", [])
-        negative_examples = examples.get("negative", [])
+        return self.evaluate_dialogues([dialogue])[0]
+
+    def evaluate_dialogues(
+        self,
+        dialogues: List[Dialogue],
+        preprocessed: Optional[Dict[Hashable, List[Any]]] = None,
+    ) -> List[float]:
+        """Evaluates multiple dialogues with respect to the specified feature.
 
-        dialogue_text = self._format_dialogue(dialogue)
+        Args:
+            dialogues: Dialogues to evaluate.
+            preprocessed: Outputs of the preprocessing stages per key.
+              Defaults to None.
 
-        high_score = 0
-        for example in positive_examples:
-            hs = self._score(dialogue_text, example)
-            high_score += hs
-        high_score = high_score / max(len(positive_examples), 1)
+        Returns:
+            List of evaluation scores.
+        """
+        if not self._positive_examples and not self._negative_examples:
+            return [0.0 for _ in dialogues]
+
+        dialogue_scores = self._scorer.score(
+            self._transcripts_stage.get_output(dialogues, preprocessed),
+            self.batch_size,
+        )
 
-        low_score = 0
-        for example in negative_examples:
-            ls = self._score(dialogue_text, example)
-            low_score += ls
-        low_score = low_score / max(len(negative_examples), 1)
+        scores = []
+        for losses in dialogue_scores:
+            high_score = sum(
+                losses[example] for example in self._positive_examples
+            ) / max(len(self._positive_examples), 1)
+            low_score = sum(
+                losses[example] for example in self._negative_examples
+            ) / max(len(self._negative_examples), 1)
+            scores.append(low_score - high_score)
+        return scores
 
-        return low_score - high_score
+    def close(self) -> None:
+        """Releases the scorer shared with the other FED metrics."""
+        if self._scorer is not None:
+            get_model_registry().release(*self._scorer_key)
+            self._scorer = None
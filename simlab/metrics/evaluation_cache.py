@@ -0,0 +1,246 @@
+"""Cache of the evaluation scores of dialogues.
+
+Scores are addressed by the fingerprint of the metric, which covers its class,
+constructor arguments, and model revisions, and by the hash of the dialogue
+content. Only the scores missing from the cache need to be computed when a
+task is evaluated again, e.g., after adding a metric.
+
+Two backends are provided: a local SQLite database and a MongoDB collection.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+from pymongo import UpdateOne
+
+from connectors.mongo.mongo_connector import MongoDBConnector
+from connectors.mongo.utils import find_records
+from dialoguekit.core.dialogue import Dialogue
+
+DEFAULT_EVALUATION_CACHE_COLLECTION = "evaluation_cache"
+
+
+def hash_dialogue(dialogue: Dialogue) -> str:
+    """Hashes the content of a dialogue.
+
+    Only the conversation ID, the participants, and the utterances are hashed,
+    as these are always loaded regardless of the fields needed by the metrics.
+
+    Args:
+        dialogue: Dialogue.
+
+    Returns:
+        Hexadecimal SHA-256 digest of the dialogue.
+    """
+    content = {
+        "conversation_id": dialogue.conversation_id,
+        "agent_id": dialogue.agent_id,
+        "user_id": dialogue.user_id,
+        "utterances": [
+            [utterance.participant.name, utterance.text]
+            for utterance in dialogue.utterances
+        ],
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class EvaluationCache(ABC):
+    @abstractmethod
+    def get_many(
+        self, metric_fingerprint: str, dialogue_hashes: Iterable[str]
+    ) -> Dict[str, float]:
+        """Gets the cached scores of dialogues for a metric.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            dialogue_hashes: Hashes of the dialogues.
+
+        Raises:
+            NotImplementedError: Subclasses must implement this method.
+
+        Returns:
+            Cached scores per dialogue hash, missing ones are not included.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_many(
+        self, metric_fingerprint: str, scores: Dict[str, float]
+    ) -> None:
+        """Caches the scores of dialogues for a metric.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            scores: Scores per dialogue hash.
+
+        Raises:
+            NotImplementedError: Subclasses must implement this method.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases the resources held by the cache."""
+        pass
+
+
+class SQLiteEvaluationCache(EvaluationCache):
+    def __init__(self, path: str) -> None:
+        """Initializes a cache stored in a local SQLite database.
+
+        Args:
+            path: Path to the database, created if needed.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "metric TEXT NOT NULL, "
+                "dialogue TEXT NOT NULL, "
+                "value REAL NOT NULL, "
+                "PRIMARY KEY (metric, dialogue))"
+            )
+
+    def get_many(
+        self, metric_fingerprint: str, dialogue_hashes: Iterable[str]
+    ) -> Dict[str, float]:
+        """Gets the cached scores of dialogues for a metric.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            dialogue_hashes: Hashes of the dialogues.
+
+        Returns:
+            Cached scores per dialogue hash, missing ones are not included.
+        """
+        scores = {}
+        with self._lock:
+            for dialogue_hash in set(dialogue_hashes):
+                row = self._connection.execute(
+                    "SELECT value FROM scores WHERE metric = ? "
+                    "AND dialogue = ?",
+                    (metric_fingerprint, dialogue_hash),
+                ).fetchone()
+                if row is not None:
+                    scores[dialogue_hash] = row[0]
+        return scores
+
+    def set_many(
+        self, metric_fingerprint: str, scores: Dict[str, float]
+    ) -> None:
+        """Caches the scores of dialogues for a metric.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            scores: Scores per dialogue hash.
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO scores (metric, dialogue, value) "
+                "VALUES (?, ?, ?)",
+                [
+                    (metric_fingerprint, dialogue_hash, float(value))
+                    for dialogue_hash, value in scores.items()
+                ],
+            )
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class MongoEvaluationCache(EvaluationCache):
+    def __init__(
+        self,
+        mongo_connector: MongoDBConnector,
+        collection: str = DEFAULT_EVALUATION_CACHE_COLLECTION,
+    ) -> None:
+        """Initializes a cache stored in a MongoDB collection.
+
+        Args:
+            mongo_connector: MongoDB connector.
+            collection: Name of the collection. Defaults to
+              DEFAULT_EVALUATION_CACHE_COLLECTION.
+        """
+        self.mongo_connector = mongo_connector
+        self.collection = collection
+
+    @staticmethod
+    def _record_id(metric_fingerprint: str, dialogue_hash: str) -> str:
+        """Returns the ID of the record of a score.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            dialogue_hash: Hash of the dialogue.
+
+        Returns:
+            Record ID.
+        """
+        return f"{metric_fingerprint}:{dialogue_hash}"
+
+    def get_many(
+        self, metric_fingerprint: str, dialogue_hashes: Iterable[str]
+    ) -> Dict[str, float]:
+        """Gets the cached scores of dialogues for a metric.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            dialogue_hashes: Hashes of the dialogues.
+
+        Returns:
+            Cached scores per dialogue hash, missing ones are not included.
+        """
+        record_ids = [
+            self._record_id(metric_fingerprint, dialogue_hash)
+            for dialogue_hash in set(dialogue_hashes)
+        ]
+        records = find_records(
+            self.mongo_connector,
+            self.collection,
+            {"_id": {"$in": record_ids}},
+        )
+        return {record["dialogue"]: record["value"] for record in records}
+
+    def set_many(
+        self, metric_fingerprint: str, scores: Dict[str, float]
+    ) -> None:
+        """Caches the scores of dialogues for a metric.
+
+        Args:
+            metric_fingerprint: Fingerprint of the metric.
+            scores: Scores per dialogue hash.
+        """
+        if not scores:
+            return
+        db = self.mongo_connector.get_database()
+        db[self.collection].bulk_write(
+            [
+                UpdateOne(
+                    {"_id": self._record_id(metric_fingerprint, dialogue_hash)},
+                    {
+                        "$set": {
+                            "metric": metric_fingerprint,
+                            "dialogue": dialogue_hash,
+                            "value": float(value),
+                        }
+                    },
+                    upsert=True,
+                )
+                for dialogue_hash, value in scores.items()
+            ]
+        )
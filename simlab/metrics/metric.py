@@ -1,12 +1,66 @@
 """Base class for metrics to evaluate a dialogue."""
 
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, Hashable, List, Optional, Set
 
 from dialoguekit.core.dialogue import Dialogue
+from simlab.metrics.preprocessing import PreprocessingStage
+
+
+class _NotFingerprintable(Exception):
+    """Raised when a value cannot be part of a fingerprint."""
+
+
+def _fingerprint_value(value: Any) -> Any:
+    """Converts a constructor argument to a JSON serializable value.
+
+    Args:
+        value: Constructor argument.
+
+    Raises:
+        _NotFingerprintable: If the value cannot be fingerprinted.
+
+    Returns:
+        JSON serializable value.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _fingerprint_value(v) for k, v in value.items()}
+    fingerprint = getattr(value, "fingerprint", None)
+    if callable(fingerprint):
+        fingerprint = fingerprint()
+        if fingerprint is not None:
+            return fingerprint
+    raise _NotFingerprintable(type(value).__name__)
 
 
 class Metric(ABC):
+    # Utterance fields of the dialogue export the metric relies on, the
+    # utterance text and participant are always loaded. None means all fields.
+    required_fields: Optional[Set[str]] = None
+    # Whether the metric runs a torch model, such metrics are evaluated one
+    # at a time on a dedicated worker.
+    requires_torch: bool = False
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Metric":
+        """Creates a metric, recording its constructor arguments.
+
+        Args:
+            *args: Positional constructor arguments.
+            **kwargs: Keyword constructor arguments.
+
+        Returns:
+            Metric.
+        """
+        metric = super().__new__(cls)
+        metric._init_args = (args, kwargs)
+        return metric
+
     def __init__(self, name: str) -> None:
         """Initializes a metric.
 
@@ -30,13 +84,60 @@ class Metric(ABC):
         """
         raise NotImplementedError
 
-    def evaluate_dialogues(self, dialogues: List[Dialogue]) -> List[float]:
+    @property
+    def preprocessing_stages(self) -> List[PreprocessingStage]:
+        """Returns the preprocessing stages the metric relies on."""
+        return []
+
+    def evaluate_dialogues(
+        self,
+        dialogues: List[Dialogue],
+        preprocessed: Optional[Dict[Hashable, List[Any]]] = None,
+    ) -> List[float]:
         """Evaluates multiple dialogues.
 
         Args:
             dialogues: Dialogues to evaluate.
+            preprocessed: Outputs of the preprocessing stages per key, stages
+              missing are computed by the metric. Defaults to None.
 
         Returns:
             List of evaluation scores.
         """
         return [self.evaluate_dialogue(dialogue) for dialogue in dialogues]
+
+    def model_revisions(self) -> List[str]:
+        """Returns the revisions of the models used by the metric."""
+        return []
+
+    def fingerprint(self) -> Optional[str]:
+        """Returns a fingerprint identifying the scores of the metric.
+
+        The fingerprint covers the class of the metric, its constructor
+        arguments, and the revisions of its models. Two metrics with the same
+        fingerprint must give the same score to the same dialogue.
+
+        Returns:
+            Fingerprint, or None if a constructor argument cannot be
+            fingerprinted.
+        """
+        args, kwargs = getattr(self, "_init_args", ((), {}))
+        try:
+            content = _fingerprint_value(
+                {
+                    "args": args,
+                    "kwargs": kwargs,
+                    "model_revisions": self.model_revisions(),
+                }
+            )
+        except _NotFingerprintable:
+            return None
+        digest = hashlib.sha256(
+            json.dumps(content, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        cls = type(self)
+        return f"{cls.__module__}.{cls.__qualname__}:{digest}"
+
+    def close(self) -> None:
+        """Releases the resources held by the metric, e.g., models."""
+        pass
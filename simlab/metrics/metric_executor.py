@@ -0,0 +1,222 @@
+"""Parallel execution of metrics with shared preprocessing.
+
+The preprocessing stages of the metrics form a dependency graph in which
+stages with the same key are merged, hence each stage is computed once per
+batch of dialogues. Stages and metrics run as soon as their dependencies are
+computed. Those running a torch model are executed one at a time on a
+dedicated worker thread, the others on a pool of threads.
+
+The metrics running a torch model, i.e., FED and the success classification
+rate, benefit from the shared preprocessing, e.g., transcripts formatted once
+for all the FED features. The annotation of dialogues by the recommendation
+success ratio is treated alike, as its NLU may run a torch model. The torch
+models release the GIL while computing, so the other nodes progress in the
+meantime. The only node without torch is the computation of the success
+ratios of the recommendation success ratio, a single NumPy pass. This is too
+cheap to outweigh sending annotated dialogues to worker processes, and
+forking from the threads evaluating pairs would copy the locks they hold,
+hence no process pool is used.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Hashable, List, Optional, Set, Union
+
+from dialoguekit.core.dialogue import Dialogue
+from simlab.metrics.metric import Metric
+from simlab.metrics.preprocessing import PreprocessingStage
+
+METRIC_EXECUTOR_THREADS = int(os.environ.get("METRIC_EXECUTOR_THREADS", "4"))
+
+_Node = Union[PreprocessingStage, Metric]
+
+
+def _node_key(node: _Node) -> Hashable:
+    """Returns the key of the output of a node.
+
+    Args:
+        node: Preprocessing stage or metric.
+
+    Returns:
+        Key of the output.
+    """
+    if isinstance(node, PreprocessingStage):
+        return node.key
+    return ("metric", id(node))
+
+
+def _node_dependencies(node: _Node) -> List[PreprocessingStage]:
+    """Returns the stages a node depends on.
+
+    Args:
+        node: Preprocessing stage or metric.
+
+    Returns:
+        Preprocessing stages.
+    """
+    if isinstance(node, PreprocessingStage):
+        return node.dependencies
+    return node.preprocessing_stages
+
+
+def _run_node(
+    node: _Node, dialogues: List[Dialogue], inputs: Dict[Hashable, List[Any]]
+) -> List[Any]:
+    """Runs a preprocessing stage or evaluates a metric.
+
+    Args:
+        node: Preprocessing stage or metric.
+        dialogues: Dialogues to process.
+        inputs: Outputs of the dependencies per key.
+
+    Returns:
+        Output of the stage or evaluation scores.
+    """
+    if isinstance(node, PreprocessingStage):
+        return node.run(dialogues, inputs)
+    return node.evaluate_dialogues(dialogues, preprocessed=inputs)
+
+
+class MetricExecutor:
+    def __init__(
+        self,
+        metrics: List[Metric],
+        num_threads: int = METRIC_EXECUTOR_THREADS,
+    ) -> None:
+        """Initializes the executor.
+
+        Args:
+            metrics: Metrics to evaluate.
+            num_threads: Number of worker threads for the metrics not relying
+              on torch. Defaults to METRIC_EXECUTOR_THREADS.
+        """
+        self.metrics = metrics
+        self._nodes = self._build_graph(metrics)
+        self._torch_worker = ThreadPoolExecutor(max_workers=1)
+        self._cpu_pool = ThreadPoolExecutor(max_workers=num_threads)
+
+    @staticmethod
+    def _build_graph(metrics: List[Metric]) -> List[_Node]:
+        """Collects the stages and metrics, merging stages with the same key.
+
+        Args:
+            metrics: Metrics to evaluate.
+
+        Returns:
+            Unique stages and metrics.
+        """
+        nodes: Dict[Hashable, _Node] = {}
+
+        def add(node: _Node) -> None:
+            key = _node_key(node)
+            if key in nodes:
+                return
+            for dependency in _node_dependencies(node):
+                add(dependency)
+            nodes[key] = node
+
+        for metric in metrics:
+            add(metric)
+        return list(nodes.values())
+
+    def _submit(
+        self,
+        index: int,
+        dialogues: List[Dialogue],
+        outputs: Dict[Hashable, List[Any]],
+    ) -> Future:
+        """Submits a node to its worker.
+
+        Args:
+            index: Index of the node.
+            dialogues: Dialogues to process.
+            outputs: Outputs of the nodes computed so far per key.
+
+        Returns:
+            Future output of the node.
+        """
+        node = self._nodes[index]
+        inputs = {
+            dependency.key: outputs[dependency.key]
+            for dependency in _node_dependencies(node)
+        }
+        worker = self._torch_worker if node.requires_torch else self._cpu_pool
+        return worker.submit(_run_node, node, dialogues, inputs)
+
+    def _needed_nodes(self, metrics: List[Metric]) -> Set[int]:
+        """Returns the indices of the nodes needed to evaluate metrics.
+
+        Args:
+            metrics: Metrics to evaluate.
+
+        Returns:
+            Indices of the metrics and of the stages they depend on.
+        """
+        indices = {_node_key(node): i for i, node in enumerate(self._nodes)}
+        needed: Set[int] = set()
+        to_visit: List[_Node] = list(metrics)
+        while to_visit:
+            node = to_visit.pop()
+            index = indices[_node_key(node)]
+            if index not in needed:
+                needed.add(index)
+                to_visit.extend(_node_dependencies(node))
+        return needed
+
+    def evaluate(
+        self,
+        dialogues: List[Dialogue],
+        metrics: Optional[List[Metric]] = None,
+    ) -> Dict[str, List[float]]:
+        """Evaluates dialogues with the metrics.
+
+        Args:
+            dialogues: Dialogues to evaluate.
+            metrics: Subset of the metrics of the executor to evaluate.
+              Defaults to None, i.e., all the metrics.
+
+        Raises:
+            RuntimeError: If the dependencies of some nodes cannot be
+              computed.
+
+        Returns:
+            Evaluation scores for each metric.
+        """
+        metrics = self.metrics if metrics is None else metrics
+        outputs: Dict[Hashable, List[Any]] = {}
+        pending = sorted(self._needed_nodes(metrics))
+        running: Dict[Future, int] = {}
+        while pending or running:
+            ready = [
+                index
+                for index in pending
+                if all(
+                    dependency.key in outputs
+                    for dependency in _node_dependencies(self._nodes[index])
+                )
+            ]
+            if not ready and not running:
+                raise RuntimeError("Unresolvable preprocessing dependencies.")
+            for index in ready:
+                pending.remove(index)
+                running[self._submit(index, dialogues, outputs)] = index
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                outputs[_node_key(self._nodes[index])] = future.result()
+
+        return {metric.name: outputs[_node_key(metric)] for metric in metrics}
+
+    def close(self) -> None:
+        """Shuts down the workers."""
+        self._torch_worker.shutdown()
+        self._cpu_pool.shutdown()
+
+    def __enter__(self) -> "MetricExecutor":
+        """Returns the executor."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Shuts down the workers."""
+        self.close()
@@ -0,0 +1,76 @@
+"""Preprocessing stages shared by metrics.
+
+A preprocessing stage computes an intermediate representation of dialogues,
+e.g., formatted transcripts or annotated dialogues, that one or more metrics
+rely on. Stages are identified by a key, stages with the same key are assumed
+to compute the same output, hence it is computed only once when the metrics
+are evaluated together.
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from dialoguekit.core.dialogue import Dialogue
+
+
+class PreprocessingStage:
+    def __init__(
+        self,
+        key: Hashable,
+        function: Callable[..., List[Any]],
+        dependencies: List["PreprocessingStage"] = None,
+        requires_torch: bool = False,
+    ) -> None:
+        """Initializes a preprocessing stage.
+
+        Args:
+            key: Key identifying the output of the stage.
+            function: Function computing the output of the stage given the
+              dialogues and the outputs of the dependencies, in order.
+            dependencies: Stages whose output is needed. Defaults to None.
+            requires_torch: Whether the stage runs a torch model. Defaults to
+              False.
+        """
+        self.key = key
+        self.function = function
+        self.dependencies = dependencies or []
+        self.requires_torch = requires_torch
+
+    def run(
+        self, dialogues: List[Dialogue], inputs: Dict[Hashable, List[Any]]
+    ) -> List[Any]:
+        """Computes the output of the stage.
+
+        Args:
+            dialogues: Dialogues to preprocess.
+            inputs: Outputs of the dependencies per key.
+
+        Returns:
+            Output of the stage.
+        """
+        return self.function(
+            dialogues,
+            *[inputs[dependency.key] for dependency in self.dependencies],
+        )
+
+    def get_output(
+        self,
+        dialogues: List[Dialogue],
+        preprocessed: Optional[Dict[Hashable, List[Any]]] = None,
+    ) -> List[Any]:
+        """Gets the output of the stage, computing it if not preprocessed.
+
+        Args:
+            dialogues: Dialogues to preprocess.
+            preprocessed: Outputs of the stages already computed per key.
+              Defaults to None.
+
+        Returns:
+            Output of the stage.
+        """
+        if preprocessed is not None and self.key in preprocessed:
+            return preprocessed[self.key]
+        inputs = {
+            dependency.key: dependency.get_output(dialogues, preprocessed)
+            for dependency in self.dependencies
+        }
+        return self.run(dialogues, inputs)
@@ -8,17 +8,23 @@ recognized by a NLU module.
 Adapted from UserSimCRS: https://github.com/iai-group/UserSimCRS
 """
 
-from typing import List
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
 
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.core.dialogue import Dialogue
 from dialoguekit.core.intent import Intent
 from dialoguekit.nlu.nlu import NLU
 from dialoguekit.participant.participant import DialogueParticipant
+from dialoguekit.utils.dialogue_columns import DialogueColumns
 from simlab.metrics.metric import Metric
+from simlab.metrics.preprocessing import PreprocessingStage
 
 
 class RecommendationSuccessRatio(Metric):
+    required_fields = {"utterance", "participant", "dialogue_acts"}
+
     def __init__(
         self,
         user_nlu: NLU,
@@ -47,6 +53,18 @@ class RecommendationSuccessRatio(Metric):
         self.recommendation_intents = [
             Intent(label) for label in recommendation_intent_labels
         ]
+        # Annotations are shared by the metrics using the same NLU modules,
+        # which may run a torch model
+        self._annotation_stage = PreprocessingStage(
+            ("annotated_dialogues", id(user_nlu), id(agent_nlu)),
+            self.annotate_dialogues,
+            requires_torch=True,
+        )
+
+    @property
+    def preprocessing_stages(self) -> List[PreprocessingStage]:
+        """Returns the annotation of the dialogues."""
+        return [self._annotation_stage]
 
     def annotate_dialogue(self, dialogue: Dialogue) -> Dialogue:
         """Annotates utterances with dialogue acts.
@@ -60,27 +78,55 @@ class RecommendationSuccessRatio(Metric):
         Returns:
             Annotated dialogue.
         """
-        for i, utterance in enumerate(dialogue.utterances):
-            if not isinstance(utterance, AnnotatedUtterance):
-                utterance = AnnotatedUtterance.from_utterance(utterance)
+        return self.annotate_dialogues([dialogue])[0]
 
-            if len(utterance.dialogue_acts) > 0:
-                continue
+    def annotate_dialogues(self, dialogues: List[Dialogue]) -> List[Dialogue]:
+        """Annotates the utterances of multiple dialogues with dialogue acts.
 
-            if utterance.participant == DialogueParticipant.USER:
-                utterance.dialogue_acts = self.user_nlu.extract_dialogue_acts(
-                    utterance
-                )
-            elif utterance.participant == DialogueParticipant.AGENT:
-                utterance.dialogue_acts = self.agent_nlu.extract_dialogue_acts(
-                    utterance
-                )
-            else:
-                raise ValueError(
-                    f"Unknown participant: {utterance.participant}"
-                )
-            dialogue.utterances[i] = utterance
-        return dialogue
+        The utterances without dialogue acts of all the dialogues are
+        collected per participant and annotated in one batch by the
+        corresponding NLU module. The dialogues are annotated in place.
+
+        Args:
+            dialogues: Dialogues to be annotated.
+
+        Raises:
+            ValueError: If the participant is unknown.
+
+        Returns:
+            Annotated dialogues.
+        """
+        to_annotate: Dict[DialogueParticipant, List[AnnotatedUtterance]] = {
+            DialogueParticipant.USER: [],
+            DialogueParticipant.AGENT: [],
+        }
+        for dialogue in dialogues:
+            for i, utterance in enumerate(dialogue.utterances):
+                if not isinstance(utterance, AnnotatedUtterance):
+                    utterance = AnnotatedUtterance.from_utterance(utterance)
+                    dialogue.utterances[i] = utterance
+
+                if len(utterance.dialogue_acts) > 0:
+                    continue
+
+                if utterance.participant not in to_annotate:
+                    raise ValueError(
+                        f"Unknown participant: {utterance.participant}"
+                    )
+                to_annotate[utterance.participant].append(utterance)
+
+        for participant, nlu in (
+            (DialogueParticipant.USER, self.user_nlu),
+            (DialogueParticipant.AGENT, self.agent_nlu),
+        ):
+            utterances = to_annotate[participant]
+            if not utterances:
+                continue
+            for utterance, dialogue_acts in zip(
+                utterances, nlu.extract_dialogue_acts_batch(utterances)
+            ):
+                utterance.dialogue_acts = dialogue_acts
+        return dialogues
 
     def get_recommendation_rounds(
         self, dialogue: Dialogue
@@ -131,9 +177,84 @@ class RecommendationSuccessRatio(Metric):
                     return False
         return b_accepted
 
+    def _success_ratio(self, dialogue: Dialogue) -> float:
+        """Computes the ratio of successful rounds of an annotated dialogue.
+
+        Args:
+            dialogue: Annotated dialogue.
+
+        Returns:
+            Ratio of successful rounds of recommendation, or 0 if no
+            recommendation rounds are found.
+        """
+        return self._success_ratios([dialogue])[0]
+
+    def _success_ratios(self, dialogues: List[Dialogue]) -> List[float]:
+        """Computes the ratios of successful rounds of annotated dialogues.
+
+        The rounds are the segments of utterances ending right before a
+        recommendation, as in `get_recommendation_rounds`, and are found on
+        the columnar view of all the dialogues at once. A round is successful
+        if a user utterance accepts the recommendation and none only rejects
+        it, as in `is_recommendation_accepted`.
+
+        Args:
+            dialogues: Annotated dialogues.
+
+        Returns:
+            Ratios of successful rounds of recommendation, or 0 for dialogues
+            without recommendation rounds.
+        """
+        columns = DialogueColumns.from_dialogues(dialogues)
+        recommendations = columns.has_intent(
+            intent.label for intent in self.recommendation_intents
+        )
+        user = columns.participants == DialogueParticipant.USER.value
+        accepts = user & columns.has_intent(
+            intent.label for intent in self.accept_intents
+        )
+        rejects = (
+            user
+            & columns.has_intent(intent.label for intent in self.reject_intents)
+            & ~accepts
+        )
+
+        # A segment starts at each recommendation and dialogue start, and is
+        # a round if it is followed by a recommendation in the same dialogue
+        first_utterances = columns.first_utterances()
+        segment_starts = recommendations | first_utterances
+        segment_ids = np.cumsum(segment_starts) - 1
+        num_segments = int(segment_starts.sum())
+        next_starts = np.flatnonzero(segment_starts)[1:]
+        is_round = np.zeros(num_segments, dtype=bool)
+        is_round[:-1] = (
+            recommendations[next_starts] & ~first_utterances[next_starts]
+        )
+
+        accepted = np.bincount(segment_ids[accepts], minlength=num_segments)
+        rejected = np.bincount(segment_ids[rejects], minlength=num_segments)
+        successful = is_round & (accepted > 0) & (rejected == 0)
+
+        segment_dialogues = columns.dialogue_indices[segment_starts]
+        num_rounds = np.bincount(
+            segment_dialogues[is_round], minlength=columns.num_dialogues
+        )
+        num_successful = np.bincount(
+            segment_dialogues[successful], minlength=columns.num_dialogues
+        )
+        return np.divide(
+            num_successful,
+            num_rounds,
+            out=np.zeros(columns.num_dialogues),
+            where=num_rounds > 0,
+        ).tolist()
+
     def evaluate_dialogue(self, dialogue: Dialogue) -> float:
         """Evaluates the ratio of successful rounds of recommendation.
 
+        The utterances of the dialogue without dialogue acts are annotated in
+        place, as in `annotate_dialogues`.
+
         Args:
             dialogue: Dialogue to evaluate.
 
@@ -141,9 +262,34 @@ class RecommendationSuccessRatio(Metric):
             Ratio of successful rounds of recommendation, or 0 if no
             recommendation rounds are found.
         """
-        rounds = self.get_recommendation_rounds(dialogue)
-        successful_rounds = 0
-        for round in rounds:
-            if self.is_recommendation_accepted(round):
-                successful_rounds += 1
-        return successful_rounds / len(rounds) if rounds else 0.0
+        self.annotate_dialogue(dialogue)
+        return self._success_ratio(dialogue)
+
+    def evaluate_dialogues(
+        self,
+        dialogues: List[Dialogue],
+        preprocessed: Optional[Dict[Hashable, List[Any]]] = None,
+    ) -> List[float]:
+        """Evaluates multiple dialogues.
+
+        The dialogues are annotated in one batch before being evaluated,
+        unless they are already preprocessed.
+
+        Args:
+            dialogues: Dialogues to evaluate.
+            preprocessed: Outputs of the preprocessing stages per key.
+              Defaults to None.
+
+        Returns:
+            List of ratios of successful rounds of recommendation.
+        """
+        annotated_dialogues = self._annotation_stage.get_output(
+            dialogues, preprocessed
+        )
+        return self._success_ratios(annotated_dialogues)
+
+    def close(self) -> None:
+        """Releases the resources held by the NLU modules."""
+        self.user_nlu.close()
+        if self.agent_nlu is not self.user_nlu:
+            self.agent_nlu.close()
@@ -1,44 +1,98 @@
 """Zero-shot classifier to assess success of conversations."""
 
+from typing import Any, Dict, Hashable, List, Optional
+
 from transformers import pipeline
 
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.utils.model_registry import get_model_registry
 from simlab.metrics.metric import Metric
+from simlab.metrics.preprocessing import PreprocessingStage
 
 DEFAULT_CLASSIFIER_MODEL = "facebook/bart-large-mnli"
+DEFAULT_BATCH_SIZE = 8
 
 
 class SuccessClassificationRate(Metric):
+    required_fields = {"utterance", "participant"}
+    requires_torch = True
+
     def __init__(
         self,
         name: str = "success_rate",
         model_name: str = DEFAULT_CLASSIFIER_MODEL,
+        device: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_transcript_tokens: int = None,
+        truncation_side: str = "left",
     ) -> None:
         """Initializes success classifier.
 
+        The classifier is acquired from the model registry, hence it is shared
+        with other metrics using the same model.
+
         Args:
             name: Name of the metric. Defaults to "success_rate".
             model_name: Name of the classifier model. Defaults to
               DEFAULT_CLASSIFIER_MODEL.
+            device: Device to run the model on. Defaults to None, in which
+              case the default device of the pipeline is used.
+            batch_size: Number of transcript and label pairs classified at a
+              time. Defaults to DEFAULT_BATCH_SIZE.
+            max_transcript_tokens: Maximum number of tokens of a transcript.
+              Defaults to None, in which case the pipeline truncates the end
+              of transcripts exceeding the length supported by the model.
+            truncation_side: Side from which long transcripts are truncated,
+              "left" keeps the end of the conversation and "right" keeps its
+              beginning. Defaults to "left".
+
+        Raises:
+            ValueError: If the truncation side is invalid.
         """
         super().__init__(name)
+        if truncation_side not in ("left", "right"):
+            raise ValueError(
+                f"Invalid truncation side: {truncation_side}. Expected 'left' "
+                "or 'right'."
+            )
+        self.batch_size = batch_size
+        self.max_transcript_tokens = max_transcript_tokens
+        self.truncation_side = truncation_side
+
+        self._classifier_key = ("zero-shot-classification", model_name, device)
+        self.classifier = get_model_registry().acquire(
+            *self._classifier_key[:2],
+            lambda: pipeline(
+                "zero-shot-classification", model=model_name, device=device
+            ),
+            device,
+        )
 
-        self.classifier = pipeline("zero-shot-classification", model=model_name)
+        self._model_revision = str(self.classifier.model.config._commit_hash)
 
         self.hypothesis_template = (
             "The AGENT's recommendations are {} with the USER's preferences."
         )
         self.labels = ["aligned", "misaligned"]
+        # Transcripts only depend on the tokenizer and truncation settings
+        self._transcripts_stage = PreprocessingStage(
+            (
+                "success_rate_transcripts",
+                model_name,
+                max_transcript_tokens,
+                truncation_side,
+            ),
+            self._format_transcripts,
+        )
 
-    def evaluate_dialogue(self, dialogue: Dialogue) -> float:
-        """Evaluates a dialogue.
+    def _format_transcript(self, dialogue: Dialogue) -> str:
+        """Formats a dialogue as a transcript, truncated if needed.
 
         Args:
-            dialogue: Dialogue to evaluate.
+            dialogue: Dialogue to format.
 
         Returns:
-            Whether the conversation is successful or not as 1 or 0
-              respectively.
+            Transcript of the dialogue.
         """
         conv = "\n".join(
             [
@@ -46,9 +100,92 @@ class SuccessClassificationRate(Metric):
                 for utterance in dialogue.utterances
             ]
         )
+        if self.max_transcript_tokens is None:
+            return conv
+
+        offsets = self.classifier.tokenizer(
+            conv, add_special_tokens=False, return_offsets_mapping=True
+        )["offset_mapping"]
+        if len(offsets) <= self.max_transcript_tokens:
+            return conv
+        if self.truncation_side == "left":
+            return conv[offsets[-self.max_transcript_tokens][0] :]
+        return conv[: offsets[self.max_transcript_tokens - 1][1]]
+
+    def _format_transcripts(self, dialogues: List[Dialogue]) -> List[str]:
+        """Formats multiple dialogues as transcripts.
 
-        result = self.classifier(
-            conv, self.labels, hypothesis_template=self.hypothesis_template
+        Args:
+            dialogues: Dialogues to format.
+
+        Returns:
+            Transcripts of the dialogues.
+        """
+        return [self._format_transcript(dialogue) for dialogue in dialogues]
+
+    @property
+    def preprocessing_stages(self) -> List[PreprocessingStage]:
+        """Returns the formatting of the transcripts."""
+        return [self._transcripts_stage]
+
+    def model_revisions(self) -> List[str]:
+        """Returns the revision of the classifier model."""
+        return [self._model_revision]
+
+    def evaluate_dialogue(self, dialogue: Dialogue) -> float:
+        """Evaluates a dialogue.
+
+        Args:
+            dialogue: Dialogue to evaluate.
+
+        Returns:
+            Whether the conversation is successful or not as 1 or 0
+              respectively.
+        """
+        return self.evaluate_dialogues([dialogue])[0]
+
+    def evaluate_dialogues(
+        self,
+        dialogues: List[Dialogue],
+        preprocessed: Optional[Dict[Hashable, List[Any]]] = None,
+    ) -> List[float]:
+        """Evaluates multiple dialogues by batches.
+
+        Transcripts are sorted by length before being classified to limit
+        padding within batches.
+
+        Args:
+            dialogues: Dialogues to evaluate.
+            preprocessed: Outputs of the preprocessing stages per key.
+              Defaults to None.
+
+        Returns:
+            List of 1 or 0 for successful and unsuccessful conversations
+            respectively.
+        """
+        transcripts = self._transcripts_stage.get_output(
+            dialogues, preprocessed
+        )
+        if not transcripts:
+            return []
+        order = sorted(
+            range(len(transcripts)), key=lambda i: -len(transcripts[i])
         )
 
-        return 1.0 if result["labels"][0] == "aligned" else 0.0
+        results = self.classifier(
+            [transcripts[i] for i in order],
+            self.labels,
+            hypothesis_template=self.hypothesis_template,
+            batch_size=self.batch_size,
+        )
+
+        scores = [0.0] * len(transcripts)
+        for i, result in zip(order, results):
+            scores[i] = 1.0 if result["labels"][0] == "aligned" else 0.0
+        return scores
+
+    def close(self) -> None:
+        """Releases the classifier."""
+        if self.classifier is not None:
+            get_model_registry().release(*self._classifier_key)
+            self.classifier = None
@@ -1,10 +1,17 @@
 """Wrapper for conversational agent served with an API."""
 
+from __future__ import annotations
+
+import copy
+
 from dialoguekit.core import AnnotatedUtterance, Intent, Utterance
 from dialoguekit.core.dialogue_act import DialogueAct
 from dialoguekit.participant import Agent
 from dialoguekit.participant.agent import AgentType
-from simlab.utils.participant_api.utils_api_calls import get_utterance_response
+from simlab.utils.participant_api.utils_api_calls import (
+    ContextMode,
+    get_utterance_response,
+)
 
 
 class WrapperAgent(Agent):
@@ -25,6 +32,39 @@ class WrapperAgent(Agent):
         """
         super().__init__(id=id, agent_type=agent_type, stop_intent=stop_intent)
         self._uri = uri
+        self.conversation_id: str = None
+        self.context_mode = ContextMode.FULL
+
+    @property
+    def uri(self) -> str:
+        """Returns the URI of the agent's API."""
+        return self._uri
+
+    @uri.setter
+    def uri(self, uri: str) -> None:
+        """Sets the URI of the agent's API.
+
+        Args:
+            uri: URI of the agent's API.
+        """
+        self._uri = uri
+
+    def for_conversation(self, conversation_id: str) -> WrapperAgent:
+        """Returns a copy of the agent dedicated to a single conversation.
+
+        Copies share the same API but are connected to their own dialogue
+        connector, hence several conversations can be held at the same time.
+
+        Args:
+            conversation_id: Conversation ID sent along with each request.
+
+        Returns:
+            Copy of the agent.
+        """
+        agent = copy.copy(self)
+        agent._dialogue_connector = None
+        agent.conversation_id = conversation_id
+        return agent
 
     def welcome(self) -> None:
         """Sends the agent's welcome message."""
@@ -49,15 +89,18 @@ class WrapperAgent(Agent):
         Args:
             utterance: The other participant's utterance.
         """
-        context = [
-            utterance.text
-            for utterance in self._dialogue_connector.dialogue_history.utterances  # noqa
-        ]
+        dialogue_history = self._dialogue_connector.dialogue_history
         request_data = {
-            "context": context,
             "message": utterance.text,
             "user_id": self._dialogue_connector._user.id,
             "agent_id": self.id,
+            "conversation_id": (
+                self.conversation_id or dialogue_history.conversation_id
+            ),
         }
+        if self.context_mode == ContextMode.FULL:
+            request_data["context"] = [
+                utterance.text for utterance in dialogue_history.utterances
+            ]
         response = get_utterance_response(self._uri, request_data, self._type)
         self._dialogue_connector.register_agent_utterance(response)
@@ -1,12 +1,20 @@
 """Wrapper for user simulator served with an API."""
 
-import requests
+from __future__ import annotations
+
+import copy
 
 from dialoguekit.core import Utterance
 from dialoguekit.participant import User
 from dialoguekit.participant.user import UserType
 from simlab.core.information_need import InformationNeed
-from simlab.utils.participant_api.utils_api_calls import get_utterance_response
+from simlab.utils.participant_api.participant_client import (
+    get_participant_client,
+)
+from simlab.utils.participant_api.utils_api_calls import (
+    ContextMode,
+    get_utterance_response,
+)
 
 
 class WrapperUserSimulator(User):
@@ -26,6 +34,41 @@ class WrapperUserSimulator(User):
         super().__init__(id, user_type)
         self._uri = uri
         self.information_need: InformationNeed = None
+        self.conversation_id: str = None
+        self.context_mode = ContextMode.FULL
+
+    @property
+    def uri(self) -> str:
+        """Returns the URI of the user simulator's API."""
+        return self._uri
+
+    @uri.setter
+    def uri(self, uri: str) -> None:
+        """Sets the URI of the user simulator's API.
+
+        Args:
+            uri: URI of the user simulator's API.
+        """
+        self._uri = uri
+
+    def for_conversation(self, conversation_id: str) -> WrapperUserSimulator:
+        """Returns a copy of the user simulator dedicated to a conversation.
+
+        Copies share the same API but are connected to their own dialogue
+        connector and hold their own information need, hence several
+        conversations can be held at the same time.
+
+        Args:
+            conversation_id: Conversation ID sent along with each request.
+
+        Returns:
+            Copy of the user simulator.
+        """
+        user_simulator = copy.copy(self)
+        user_simulator._dialogue_connector = None
+        user_simulator.information_need = None
+        user_simulator.conversation_id = conversation_id
+        return user_simulator
 
     def set_information_need(self, information_need: InformationNeed) -> None:
         """Sets the information need for the user simulator.
@@ -36,11 +79,12 @@ class WrapperUserSimulator(User):
         Raises:
             RuntimeError: If the request fails.
         """
-        r = requests.post(
-            f"{self._uri}/set_information_need",
+        r = get_participant_client(self._uri).post(
+            "/set_information_need",
             json={
                 "information_need": information_need.to_dict(),
                 "user_id": self.id,
+                "conversation_id": self.conversation_id,
             },
         )
         status_code = r.status_code
@@ -62,9 +106,14 @@ class WrapperUserSimulator(User):
         Raises:
             RuntimeError: If the request fails.
         """
-        r = requests.post(
-            f"{self._uri}/get_information_need",
-            json={"user_id": self.id},
+        conversation_id = self.conversation_id
+        if not conversation_id and self._dialogue_connector:
+            conversation_id = (
+                self._dialogue_connector.dialogue_history.conversation_id
+            )
+        r = get_participant_client(self._uri).post(
+            "/get_information_need",
+            json={"user_id": self.id, "conversation_id": conversation_id},
         )
         status_code = r.status_code
         if status_code != 200:
@@ -88,15 +137,18 @@ class WrapperUserSimulator(User):
         Args:
             utterance: Agent utterance.
         """
-        context = [
-            utterance.text
-            for utterance in self._dialogue_connector.dialogue_history.utterances  # noqa
-        ]
+        dialogue_history = self._dialogue_connector.dialogue_history
         request_data = {
-            "context": context,
             "message": utterance.text,
             "agent_id": self._dialogue_connector._agent.id,
             "user_id": self.id,
+            "conversation_id": (
+                self.conversation_id or dialogue_history.conversation_id
+            ),
         }
+        if self.context_mode == ContextMode.FULL:
+            request_data["context"] = [
+                utterance.text for utterance in dialogue_history.utterances
+            ]
         response = get_utterance_response(self._uri, request_data, self._type)
         self._dialogue_connector.register_user_utterance(response)
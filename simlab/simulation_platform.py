@@ -1,6 +1,6 @@
 """Simulation platform facilitating interaction between agent and simulator."""
 
-from typing import Dict, Tuple, Type
+from typing import Any, Callable, Dict, List, Tuple, Type
 
 from dialoguekit.core.utterance import Utterance
 from dialoguekit.participant.agent import Agent
@@ -20,6 +20,7 @@ class SimulationPlatform(Platform):
         self._active_agent_user_pairs: Dict[
             Tuple[str, str], Tuple[Agent, User]
         ] = {}
+        self._dialogue_listeners: List[Callable[[Dict[str, Any]], None]] = []
 
     def start(self) -> None:
         """Starts the simulation platform.
@@ -29,7 +30,12 @@ class SimulationPlatform(Platform):
         pass
 
     def connect(
-        self, user_id: str, user_simulator: User, agent: Agent, output_dir: str
+        self,
+        user_id: str,
+        user_simulator: User,
+        agent: Agent,
+        output_dir: str,
+        conversation_id: str = None,
     ) -> None:
         """Connects a user simulator and an agent.
 
@@ -38,6 +44,7 @@ class SimulationPlatform(Platform):
             user_simulator: User simulator.
             agent: Agent.
             output_dir: Output directory to save the dialogues.
+            conversation_id: Conversation ID. Defaults to None.
 
         Raises:
             ValueError: If the agent is already connected to the user.
@@ -56,9 +63,30 @@ class SimulationPlatform(Platform):
             user=user_simulator,
             platform=self,
             output_dir=output_dir,
+            conversation_id=conversation_id,
         )
         dialogue_connector.start()
 
+    def add_dialogue_listener(
+        self, listener: Callable[[Dict[str, Any]], None]
+    ) -> None:
+        """Adds a listener called with each finished dialogue.
+
+        Args:
+            listener: Function called with the dialogue in dictionary format,
+              as exported.
+        """
+        self._dialogue_listeners.append(listener)
+
+    def notify_dialogue_finished(self, dialogue_data: Dict[str, Any]) -> None:
+        """Notifies the listeners that a dialogue is finished.
+
+        Args:
+            dialogue_data: Dialogue in dictionary format.
+        """
+        for listener in self._dialogue_listeners:
+            listener(dialogue_data)
+
     def display_agent_utterance(
         self, utterance: Utterance, agent_id: str, user_id: str = None
     ) -> None:
@@ -0,0 +1,161 @@
+"""Evaluation of dialogues as they are generated.
+
+Finished dialogues are pushed onto a bounded queue consumed by a worker
+thread, which evaluates them by batches with the metrics of the task while
+the next dialogues are being generated. The queue bounds the number of
+dialogues waiting for evaluation, producers are blocked when it is full.
+"""
+
+import os
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+from dialoguekit.utils.dialogue_reader import dialogue_from_dict
+from simlab.metrics.evaluation_cache import EvaluationCache
+from simlab.metrics.metric_executor import MetricExecutor
+from simlab.tasks.task import DEFAULT_EVALUATION_BATCH_SIZE, Task
+from simlab.utils.aggregation import information_need_key
+
+STREAMING_EVALUATION_QUEUE_SIZE = int(
+    os.environ.get("STREAMING_EVALUATION_QUEUE_SIZE", "64")
+)
+
+# Marks the end of the stream of dialogues
+_END_OF_STREAM = object()
+
+
+class StreamingEvaluator:
+    def __init__(
+        self,
+        task: Task,
+        batch_size: int = DEFAULT_EVALUATION_BATCH_SIZE,
+        max_queue_size: int = STREAMING_EVALUATION_QUEUE_SIZE,
+        cache: Optional[EvaluationCache] = None,
+    ) -> None:
+        """Initializes the evaluator and starts its worker.
+
+        Args:
+            task: Task whose metrics are used.
+            batch_size: Maximum number of dialogues evaluated at a time.
+              Defaults to DEFAULT_EVALUATION_BATCH_SIZE.
+            max_queue_size: Maximum number of dialogues waiting for
+              evaluation. Defaults to STREAMING_EVALUATION_QUEUE_SIZE.
+            cache: Cache of evaluation scores. Defaults to None.
+        """
+        self.task = task
+        self.batch_size = batch_size
+        self.cache = cache
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._results: Dict[str, List[float]] = {
+            metric.name: [] for metric in task.metrics
+        }
+        self._information_needs: List[Optional[str]] = []
+        self._results_lock = threading.Lock()
+        self._error: Exception = None
+        self._closed = False
+        self._worker = threading.Thread(target=self._consume, daemon=True)
+        self._worker.start()
+
+    def submit(self, dialogue_data: Dict[str, Any]) -> None:
+        """Adds a finished dialogue to the evaluation queue.
+
+        Blocks while the queue is full.
+
+        Args:
+            dialogue_data: Dialogue in dictionary format.
+        """
+        self._queue.put(dialogue_data)
+
+    def partial_results(self) -> Dict[str, List[float]]:
+        """Returns the scores of the dialogues evaluated so far."""
+        with self._results_lock:
+            return {
+                name: list(scores) for name, scores in self._results.items()
+            }
+
+    def information_needs(self) -> List[Optional[str]]:
+        """Returns the information need keys of the dialogues evaluated."""
+        with self._results_lock:
+            return list(self._information_needs)
+
+    def close(self) -> None:
+        """Ends the stream and waits for the worker to stop.
+
+        The queued dialogues are still evaluated. No dialogue may be submitted
+        afterwards. Closing the evaluator more than once has no effect.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_END_OF_STREAM)
+        self._worker.join()
+
+    def finish(self) -> Dict[str, List[float]]:
+        """Waits for the queued dialogues to be evaluated.
+
+        No dialogue may be submitted afterwards.
+
+        Raises:
+            RuntimeError: If the evaluation failed.
+
+        Returns:
+            Evaluation scores for each metric.
+        """
+        self.close()
+        if self._error is not None:
+            raise RuntimeError(
+                f"Streaming evaluation failed: {self._error}"
+            ) from self._error
+        return self.partial_results()
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Gets the next batch of dialogues from the queue.
+
+        Waits for at least one dialogue, then takes the dialogues already
+        queued, up to the batch size.
+
+        Returns:
+            Batch of dialogues, or an empty batch at the end of the stream.
+        """
+        batch = []
+        item = self._queue.get()
+        while item is not _END_OF_STREAM:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        else:
+            # Puts the end of the stream back for the next call
+            if batch:
+                self._queue.put(_END_OF_STREAM)
+        return batch
+
+    def _consume(self) -> None:
+        """Evaluates the dialogues of the queue until the end of the stream.
+
+        After a failure, dialogues are still consumed to not block producers.
+        """
+        with MetricExecutor(self.task.metrics) as executor:
+            while True:
+                batch = self._next_batch()
+                if not batch:
+                    return
+                if self._error is not None:
+                    continue
+                try:
+                    dialogues = [dialogue_from_dict(data) for data in batch]
+                    scores = self.task.evaluate_batch(
+                        executor, dialogues, self.cache
+                    )
+                except Exception as e:
+                    self._error = e
+                    continue
+                with self._results_lock:
+                    for name, values in scores.items():
+                        self._results[name].extend(values)
+                    self._information_needs.extend(
+                        information_need_key(dialogue) for dialogue in dialogues
+                    )
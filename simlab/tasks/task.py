@@ -1,15 +1,22 @@
 """Class to represent a task."""
 
-from typing import Dict, List
+import itertools
+import math
+from typing import Dict, Iterable, List, Optional, Set
 
 from bson import ObjectId
 
 from connectors.mongo.mongo_connector import MongoDBConnector
 from connectors.mongo.utils import find_records
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.utils.model_registry import get_model_registry
 from simlab.core.information_need import InformationNeed
 from simlab.core.simulation_domain import SimulationDomain
+from simlab.metrics.evaluation_cache import EvaluationCache, hash_dialogue
 from simlab.metrics.metric import Metric
+from simlab.metrics.metric_executor import MetricExecutor
+
+DEFAULT_EVALUATION_BATCH_SIZE = 32
 
 
 class Task:
@@ -90,16 +97,122 @@ class Task:
 
         return information_needs
 
-    def evaluation(self, dialogues: List[Dialogue]) -> Dict[str, List[float]]:
+    @property
+    def required_fields(self) -> Optional[Set[str]]:
+        """Returns the utterance fields needed by the metrics.
+
+        None is returned if a metric needs all the fields.
+        """
+        required_fields: Set[str] = set()
+        for metric in self.metrics:
+            if metric.required_fields is None:
+                return None
+            required_fields.update(metric.required_fields)
+        return required_fields
+
+    def evaluation(
+        self,
+        dialogues: Iterable[Dialogue],
+        batch_size: int = DEFAULT_EVALUATION_BATCH_SIZE,
+        cache: Optional[EvaluationCache] = None,
+    ) -> Dict[str, List[float]]:
         """Evaluates the dialogues using the metrics.
 
+        Dialogues are consumed by batches, hence a generator can be given to
+        evaluate dialogues without holding all of them in memory. The metrics
+        of each batch are evaluated in parallel and share their
+        preprocessing, see MetricExecutor.
+
         Args:
             dialogues: Dialogues to evaluate.
+            batch_size: Number of dialogues evaluated at a time. Defaults to
+              DEFAULT_EVALUATION_BATCH_SIZE.
+            cache: Cache of evaluation scores. Defaults to None.
 
         Returns:
             Evaluation scores for each metric.
         """
-        return {
-            metric.name: metric.evaluate_dialogues(dialogues)
-            for metric in self.metrics
+        results: Dict[str, List[float]] = {
+            metric.name: [] for metric in self.metrics
+        }
+        dialogues = iter(dialogues)
+        with MetricExecutor(self.metrics) as executor:
+            while True:
+                batch = list(itertools.islice(dialogues, batch_size))
+                if not batch:
+                    break
+                scores = self.evaluate_batch(executor, batch, cache)
+                for name, values in scores.items():
+                    results[name].extend(values)
+        return results
+
+    def evaluate_batch(
+        self,
+        executor: MetricExecutor,
+        dialogues: List[Dialogue],
+        cache: Optional[EvaluationCache] = None,
+    ) -> Dict[str, List[float]]:
+        """Evaluates a batch of dialogues, reusing cached scores.
+
+        Only the metrics missing some scores are evaluated, on the dialogues
+        missing at least one of their scores. Metrics without fingerprint are
+        always evaluated. Scores that are not finite, e.g., NaN, are not
+        cached.
+
+        Args:
+            executor: Executor of the metrics of the task.
+            dialogues: Dialogues to evaluate.
+            cache: Cache of evaluation scores. Defaults to None.
+
+        Returns:
+            Evaluation scores for each metric.
+        """
+        if cache is None:
+            return executor.evaluate(dialogues)
+
+        hashes = [hash_dialogue(dialogue) for dialogue in dialogues]
+        fingerprints = {
+            metric.name: metric.fingerprint() for metric in self.metrics
         }
+        scores: Dict[str, List[Optional[float]]] = {}
+        for metric in self.metrics:
+            fingerprint = fingerprints[metric.name]
+            cached = cache.get_many(fingerprint, hashes) if fingerprint else {}
+            scores[metric.name] = [cached.get(h) for h in hashes]
+
+        missing_metrics = [
+            metric
+            for metric in self.metrics
+            if any(score is None for score in scores[metric.name])
+        ]
+        if not missing_metrics:
+            return scores
+
+        indices = [
+            i
+            for i in range(len(dialogues))
+            if any(scores[metric.name][i] is None for metric in missing_metrics)
+        ]
+        computed = executor.evaluate(
+            [dialogues[i] for i in indices], missing_metrics
+        )
+        for metric in missing_metrics:
+            new_scores = {}
+            for i, value in zip(indices, computed[metric.name]):
+                if scores[metric.name][i] is None:
+                    scores[metric.name][i] = value
+                    if math.isfinite(value):
+                        new_scores[hashes[i]] = value
+            if fingerprints[metric.name]:
+                cache.set_many(fingerprints[metric.name], new_scores)
+        return scores
+
+    def close(self) -> None:
+        """Releases the resources held by the metrics.
+
+        The models that are no longer used by any component are dropped from
+        the model registry. Closing the task again has no effect.
+        """
+        for metric in self.metrics:
+            metric.close()
+        get_model_registry().evict_unused()
@@ -0,0 +1,217 @@
+"""Aggregation of evaluation scores.
+
+The scores of a metric are arranged in a 2-D array with one row per
+information need and one column per iteration, along with a mask of the
+scores, as information needs may have different numbers of dialogues.
+Summary statistics are computed over the whole array at once, and confidence
+intervals of the mean are estimated with a cluster bootstrap that resamples
+information needs, as the dialogues generated for the same information need
+are not independent. NaN scores, e.g., of dialogues a metric could not
+evaluate, are excluded from all statistics and counted separately.
+"""
+
+import json
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dialoguekit.core.dialogue import Dialogue
+
+DEFAULT_NUM_RESAMPLES = 1000
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+
+
+def information_need_key(dialogue: Dialogue) -> Optional[str]:
+    """Returns a key identifying the information need of a dialogue.
+
+    The information need in the metadata is the one at the end of the
+    dialogue, where some requested slots are fulfilled. The key only depends
+    on the information need as assigned, i.e., its constraints and all its
+    requested slots, so that the dialogues generated for the same information
+    need share it.
+
+    Args:
+        dialogue: Dialogue.
+
+    Returns:
+        Key of the information need, or None if the dialogue has none.
+    """
+    metadata = dialogue.metadata
+    if not isinstance(metadata, dict):
+        return None
+    information_need = metadata.get("information_need")
+    if information_need is None:
+        return None
+    if (
+        not isinstance(information_need, dict)
+        or "constraints" not in information_need
+    ):
+        return json.dumps(information_need, sort_keys=True)
+    requested_slots = set(information_need.get("requested_slots") or [])
+    requested_slots.update(information_need.get("fulfilled_slots") or {})
+    return json.dumps(
+        {
+            "constraints": information_need.get("constraints"),
+            "requested_slots": sorted(requested_slots),
+        },
+        sort_keys=True,
+    )
+
+
+def to_grouped_array(
+    values: Sequence[float], groups: Optional[Sequence[Hashable]] = None
+) -> Tuple[np.ndarray, np.ndarray, List[Hashable]]:
+    """Arranges scores in a 2-D array with one row per group.
+
+    Args:
+        values: Scores.
+        groups: Group of each score, e.g., its information need. Defaults to
+          None, in which case each score is its own group. Scores without
+          group, i.e., None, are also their own group.
+
+    Returns:
+        Array of shape (number of groups, size of the largest group) padded
+        with 0, mask of the same shape that is False for padding, and the
+        groups in order of first appearance.
+    """
+    if groups is None:
+        groups = [None] * len(values)
+    rows: Dict[Hashable, List[float]] = {}
+    for i, (value, group) in enumerate(zip(values, groups)):
+        # Scores without group are not grouped together
+        key = ("__ungrouped__", i) if group is None else group
+        rows.setdefault(key, []).append(value)
+
+    num_columns = max((len(row) for row in rows.values()), default=0)
+    array = np.zeros((len(rows), num_columns))
+    mask = np.zeros((len(rows), num_columns), dtype=bool)
+    for i, row in enumerate(rows.values()):
+        array[i, : len(row)] = row
+        mask[i, : len(row)] = True
+    keys = [None if _is_ungrouped(key) else key for key in rows]
+    return array, mask, keys
+
+
+def _is_ungrouped(key: Hashable) -> bool:
+    """Checks whether a row key stands for a score without group."""
+    return (
+        isinstance(key, tuple) and len(key) == 2 and key[0] == "__ungrouped__"
+    )
+
+
+def bootstrap_confidence_interval(
+    array: np.ndarray,
+    mask: np.ndarray,
+    num_resamples: int = DEFAULT_NUM_RESAMPLES,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+    seed: int = 0,
+) -> Tuple[float, float]:
+    """Estimates a confidence interval of the mean with a cluster bootstrap.
+
+    Rows are resampled with replacement, all at once: the mean of each
+    resample is the sum of the resampled rows divided by their number of
+    scores.
+
+    Args:
+        array: Scores with one row per group.
+        mask: Mask of the scores to use, False for padding.
+        num_resamples: Number of bootstrap resamples. Defaults to
+          DEFAULT_NUM_RESAMPLES.
+        confidence_level: Confidence level of the interval. Defaults to
+          DEFAULT_CONFIDENCE_LEVEL.
+        seed: Seed of the random generator. Defaults to 0.
+
+    Returns:
+        Lower and upper bounds of the interval, NaN if there are no scores.
+    """
+    row_counts = mask.sum(axis=1)
+    row_sums = np.where(mask, array, 0.0).sum(axis=1)[row_counts > 0]
+    row_counts = row_counts[row_counts > 0]
+    if row_counts.size == 0:
+        return float("nan"), float("nan")
+
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(
+        0, row_sums.size, size=(num_resamples, row_sums.size)
+    )
+    means = row_sums[indices].sum(axis=1) / row_counts[indices].sum(axis=1)
+    alpha = (1 - confidence_level) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def aggregate_scores(
+    values: Sequence[float],
+    groups: Optional[Sequence[Hashable]] = None,
+    num_resamples: int = DEFAULT_NUM_RESAMPLES,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+) -> Dict[str, Any]:
+    """Computes the summary statistics of the scores of a metric.
+
+    The standard deviation of a single score is 0. NaN scores are excluded
+    from the statistics and counted. Statistics of an empty list of scores,
+    or of NaN scores only, are None.
+
+    Args:
+        values: Scores.
+        groups: Group of each score, e.g., its information need. Defaults to
+          None, i.e., scores are independent.
+        num_resamples: Number of bootstrap resamples. Defaults to
+          DEFAULT_NUM_RESAMPLES.
+        confidence_level: Confidence level of the interval of the mean.
+          Defaults to DEFAULT_CONFIDENCE_LEVEL.
+
+    Returns:
+        Scores, their summary statistics, confidence interval of the mean,
+        number of NaN scores, and mean and number of scores per group.
+    """
+    values = [float(value) for value in values]
+    array, mask, keys = to_grouped_array(values, groups)
+    mask &= ~np.isnan(array)
+    flat = np.asarray(values, dtype=float)
+    num_nan = int(np.isnan(flat).sum())
+    flat = flat[~np.isnan(flat)]
+
+    if flat.size == 0:
+        statistics = dict.fromkeys(
+            ["mean", "std", "median", "min", "max", "q1", "q3"]
+        )
+        ci_low = ci_high = None
+    else:
+        q1, median, q3 = np.quantile(flat, [0.25, 0.5, 0.75])
+        statistics = {
+            "mean": flat.mean(),
+            "std": flat.std(ddof=1) if flat.size > 1 else 0.0,
+            "median": median,
+            "min": flat.min(),
+            "max": flat.max(),
+            "q1": q1,
+            "q3": q3,
+        }
+        ci_low, ci_high = bootstrap_confidence_interval(
+            array, mask, num_resamples, confidence_level
+        )
+
+    results: Dict[str, Any] = {"values": values}
+    results.update({k: _to_float(v) for k, v in statistics.items()})
+    results["ci_low"] = _to_float(ci_low)
+    results["ci_high"] = _to_float(ci_high)
+    results["confidence_level"] = confidence_level
+    results["num_nan"] = num_nan
+    if groups is not None:
+        counts = mask.sum(axis=1)
+        means = np.where(mask, array, 0.0).sum(axis=1) / np.maximum(counts, 1)
+        results["groups"] = [
+            {
+                "group": key,
+                "mean": float(mean) if count > 0 else None,
+                "count": int(count),
+            }
+            for key, mean, count in zip(keys, means, counts)
+        ]
+    return results
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Converts a NumPy scalar to a Python float, keeping None."""
+    return None if value is None else float(value)
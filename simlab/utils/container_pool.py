@@ -0,0 +1,204 @@
+"""Pool of participant containers kept warm across participant pairs.
+
+Starting a participant means pulling its image, running a container, waiting
+for its API, and configuring it. Instead of doing so for every pair, each
+container is started once and handed over from one pair to the next, being
+reconfigured through the `/configure` endpoint in between. The number of
+pairs that will use each image is reserved upfront, so that a container is
+stopped as soon as no pending pair needs it anymore.
+
+A container is used by a single pair at a time. If pairs needing the same
+image run concurrently, one container per pair is started.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from connectors.docker.commands import DockerRegistryMetadata
+from simlab.core.run_configuration import ParticipantConfiguration
+from simlab.utils.participant_api.participant_client import (
+    close_participant_client,
+)
+from simlab.utils.participant_api.utils_api_calls import configure_participant
+from simlab.utils.port_allocator import PortAllocator
+
+StartContainer = Callable[
+    [DockerRegistryMetadata, ParticipantConfiguration, int, Optional[int]],
+    Tuple[str, List[int]],
+]
+
+
+@dataclass
+class WarmContainer:
+    """Participant container managed by the pool."""
+
+    container_id: str
+    image: str
+    uri: str
+    ports: range
+
+
+class ContainerPool:
+    def __init__(
+        self,
+        registry_metadata: DockerRegistryMetadata,
+        port_allocator: PortAllocator,
+        start_container: StartContainer,
+        stop_container: Callable[[str], None],
+    ) -> None:
+        """Initializes the pool.
+
+        Args:
+            registry_metadata: Docker registry metadata.
+            port_allocator: Allocator of the local ports of the containers,
+              each container is given its own range.
+            start_container: Function starting and configuring the container
+              of a participant, given the registry metadata, the participant
+              configuration, and the first and last ports it may bind.
+            stop_container: Function stopping and deleting a container.
+        """
+        self.registry_metadata = registry_metadata
+        self.port_allocator = port_allocator
+        self._start_container = start_container
+        self._stop_container = stop_container
+        self._pending_uses: Counter = Counter()
+        self._idle: Dict[str, List[WarmContainer]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, image: str, count: int = 1) -> None:
+        """Announces that pairs will use an image.
+
+        Args:
+            image: Image of the participant.
+            count: Number of pairs. Defaults to 1.
+        """
+        with self._lock:
+            self._pending_uses[image] += count
+
+    def acquire(
+        self, participant_configuration: ParticipantConfiguration
+    ) -> WarmContainer:
+        """Gets a container for a participant.
+
+        An idle container of the same image is reconfigured for the
+        participant if available, otherwise a new container is started. The
+        URI and context mode of the participant are set accordingly.
+
+        Args:
+            participant_configuration: Participant configuration.
+
+        Raises:
+            RuntimeError: If the participant fails to start or to be
+              reconfigured.
+
+        Returns:
+            Container of the participant.
+        """
+        image = participant_configuration.image
+        with self._lock:
+            self._pending_uses[image] -= 1
+            idle = self._idle.get(image)
+            container = idle.pop() if idle else None
+
+        if container is None:
+            return self._start(participant_configuration)
+
+        participant = participant_configuration.participant
+        participant.uri = container.uri
+        try:
+            participant.context_mode = configure_participant(
+                container.uri,
+                participant.id,
+                participant_configuration.custom_parameters,
+            )
+        except Exception as e:
+            self._stop(container)
+            raise RuntimeError(
+                f"Failed to reconfigure participant {participant.id}: {e}"
+            )
+        return container
+
+    def release(self, container: WarmContainer, reuse: bool = True) -> None:
+        """Hands a container back to the pool.
+
+        The container is kept warm if pending pairs need its image and
+        enough containers of that image are not already idle, otherwise it
+        is stopped.
+
+        Args:
+            container: Container returned by `acquire`.
+            reuse: Whether the container can be used by another pair, False
+              if it is in an unknown state, e.g., after a failure. Defaults
+              to True.
+        """
+        with self._lock:
+            idle = self._idle.setdefault(container.image, [])
+            keep = reuse and len(idle) < self._pending_uses[container.image]
+            if keep:
+                idle.append(container)
+        if not keep:
+            self._stop(container)
+
+    def close(self) -> None:
+        """Stops all the idle containers."""
+        with self._lock:
+            containers = [
+                container
+                for containers in self._idle.values()
+                for container in containers
+            ]
+            self._idle.clear()
+            self._pending_uses.clear()
+        for container in containers:
+            self._stop(container)
+
+    def _start(
+        self, participant_configuration: ParticipantConfiguration
+    ) -> WarmContainer:
+        """Starts a container for a participant on a new range of ports.
+
+        Args:
+            participant_configuration: Participant configuration.
+
+        Returns:
+            Container of the participant.
+        """
+        ports = self.port_allocator.allocate()
+        try:
+            container_id, _ = self._start_container(
+                self.registry_metadata,
+                participant_configuration,
+                ports.start,
+                ports[-1],
+            )
+        except Exception:
+            self.port_allocator.release(ports)
+            raise
+        return WarmContainer(
+            container_id=container_id,
+            image=participant_configuration.image,
+            uri=participant_configuration.participant.uri,
+            ports=ports,
+        )
+
+    def _stop(self, container: WarmContainer) -> None:
+        """Stops a container and frees its resources.
+
+        Args:
+            container: Container to stop.
+        """
+        try:
+            self._stop_container(container.container_id)
+        finally:
+            close_participant_client(container.uri)
+            self.port_allocator.release(container.ports)
+
+    def __enter__(self) -> "ContainerPool":
+        """Returns the pool."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stops all the idle containers."""
+        self.close()
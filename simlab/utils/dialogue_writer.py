@@ -0,0 +1,112 @@
+"""Append-only export of dialogues in JSON Lines format.
+
+Each dialogue is written as a single line appended to the export file of the
+pair of participants. Writes are buffered and the file is only flushed and
+synced to disk when the writer is closed, hence exporting a dialogue does not
+depend on the number of dialogues already exported.
+"""
+
+import atexit
+import json
+import os
+import threading
+from typing import Any, Dict, TextIO
+
+DIALOGUE_WRITER_BUFFER_SIZE = int(
+    os.environ.get("DIALOGUE_WRITER_BUFFER_SIZE", str(1024 * 1024))
+)
+
+
+class DialogueWriter:
+    def __init__(
+        self, path: str, buffer_size: int = DIALOGUE_WRITER_BUFFER_SIZE
+    ) -> None:
+        """Initializes a writer appending dialogues to a JSONL file.
+
+        The file is opened lazily on the first write, existing dialogues are
+        kept.
+
+        Args:
+            path: Path to the JSONL file.
+            buffer_size: Size of the write buffer in bytes. Defaults to
+              DIALOGUE_WRITER_BUFFER_SIZE.
+        """
+        self.path = path
+        self._buffer_size = buffer_size
+        self._file: TextIO = None
+        self._lock = threading.Lock()
+
+    def write(self, dialogue: Dict[str, Any]) -> None:
+        """Appends a dialogue to the file.
+
+        Args:
+            dialogue: Dialogue in dictionary format.
+        """
+        line = json.dumps(dialogue) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(
+                    self.path,
+                    "a",
+                    encoding="utf-8",
+                    buffering=self._buffer_size,
+                )
+            self._file.write(line)
+
+    def close(self) -> None:
+        """Flushes the buffered dialogues, syncs and closes the file."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+
+_WRITERS: Dict[str, DialogueWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_dialogue_writer(path: str) -> DialogueWriter:
+    """Gets the writer of an export file.
+
+    Writers are created once per file and shared by all the conversations
+    exported to it.
+
+    Args:
+        path: Path to the JSONL file.
+
+    Returns:
+        Dialogue writer.
+    """
+    path = os.path.abspath(path)
+    with _WRITERS_LOCK:
+        if path not in _WRITERS:
+            _WRITERS[path] = DialogueWriter(path)
+        return _WRITERS[path]
+
+
+def close_dialogue_writer(path: str) -> None:
+    """Closes and forgets the writer of an export file, if any.
+
+    Args:
+        path: Path to the JSONL file.
+    """
+    with _WRITERS_LOCK:
+        writer = _WRITERS.pop(os.path.abspath(path), None)
+    if writer:
+        writer.close()
+
+
+@atexit.register
+def close_dialogue_writers() -> None:
+    """Closes all the open writers."""
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,176 @@
+"""Clients to communicate with the participants' API.
+
+Participants are called on every turn of every conversation. Instead of opening
+a new connection per request, each participant is given a client holding a pool
+of keep-alive connections. A synchronous client is shared by the wrappers and
+the API utilities, while an asynchronous variant is available for callers
+running an event loop.
+"""
+
+import os
+import threading
+from typing import Any, Dict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+PARTICIPANT_API_TIMEOUT = float(
+    os.environ.get("PARTICIPANT_API_TIMEOUT", "120")
+)
+PARTICIPANT_API_POOL_SIZE = int(
+    os.environ.get("PARTICIPANT_API_POOL_SIZE", "16")
+)
+
+
+class ParticipantClient:
+    def __init__(
+        self,
+        uri: str,
+        timeout: float = PARTICIPANT_API_TIMEOUT,
+        pool_size: int = PARTICIPANT_API_POOL_SIZE,
+    ) -> None:
+        """Initializes a synchronous client for a participant's API.
+
+        Args:
+            uri: URI of the participant's API.
+            timeout: Timeout in seconds of a request. Defaults to
+              PARTICIPANT_API_TIMEOUT.
+            pool_size: Maximum number of keep-alive connections. Defaults to
+              PARTICIPANT_API_POOL_SIZE.
+        """
+        self.uri = uri.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def get(self, route: str, **kwargs: Any) -> requests.Response:
+        """Sends a GET request to the participant.
+
+        Args:
+            route: Route of the API, e.g., "/".
+            kwargs: Additional arguments for the request.
+
+        Returns:
+            Response of the participant.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self._session.get(f"{self.uri}{route}", **kwargs)
+
+    def post(
+        self, route: str, json: Dict[str, Any], **kwargs: Any
+    ) -> requests.Response:
+        """Sends a POST request with a JSON body to the participant.
+
+        Args:
+            route: Route of the API, e.g., "/receive_utterance".
+            json: JSON body of the request.
+            kwargs: Additional arguments for the request.
+
+        Returns:
+            Response of the participant.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self._session.post(f"{self.uri}{route}", json=json, **kwargs)
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self._session.close()
+
+
+class AsyncParticipantClient:
+    def __init__(
+        self,
+        uri: str,
+        timeout: float = PARTICIPANT_API_TIMEOUT,
+        pool_size: int = PARTICIPANT_API_POOL_SIZE,
+    ) -> None:
+        """Initializes an asynchronous client for a participant's API.
+
+        The client is bound to the event loop it is used in, it should be
+        closed with `aclose` before the loop ends.
+
+        Args:
+            uri: URI of the participant's API.
+            timeout: Timeout in seconds of a request. Defaults to
+              PARTICIPANT_API_TIMEOUT.
+            pool_size: Maximum number of keep-alive connections. Defaults to
+              PARTICIPANT_API_POOL_SIZE.
+        """
+        self.uri = uri.rstrip("/")
+        self.timeout = timeout
+        self._client = httpx.AsyncClient(
+            base_url=self.uri,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+        )
+
+    async def get(self, route: str, **kwargs: Any) -> httpx.Response:
+        """Sends a GET request to the participant.
+
+        Args:
+            route: Route of the API, e.g., "/".
+            kwargs: Additional arguments for the request.
+
+        Returns:
+            Response of the participant.
+        """
+        return await self._client.get(route, **kwargs)
+
+    async def post(
+        self, route: str, json: Dict[str, Any], **kwargs: Any
+    ) -> httpx.Response:
+        """Sends a POST request with a JSON body to the participant.
+
+        Args:
+            route: Route of the API, e.g., "/receive_utterance".
+            json: JSON body of the request.
+            kwargs: Additional arguments for the request.
+
+        Returns:
+            Response of the participant.
+        """
+        return await self._client.post(route, json=json, **kwargs)
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections."""
+        await self._client.aclose()
+
+
+_CLIENTS: Dict[str, ParticipantClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_participant_client(uri: str) -> ParticipantClient:
+    """Gets the synchronous client of a participant.
+
+    Clients are created once per URI and shared by all the callers.
+
+    Args:
+        uri: URI of the participant's API.
+
+    Returns:
+        Participant client.
+    """
+    uri = uri.rstrip("/")
+    with _CLIENTS_LOCK:
+        if uri not in _CLIENTS:
+            _CLIENTS[uri] = ParticipantClient(uri)
+        return _CLIENTS[uri]
+
+
+def close_participant_client(uri: str) -> None:
+    """Closes and forgets the client of a participant, if any.
+
+    Args:
+        uri: URI of the participant's API.
+    """
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.pop(uri.rstrip("/"), None)
+    if client:
+        client.close()
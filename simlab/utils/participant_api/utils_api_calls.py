@@ -1,22 +1,59 @@
 """Utility functions for making API calls to the participant service."""
 
+import os
+import threading
 import time
-from typing import Any, Dict
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
 
 import requests
 
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.participant.participant import DialogueParticipant
+from simlab.utils.participant_api.participant_client import (
+    AsyncParticipantClient,
+    get_participant_client,
+)
 from simlab.utils.participant_api.utils_response_parsing import (
     parse_API_response,
 )
 
 
+PARTICIPANT_READINESS_TIMEOUT = float(
+    os.environ.get("PARTICIPANT_READINESS_TIMEOUT", "300")
+)
+PARTICIPANT_READINESS_INITIAL_DELAY = float(
+    os.environ.get("PARTICIPANT_READINESS_INITIAL_DELAY", "0.05")
+)
+PARTICIPANT_READINESS_MAX_DELAY = float(
+    os.environ.get("PARTICIPANT_READINESS_MAX_DELAY", "2")
+)
+# Timeout of a single readiness request, a participant that accepts
+# connections may not answer while it is loading
+_READINESS_REQUEST_TIMEOUT = 5
+
+
+class ContextMode(Enum):
+    """Represents how the conversation context is sent to participants.
+
+    In full mode, every request contains the whole conversation history. In
+    delta mode, only the new utterance and the conversation ID are sent, the
+    participant is responsible for keeping the history of each conversation.
+    """
+
+    FULL = "full"
+    DELTA = "delta"
+
+
 def configure_participant(
     uri: str, id: str, parameters: Dict[str, Any]
-) -> None:
+) -> ContextMode:
     """Configures the participant with parameters.
 
+    The context modes supported by the platform are announced to the
+    participant, which can opt in to one of them in its response. Full
+    context is used if the participant does not choose a supported mode.
+
     Args:
         uri: URI of the participant's API.
         id: Participant's ID.
@@ -24,13 +61,31 @@ def configure_participant(
 
     Raises:
         RuntimeError: If the agent fails to configure.
+
+    Returns:
+        Context mode negotiated with the participant.
     """
-    r = requests.post(
-        f"{uri}/configure", json={"id": id, "parameters": parameters}
+    r = get_participant_client(uri).post(
+        "/configure",
+        json={
+            "id": id,
+            "parameters": parameters,
+            "context_modes": [mode.value for mode in ContextMode],
+        },
     )
     if r.status_code != 201:
         raise RuntimeError("Failed to configure the agent.")
 
+    try:
+        data = r.json()
+    except ValueError:
+        return ContextMode.FULL
+    # Legacy participants may answer with any body
+    context_mode = data.get("context_mode") if isinstance(data, dict) else None
+    if context_mode in [mode.value for mode in ContextMode]:
+        return ContextMode(context_mode)
+    return ContextMode.FULL
+
 
 def get_utterance_response(
     uri: str, request_data: Dict[str, Any], participant: DialogueParticipant
@@ -45,11 +100,44 @@ def get_utterance_response(
     Returns:
         Annotated utterance.
     """
-    r = requests.post(
-        f"{uri}/receive_utterance",
+    r = get_participant_client(uri).post(
+        "/receive_utterance",
         json=request_data,
     )
-    data = r.json()
+    return _to_annotated_utterance(r.json(), participant)
+
+
+async def get_utterance_response_async(
+    client: AsyncParticipantClient,
+    request_data: Dict[str, Any],
+    participant: DialogueParticipant,
+) -> AnnotatedUtterance:
+    """Gets participant's response to an utterance asynchronously.
+
+    Args:
+        client: Asynchronous client of the participant's API.
+        request_data: Data to send to the API.
+        participant: Dialogue participant.
+
+    Returns:
+        Annotated utterance.
+    """
+    r = await client.post("/receive_utterance", json=request_data)
+    return _to_annotated_utterance(r.json(), participant)
+
+
+def _to_annotated_utterance(
+    data: Dict[str, Any], participant: DialogueParticipant
+) -> AnnotatedUtterance:
+    """Converts a participant's API response to an annotated utterance.
+
+    Args:
+        data: Response of the API.
+        participant: Dialogue participant.
+
+    Returns:
+        Annotated utterance.
+    """
     (
         utterance_text,
         utterance_dialogue_acts,
@@ -68,23 +156,99 @@ def get_utterance_response(
 
 
 def wait_for_participant(
-    uri: str, max_retries: int = 10, delay: int = 5
-) -> bool:
+    uri: str,
+    readiness_path: Optional[str] = None,
+    health_status: Optional[Callable[[], Optional[str]]] = None,
+    stopped: Optional[threading.Event] = None,
+    timeout: float = PARTICIPANT_READINESS_TIMEOUT,
+    initial_delay: float = PARTICIPANT_READINESS_INITIAL_DELAY,
+    max_delay: float = PARTICIPANT_READINESS_MAX_DELAY,
+) -> float:
     """Waits for the participant to be ready.
 
+    Readiness is checked with an exponential backoff, from the initial delay
+    up to the maximum delay between checks. If a health status is provided,
+    e.g., from a Docker health check, the participant is ready once healthy.
+    Otherwise, it is ready once its readiness path answers with a success, or
+    once the root of its API answers without server error if there is no
+    readiness path.
+
+    Args:
+        uri: URI of the participant's API.
+        readiness_path: Route of the API answering with a success once the
+          participant is ready. Defaults to None.
+        health_status: Function returning the health status of the
+          participant, i.e., "starting", "healthy", or "unhealthy". Defaults
+          to None.
+        stopped: Event set if the participant stops, e.g., its container
+          dies, to fail without waiting for the timeout. Defaults to None.
+        timeout: Maximum time to wait in seconds. Defaults to
+          PARTICIPANT_READINESS_TIMEOUT.
+        initial_delay: Delay before the second check in seconds. Defaults to
+          PARTICIPANT_READINESS_INITIAL_DELAY.
+        max_delay: Maximum delay between checks in seconds. Defaults to
+          PARTICIPANT_READINESS_MAX_DELAY.
+
+    Raises:
+        RuntimeError: If the participant stops, is unhealthy, or is not ready
+          before the timeout.
+
+    Returns:
+        Time it took for the participant to be ready in seconds.
+    """
+    stopped = stopped or threading.Event()
+    start = time.monotonic()
+    delay = initial_delay
+    while not stopped.is_set():
+        if _is_participant_ready(uri, readiness_path, health_status):
+            return time.monotonic() - start
+
+        remaining = start + timeout - time.monotonic()
+        if remaining <= 0:
+            raise RuntimeError(
+                f"Participant is not ready after {timeout} seconds."
+            )
+        # Wakes up as soon as the participant stops
+        stopped.wait(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+    raise RuntimeError("Participant stopped before being ready.")
+
+
+def _is_participant_ready(
+    uri: str,
+    readiness_path: Optional[str] = None,
+    health_status: Optional[Callable[[], Optional[str]]] = None,
+) -> bool:
+    """Checks once whether the participant is ready.
+
     Args:
         uri: URI of the participant's API.
-        max_retries: Maximum number of retries.
-        delay: Delay between retries.
+        readiness_path: Route of the API answering with a success once the
+          participant is ready. Defaults to None.
+        health_status: Function returning the health status of the
+          participant. Defaults to None.
 
     Raises:
-        RuntimeError: If the participant is not ready.
+        RuntimeError: If the participant is unhealthy.
+
+    Returns:
+        True if the participant is ready, False otherwise.
     """
-    for _ in range(max_retries):
-        try:
-            requests.get(f"{uri}/")
-            return True
-        except requests.exceptions.ConnectionError:
-            pass
-        time.sleep(delay)
-    raise RuntimeError("Participant is not ready.")
+    if health_status is not None:
+        status = health_status()
+        if status == "unhealthy":
+            raise RuntimeError("Participant is unhealthy.")
+        return status == "healthy"
+
+    try:
+        r = get_participant_client(uri).get(
+            readiness_path or "/", timeout=_READINESS_REQUEST_TIMEOUT
+        )
+    except (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    ):
+        return False
+    if readiness_path:
+        return 200 <= r.status_code < 300
+    return r.status_code < 500
@@ -0,0 +1,86 @@
+"""Allocation of non-overlapping local port ranges.
+
+Each participant pair evaluated on a worker binds its containers to local
+ports. To run several pairs at the same time, every pair is given its own
+block of consecutive ports that no other pair can use until it is released.
+"""
+
+import threading
+from typing import List
+
+DEFAULT_BASE_PORT = 7000
+DEFAULT_BLOCK_SIZE = 20
+
+
+class PortAllocator:
+    def __init__(
+        self,
+        base_port: int = DEFAULT_BASE_PORT,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_port: int = 65535,
+    ) -> None:
+        """Initializes the port allocator.
+
+        Args:
+            base_port: First port that can be allocated. Defaults to
+              DEFAULT_BASE_PORT.
+            block_size: Number of consecutive ports per allocated range.
+              Defaults to DEFAULT_BLOCK_SIZE.
+            max_port: Last port that can be allocated. Defaults to 65535.
+
+        Raises:
+            ValueError: If the block size or the port boundaries are invalid.
+        """
+        if block_size < 1:
+            raise ValueError("Block size must be a positive integer.")
+        if base_port + block_size - 1 > max_port:
+            raise ValueError(
+                f"No block of {block_size} ports fits between {base_port} and "
+                f"{max_port}."
+            )
+        self.base_port = base_port
+        self.block_size = block_size
+        self.num_blocks = (max_port - base_port + 1) // block_size
+        self._free_blocks: List[int] = list(range(self.num_blocks))
+        self._lock = threading.Lock()
+
+    def allocate(self) -> range:
+        """Allocates a block of consecutive ports.
+
+        The lowest free block is always returned first.
+
+        Raises:
+            RuntimeError: If all the blocks are already allocated.
+
+        Returns:
+            Range of allocated ports.
+        """
+        with self._lock:
+            if not self._free_blocks:
+                raise RuntimeError("No free port range left to allocate.")
+            block = self._free_blocks.pop(0)
+        start = self.base_port + block * self.block_size
+        return range(start, start + self.block_size)
+
+    def release(self, ports: range) -> None:
+        """Releases a previously allocated block of ports.
+
+        Args:
+            ports: Range of ports returned by `allocate`.
+
+        Raises:
+            ValueError: If the range was not allocated by this allocator.
+        """
+        block, offset = divmod(ports.start - self.base_port, self.block_size)
+        if (
+            offset != 0
+            or len(ports) != self.block_size
+            or not 0 <= block < self.num_blocks
+        ):
+            raise ValueError(f"Port range {ports} was not allocated here.")
+
+        with self._lock:
+            if block in self._free_blocks:
+                raise ValueError(f"Port range {ports} is not allocated.")
+            self._free_blocks.append(block)
+            self._free_blocks.sort()
@@ -0,0 +1,47 @@
+"""Statistics on the time it takes for participant containers to be ready.
+
+The time between the start of a container and the readiness of its
+participant is recorded per image, to spot images that are slow to boot.
+"""
+
+import threading
+from typing import Any, Dict, List
+
+_TIMES_TO_READY: Dict[str, List[float]] = {}
+_TIMES_TO_READY_LOCK = threading.Lock()
+
+
+def record_time_to_ready(image: str, seconds: float) -> None:
+    """Records the time it took for a container of an image to be ready.
+
+    Args:
+        image: Image of the container.
+        seconds: Time to ready in seconds.
+    """
+    with _TIMES_TO_READY_LOCK:
+        _TIMES_TO_READY.setdefault(image, []).append(seconds)
+
+
+def get_time_to_ready_stats() -> List[Dict[str, Any]]:
+    """Gets the statistics of the times to ready recorded per image.
+
+    Returns:
+        Image, number of containers started, and mean and maximum time to
+        ready in seconds, for each image.
+    """
+    with _TIMES_TO_READY_LOCK:
+        return [
+            {
+                "image": image,
+                "count": len(times),
+                "mean": sum(times) / len(times),
+                "max": max(times),
+            }
+            for image, times in _TIMES_TO_READY.items()
+        ]
+
+
+def reset_time_to_ready_stats() -> None:
+    """Forgets the recorded times to ready."""
+    with _TIMES_TO_READY_LOCK:
+        _TIMES_TO_READY.clear()
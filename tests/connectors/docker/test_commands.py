@@ -0,0 +1,152 @@
+"""Tests for the Docker commands run through the SDK client."""
+
+import threading
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docker.errors import ImageNotFound
+
+from connectors.docker.commands import (
+    DockerRegistryMetadata,
+    clean_local_docker_registry,
+    docker_pull_image,
+    docker_run_container,
+    docker_stop_container,
+    watch_container_exit,
+)
+
+_DOCKER_METADATA = DockerRegistryMetadata(
+    registry_uri="localhost:5000", repository="simlab-systems"
+)
+_IMAGE_TAG = "localhost:5000/simlab-systems/agent:1"
+
+
+class _EventStream:
+    """Stream of container events, which ends once closed."""
+
+    def __init__(self, events: List[Dict[str, Any]]) -> None:
+        """Initializes the stream with the events of the container."""
+        self.events = events
+        self.closed = threading.Event()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yields the events, then waits for the stream to be closed."""
+        yield from self.events
+        self.closed.wait()
+
+    def close(self) -> None:
+        """Closes the stream."""
+        self.closed.set()
+
+
+@pytest.fixture
+def docker_client() -> MagicMock:
+    """Returns a mocked Docker client logged in to the registry."""
+    client = MagicMock()
+    client_patch = patch(
+        "connectors.docker.commands.get_docker_client", return_value=client
+    )
+    login_patch = patch("connectors.docker.commands.docker_login")
+    with client_patch, login_patch:
+        yield client
+
+
+def test_docker_pull_image_up_to_date(docker_client: MagicMock) -> None:
+    """Tests that an image with the remote digest is not pulled again."""
+    docker_client.images.get.return_value = MagicMock(
+        attrs={"RepoDigests": [f"{_IMAGE_TAG}@sha256:1"]}
+    )
+    docker_client.images.get_registry_data.return_value = MagicMock(
+        id="sha256:1"
+    )
+
+    assert docker_pull_image("agent:1", _DOCKER_METADATA) == _IMAGE_TAG
+    docker_client.images.get.assert_called_once_with(_IMAGE_TAG)
+    docker_client.images.pull.assert_not_called()
+
+
+def test_docker_pull_image_outdated(docker_client: MagicMock) -> None:
+    """Tests that an image with another remote digest is pulled."""
+    docker_client.images.get.return_value = MagicMock(
+        attrs={"RepoDigests": [f"{_IMAGE_TAG}@sha256:1"]}
+    )
+    docker_client.images.get_registry_data.return_value = MagicMock(
+        id="sha256:2"
+    )
+
+    assert docker_pull_image("agent:1", _DOCKER_METADATA) == _IMAGE_TAG
+    docker_client.images.pull.assert_called_once_with(
+        "localhost:5000/simlab-systems/agent", tag="1"
+    )
+
+
+def test_docker_run_container(docker_client: MagicMock) -> None:
+    """Tests that a missing image is pulled and the ports are bound."""
+    docker_client.images.get.side_effect = ImageNotFound("No such image")
+    docker_client.containers.run.return_value = MagicMock(id="container")
+
+    container_id = docker_run_container(
+        "agent:1", {"5000/tcp": 7000}, _DOCKER_METADATA
+    )
+
+    assert container_id == "container"
+    docker_client.images.pull.assert_called_once()
+    docker_client.containers.run.assert_called_once_with(
+        _IMAGE_TAG, detach=True, ports={"5000/tcp": 7000}
+    )
+
+
+def test_docker_stop_container(docker_client: MagicMock) -> None:
+    """Tests that a container is stopped, then removed."""
+    container = docker_client.containers.get.return_value
+
+    docker_stop_container("container")
+
+    docker_client.containers.get.assert_called_once_with("container")
+    assert [call[0] for call in container.method_calls] == ["stop", "remove"]
+
+
+def test_clean_local_docker_registry(docker_client: MagicMock) -> None:
+    """Tests that stopped containers and dangling images are pruned."""
+    docker_client.containers.prune.return_value = {
+        "ContainersDeleted": ["container"]
+    }
+    docker_client.images.prune.return_value = {"ImagesDeleted": None}
+
+    clean_local_docker_registry()
+
+    docker_client.containers.prune.assert_called_once_with()
+    docker_client.images.prune.assert_called_once_with(
+        filters={"dangling": True}
+    )
+
+
+def test_watch_container_exit(docker_client: MagicMock) -> None:
+    """Tests that the event is set when the container dies."""
+    stream = _EventStream(
+        [{"status": "start"}, {"status": "health_status"}, {"status": "die"}]
+    )
+    docker_client.events.return_value = stream
+
+    with watch_container_exit("container", since=10.0) as exited:
+        assert exited.wait(timeout=5)
+
+    assert stream.closed.is_set()
+    docker_client.events.assert_called_once_with(
+        decode=True,
+        since=10.0,
+        until=None,
+        filters={"type": "container", "container": ["container"]},
+    )
+
+
+def test_watch_container_exit_running(docker_client: MagicMock) -> None:
+    """Tests that the event is not set while the container is running."""
+    stream = _EventStream([{"status": "start"}])
+    docker_client.events.return_value = stream
+
+    with watch_container_exit("container") as exited:
+        assert not exited.wait(timeout=0.1)
+
+    assert stream.closed.is_set()
@@ -0,0 +1,131 @@
+"""Tests for the disk-budgeted cache of participant images."""
+
+import itertools
+from typing import Dict, List, Tuple
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docker.errors import APIError, ImageNotFound
+
+from connectors.docker.image_cache import ImageCache
+
+# Image ID and size of each local image tag
+_IMAGES: Dict[str, Tuple[str, int]] = {
+    "agent:1": ("sha256:agent", 300),
+    "user:1": ("sha256:user", 200),
+    "user:latest": ("sha256:user", 200),
+    "baseline:1": ("sha256:baseline", 100),
+}
+
+
+def _get_image(image_tag: str) -> MagicMock:
+    """Simulates the inspection of a local image."""
+    if image_tag not in _IMAGES:
+        raise ImageNotFound(f"No such image: {image_tag}")
+    image_id, size = _IMAGES[image_tag]
+    return MagicMock(id=image_id, attrs={"Size": size})
+
+
+@pytest.fixture
+def docker_client() -> MagicMock:
+    """Returns a mocked Docker client."""
+    client = MagicMock()
+    client.images.get.side_effect = _get_image
+    with patch(
+        "connectors.docker.image_cache.get_docker_client", return_value=client
+    ):
+        yield client
+
+
+@pytest.fixture
+def image_cache(docker_client: MagicMock, tmp_path) -> ImageCache:
+    """Returns a cache in which images were used one after the other."""
+    cache = ImageCache(str(tmp_path / "image_cache.sqlite"))
+    with patch("connectors.docker.image_cache.time") as mocked_time:
+        mocked_time.time.side_effect = itertools.count()
+        for image_tag in ["agent:1", "user:1", "user:latest", "baseline:1"]:
+            cache.record_use([image_tag])
+    yield cache
+    cache.close()
+
+
+def _removed_tags(docker_client: MagicMock) -> List[str]:
+    """Returns the tags of the images removed."""
+    return [call.args[0] for call in docker_client.images.remove.call_args_list]
+
+
+def test_total_size(image_cache: ImageCache) -> None:
+    """Tests that tags of the same image are counted once."""
+    assert image_cache.total_size() == 600
+
+
+def test_record_use_missing_image(
+    image_cache: ImageCache, docker_client: MagicMock
+) -> None:
+    """Tests that images missing locally are not cached."""
+    image_cache.record_use(["missing:1"])
+
+    assert image_cache.total_size() == 600
+    assert image_cache.evict(budget=0) == [
+        "agent:1",
+        "user:1",
+        "user:latest",
+        "baseline:1",
+    ]
+
+
+def test_evict_within_budget(
+    image_cache: ImageCache, docker_client: MagicMock
+) -> None:
+    """Tests that nothing is removed while the budget is met."""
+    assert image_cache.evict(budget=600) == []
+    docker_client.images.remove.assert_not_called()
+
+
+def test_evict_least_recently_used(
+    image_cache: ImageCache, docker_client: MagicMock
+) -> None:
+    """Tests that the least recently used images are removed first."""
+    assert image_cache.evict(budget=350) == ["agent:1"]
+    assert image_cache.total_size() == 300
+
+    # The image is only freed once all its tags are removed
+    assert image_cache.evict(budget=250) == ["user:1", "user:latest"]
+    assert image_cache.total_size() == 100
+    assert _removed_tags(docker_client) == [
+        "agent:1",
+        "user:1",
+        "user:latest",
+    ]
+
+
+def test_evict_image_in_use(
+    image_cache: ImageCache, docker_client: MagicMock
+) -> None:
+    """Tests that images that cannot be removed are skipped."""
+
+    def remove(image_tag: str) -> None:
+        if image_tag == "agent:1":
+            raise APIError("conflict: image is being used")
+
+    docker_client.images.remove.side_effect = remove
+
+    assert image_cache.evict(budget=350) == [
+        "user:1",
+        "user:latest",
+        "baseline:1",
+    ]
+    # The skipped image is kept in the cache and evicted later
+    assert image_cache.total_size() == 300
+    docker_client.images.remove.side_effect = None
+    assert image_cache.evict(budget=0) == ["agent:1"]
+
+
+def test_evict_image_already_removed(
+    image_cache: ImageCache, docker_client: MagicMock
+) -> None:
+    """Tests that images removed by someone else count as freed."""
+    docker_client.images.remove.side_effect = ImageNotFound("No such image")
+
+    assert image_cache.evict(budget=350) == ["agent:1"]
+    assert image_cache.total_size() == 300
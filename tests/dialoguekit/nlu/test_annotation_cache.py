@@ -0,0 +1,130 @@
+"""Tests for the persistent cache of utterance annotations."""
+
+import itertools
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.intent import Intent
+from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.annotation_cache import AnnotationCache
+from dialoguekit.nlu.dialogue_acts_extractor import DialogueActsExtractor
+from dialoguekit.nlu.models.satisfaction_classifier import (
+    SatisfactionClassifierSVM,
+)
+from dialoguekit.nlu.nlu import NLU
+from dialoguekit.participant.participant import DialogueParticipant
+
+
+@pytest.fixture
+def annotation_cache(tmp_path) -> AnnotationCache:
+    """Returns an empty annotation cache."""
+    cache = AnnotationCache(str(tmp_path / "annotations.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_get_set(annotation_cache: AnnotationCache) -> None:
+    """Tests that annotations are cached per component and participant."""
+    annotation_cache.set("extractor", "Hello", ["greet"], "USER")
+
+    assert annotation_cache.get("extractor", "Hello", "USER") == ["greet"]
+    assert annotation_cache.get("extractor", "Hello", "AGENT") is None
+    assert annotation_cache.get("other_extractor", "Hello", "USER") is None
+    assert annotation_cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_get_many(annotation_cache: AnnotationCache) -> None:
+    """Tests looking up more entries than fit in a single query."""
+    annotation_cache.set_many(
+        "extractor", {(str(i), "USER"): i for i in range(0, 1000, 2)}
+    )
+
+    found = annotation_cache.get_many(
+        "extractor", [(str(i), "USER") for i in range(1000)] * 2
+    )
+
+    assert found == {(str(i), "USER"): i for i in range(0, 1000, 2)}
+    # Duplicate keys are looked up once
+    assert annotation_cache.stats() == {"hits": 500, "misses": 500}
+
+
+def test_evict_least_recently_used(tmp_path) -> None:
+    """Tests that the least recently accessed entries are evicted first."""
+    with patch("dialoguekit.nlu.annotation_cache.time") as mocked_time:
+        mocked_time.time.side_effect = itertools.count()
+        cache = AnnotationCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+        cache.set("extractor", "first", 1)
+        cache.set("extractor", "second", 2)
+        # Reading an entry makes it the most recently used
+        assert cache.get("extractor", "first") == 1
+
+        cache.set("extractor", "third", 3)
+
+    assert len(cache) == 2
+    assert cache.get("extractor", "second") is None
+    assert cache.get("extractor", "first") == 1
+    assert cache.get("extractor", "third") == 3
+    cache.close()
+
+
+def test_nlu_round_trip(annotation_cache: AnnotationCache) -> None:
+    """Tests that the NLU only extracts the dialogue acts not cached."""
+    dialogue_acts = [
+        DialogueAct(
+            Intent("disclose"),
+            [SlotValueAnnotation("genre", "action", 7, 13)],
+        )
+    ]
+    extractor = MagicMock(spec=DialogueActsExtractor)
+    extractor.fingerprint.return_value = "extractor"
+    extractor.extract_dialogue_acts_batch.side_effect = lambda utterances: [
+        dialogue_acts for _ in utterances
+    ]
+    nlu = NLU(extractor, annotation_cache=annotation_cache)
+    user_utterance = Utterance("I like action", DialogueParticipant.USER)
+    agent_utterance = Utterance("I like action", DialogueParticipant.AGENT)
+
+    first = nlu.extract_dialogue_acts_batch([user_utterance])
+    second = nlu.extract_dialogue_acts_batch([user_utterance, agent_utterance])
+
+    assert first == [dialogue_acts]
+    assert second == [dialogue_acts, dialogue_acts]
+    # The same text from another participant is extracted separately
+    assert [
+        call.args[0]
+        for call in extractor.extract_dialogue_acts_batch.call_args_list
+    ] == [[user_utterance], [agent_utterance]]
+
+
+def test_satisfaction_classifier_round_trip(
+    annotation_cache: AnnotationCache,
+) -> None:
+    """Tests that cached satisfaction classifications are reused."""
+    classifier = SatisfactionClassifierSVM(annotation_cache=annotation_cache)
+    texts = ["Thanks, that is great!", "That is not what I asked."]
+    classifier._load()
+    expected = classifier._predict(texts)
+
+    assert classifier.classify_text(texts) == expected
+    with patch.object(classifier, "_predict") as mocked_predict:
+        assert classifier.classify_text(texts) == expected
+    mocked_predict.assert_not_called()
+    assert annotation_cache.stats()["hits"] == 2
+
+
+def test_evict_every_few_inserts(tmp_path) -> None:
+    """Tests that the size bound is checked every few inserts."""
+    cache = AnnotationCache(str(tmp_path / "cache.sqlite"), max_entries=300)
+    cache.set_many("extractor", {(str(i), "USER"): i for i in range(301)})
+    assert len(cache) == 300
+
+    # The bound is checked every 3 inserts for 300 entries
+    cache.set("extractor", "first", 1)
+    cache.set("extractor", "second", 2)
+    assert len(cache) == 302
+    cache.set("extractor", "third", 3)
+    assert len(cache) == 300
+    cache.close()
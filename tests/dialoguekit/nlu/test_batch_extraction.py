@@ -0,0 +1,110 @@
+"""Tests that batched dialogue act extraction matches single utterances."""
+
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from dialoguekit.core.intent import Intent
+from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.annotation_cache import AnnotationCache
+from dialoguekit.nlu.disjoint_dialogue_act_extractor import (
+    DisjointDialogueActExtractor,
+)
+from dialoguekit.nlu.models.intent_classifier_cosine import (
+    IntentClassifierCosine,
+)
+from dialoguekit.nlu.nlu import NLU
+from dialoguekit.nlu.slot_value_annotator import SlotValueAnnotator
+from dialoguekit.participant.participant import DialogueParticipant
+
+_TRAINING_DATA = [
+    ("Hello there", "greet"),
+    ("I like action movies", "disclose"),
+    ("I would like a comedy", "disclose"),
+    ("Can you recommend something", "elicit"),
+    ("That sounds great", "accept"),
+    ("I do not like that one", "reject"),
+    ("Goodbye", "bye"),
+]
+
+
+def _genre_annotations(utterance: Utterance) -> List[SlotValueAnnotation]:
+    """Annotates the genres mentioned in an utterance."""
+    return [
+        SlotValueAnnotation("genre", genre, start, start + len(genre))
+        for genre in ("action", "comedy")
+        for start in [utterance.text.find(genre)]
+        if start >= 0
+    ]
+
+
+@pytest.fixture
+def extractor() -> DisjointDialogueActExtractor:
+    """Returns an extractor with a cosine intent classifier."""
+    intents = [Intent(label) for _, label in _TRAINING_DATA]
+    classifier = IntentClassifierCosine(intents)
+    classifier.train_model(
+        [
+            Utterance(text, DialogueParticipant.USER)
+            for text, _ in _TRAINING_DATA
+        ],
+        intents,
+    )
+    slot_annotator = MagicMock(spec=SlotValueAnnotator)
+    slot_annotator.get_annotations.side_effect = _genre_annotations
+    slot_annotator.fingerprint.return_value = "genre"
+    return DisjointDialogueActExtractor(classifier, [slot_annotator])
+
+
+@pytest.fixture
+def utterances() -> List[Utterance]:
+    """Returns utterances of both participants, including duplicates."""
+    return [
+        Utterance("Hello", DialogueParticipant.AGENT),
+        Utterance("I like comedy movies", DialogueParticipant.USER),
+        Utterance("Can you recommend an action one", DialogueParticipant.USER),
+        Utterance("I like comedy movies", DialogueParticipant.USER),
+        Utterance("Great, goodbye", DialogueParticipant.USER),
+        Utterance("I like comedy movies", DialogueParticipant.AGENT),
+    ]
+
+
+def test_classify_intents(
+    extractor: DisjointDialogueActExtractor, utterances: List[Utterance]
+) -> None:
+    """Tests that intents classified at once match one by one."""
+    classifier = extractor._intent_classifier
+
+    assert classifier.classify_intents(utterances) == [
+        classifier.classify_intent(utterance) for utterance in utterances
+    ]
+
+
+def test_disjoint_extract_dialogue_acts_batch(
+    extractor: DisjointDialogueActExtractor, utterances: List[Utterance]
+) -> None:
+    """Tests that the batched extraction matches single utterances."""
+    assert extractor.extract_dialogue_acts_batch(utterances) == [
+        extractor.extract_dialogue_acts(utterance) for utterance in utterances
+    ]
+
+
+def test_nlu_extract_dialogue_acts_batch(
+    extractor: DisjointDialogueActExtractor,
+    utterances: List[Utterance],
+    tmp_path,
+) -> None:
+    """Tests that the cached batched extraction matches single utterances."""
+    expected = [
+        extractor.extract_dialogue_acts(utterance) for utterance in utterances
+    ]
+    cache = AnnotationCache(str(tmp_path / "annotations.sqlite"))
+    nlu = NLU(extractor, annotation_cache=cache)
+
+    # Some of the utterances are cached before the batch
+    assert nlu.extract_dialogue_acts(utterances[1]) == expected[1]
+    assert nlu.extract_dialogue_acts_batch(utterances) == expected
+    assert nlu.extract_dialogue_acts_batch(utterances) == expected
+    cache.close()
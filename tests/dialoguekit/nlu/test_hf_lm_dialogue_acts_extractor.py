@@ -0,0 +1,67 @@
+"""Tests for the memoized generation of the LM dialogue acts extractor."""
+
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu import hf_lm_dialogue_acts_extractor
+from dialoguekit.nlu.hf_lm_dialogue_acts_extractor import (
+    LMDialogueActsExtractor,
+)
+from dialoguekit.participant.participant import DialogueParticipant
+
+
+@pytest.fixture
+def generator() -> Iterator[MagicMock]:
+    """Returns a text generation pipeline answering with a fixed intent."""
+
+    def generate(
+        inputs: List[List[Dict[str, str]]], **kwargs: Any
+    ) -> List[List[Dict[str, Any]]]:
+        return [
+            [
+                {
+                    "generated_text": messages
+                    + [{"role": "assistant", "content": "inform()"}]
+                }
+            ]
+            for messages in inputs
+        ]
+
+    registry = MagicMock()
+    registry.acquire.return_value = MagicMock(side_effect=generate)
+    registry_patch = patch.object(
+        hf_lm_dialogue_acts_extractor,
+        "get_model_registry",
+        return_value=registry,
+    )
+    memo_patch = patch.dict(hf_lm_dialogue_acts_extractor._OUTPUT_MEMO)
+    with registry_patch, memo_patch:
+        hf_lm_dialogue_acts_extractor._OUTPUT_MEMO.clear()
+        yield registry.acquire.return_value
+
+
+def _extractor(max_new_tokens: int) -> LMDialogueActsExtractor:
+    """Returns an extractor with the given generation length."""
+    return LMDialogueActsExtractor(
+        "Extract dialogue acts.",
+        ["inform"],
+        ["genre"],
+        model="stub",
+        max_new_tokens=max_new_tokens,
+    )
+
+
+def test_generate_memoized(generator: MagicMock) -> None:
+    """Tests that outputs are reused for the same generation settings."""
+    utterance = Utterance("I like comedies.", DialogueParticipant.USER)
+
+    _extractor(16).extract_dialogue_acts(utterance)
+    _extractor(16).extract_dialogue_acts(utterance)
+    assert generator.call_count == 1
+
+    _extractor(32).extract_dialogue_acts(utterance)
+    assert generator.call_count == 2
+    assert generator.call_args.kwargs["max_new_tokens"] == 32
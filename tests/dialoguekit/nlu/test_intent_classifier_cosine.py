@@ -0,0 +1,117 @@
+"""Tests for the intent classifier based on cosine similarity."""
+
+from typing import List
+
+import numpy as np
+import pytest
+from joblib import dump
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from dialoguekit.core.intent import Intent
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.models.intent_classifier_cosine import (
+    IntentClassifierCosine,
+)
+from dialoguekit.participant.participant import DialogueParticipant
+
+_TRAINING_DATA = [
+    ("Hello there", "greet"),
+    ("Hi, how are you", "greet"),
+    ("I like action movies", "disclose"),
+    ("I would like a comedy with action", "disclose"),
+    ("Can you recommend a movie", "elicit"),
+    ("What movie do you recommend", "elicit"),
+    ("That sounds great, I will watch it", "accept"),
+    ("I do not like that movie", "reject"),
+    ("Goodbye, thanks", "bye"),
+]
+_TEST_TEXTS = [
+    "hello",
+    "any comedy movie you recommend",
+    "I like that, thanks",
+    "not that one",
+    "action movies are great",
+    "unknown words only",
+]
+
+
+def _utterances(texts: List[str]) -> List[Utterance]:
+    """Creates user utterances from texts."""
+    return [Utterance(text, DialogueParticipant.USER) for text in texts]
+
+
+@pytest.fixture
+def classifier() -> IntentClassifierCosine:
+    """Returns a classifier trained on a few utterances."""
+    labels = [Intent(label) for _, label in _TRAINING_DATA]
+    classifier = IntentClassifierCosine(labels)
+    classifier.train_model(
+        _utterances([text for text, _ in _TRAINING_DATA]), labels
+    )
+    return classifier
+
+
+def _dense_cosine_predictions(texts: List[str]) -> List[Intent]:
+    """Predicts intents with cosine similarities of dense TF-IDF vectors."""
+    vectorizer = TfidfVectorizer()
+    train = vectorizer.fit_transform(
+        [text for text, _ in _TRAINING_DATA]
+    ).toarray()
+    test = vectorizer.transform(texts).toarray()
+    norms = (
+        np.linalg.norm(train, axis=1) * np.linalg.norm(test, axis=1)[:, None]
+    )
+    similarities = np.divide(
+        test @ train.T,
+        norms,
+        out=np.zeros((len(texts), len(train))),
+        where=norms > 0,
+    )
+    return [Intent(_TRAINING_DATA[i][1]) for i in similarities.argmax(axis=1)]
+
+
+def test_classify_intents(classifier: IntentClassifierCosine) -> None:
+    """Tests that predictions match a dense cosine similarity reference."""
+    predictions = classifier.classify_intents(_utterances(_TEST_TEXTS))
+
+    assert predictions == _dense_cosine_predictions(_TEST_TEXTS)
+    assert [
+        classifier.classify_intent(utterance)
+        for utterance in _utterances(_TEST_TEXTS)
+    ] == predictions
+
+
+def test_save_load(classifier: IntentClassifierCosine, tmp_path) -> None:
+    """Tests that a saved model gives the same predictions when loaded."""
+    path = str(tmp_path / "model")
+    classifier.save_model(path)
+    loaded = IntentClassifierCosine([])
+    loaded.load_model(path)
+
+    utterances = _utterances(_TEST_TEXTS)
+    assert loaded.classify_intents(utterances) == classifier.classify_intents(
+        utterances
+    )
+    assert loaded.fingerprint() == classifier.fingerprint()
+
+
+def test_load_legacy_format(
+    classifier: IntentClassifierCosine, tmp_path
+) -> None:
+    """Tests loading a model saved in three files by earlier versions."""
+    path = str(tmp_path / "model")
+    # Earlier versions saved the matrix without normalizing its rows
+    dump(
+        classifier._tfidf_matrix.toarray() * 3.0,
+        f"{path}_matrix.joblib",
+    )
+    dump(classifier._tfidf_vectorizer, f"{path}_vectorizer.joblib")
+    dump(classifier._labels, f"{path}_labels.joblib")
+    loaded = IntentClassifierCosine([])
+    loaded.load_model(path)
+
+    utterances = _utterances(_TEST_TEXTS)
+    assert loaded.classify_intents(utterances) == classifier.classify_intents(
+        utterances
+    )
+    assert loaded.fingerprint() is not None
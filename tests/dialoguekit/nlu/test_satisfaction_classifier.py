@@ -0,0 +1,98 @@
+"""Tests for the satisfaction classifier."""
+
+from typing import List
+
+import pytest
+
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.nlu.models.satisfaction_classifier import (
+    SatisfactionClassifier,
+    SatisfactionClassifierSVM,
+)
+from dialoguekit.participant.participant import DialogueParticipant
+
+_DIALOGUES = [
+    [
+        "Hi, I am looking for a movie to watch tonight.",
+        "Sure, what genre do you like?",
+        "I love science fiction, especially space movies.",
+        "You might enjoy Interstellar.",
+        "I have already seen it, and I did not like it at all.",
+        "How about Arrival?",
+        "Great, thanks a lot! That is exactly what I wanted.",
+    ],
+    [],
+    ["This is useless, you never understand what I ask."],
+    [
+        "Can you recommend a comedy?",
+        "I am sorry, I did not understand.",
+        "A comedy. A funny movie.",
+        "I am sorry, I did not understand.",
+        "Forget it, this is terrible.",
+    ],
+]
+
+
+def _dialogue(conversation_id: str, texts: List[str]) -> Dialogue:
+    """Creates a dialogue alternating user and agent utterances.
+
+    Args:
+        conversation_id: Conversation ID.
+        texts: Texts of the utterances.
+
+    Returns:
+        Dialogue.
+    """
+    dialogue = Dialogue("agent", "user", conversation_id)
+    for i, text in enumerate(texts):
+        participant = (
+            DialogueParticipant.USER
+            if i % 2 == 0
+            else DialogueParticipant.AGENT
+        )
+        dialogue.add_utterance(Utterance(text, participant))
+    return dialogue
+
+
+@pytest.fixture(scope="module")
+def classifier() -> SatisfactionClassifierSVM:
+    """Returns the bundled SVM classifier, without annotation cache."""
+    classifier = SatisfactionClassifierSVM()
+    classifier._annotation_cache = None
+    return classifier
+
+
+def test_classify_prefixes(classifier: SatisfactionClassifierSVM) -> None:
+    """Tests that cumulative sums of counts match each prefix classified."""
+    dialogues = [_dialogue(str(i), texts) for i, texts in enumerate(_DIALOGUES)]
+
+    trajectories = classifier.classify_prefixes(dialogues)
+
+    assert classifier._is_additive()
+    assert trajectories == [
+        [
+            classifier.classify_last_n_dialogue(
+                _dialogue(str(i), texts[: j + 1])
+            )
+            for j in range(len(texts))
+        ]
+        for i, texts in enumerate(_DIALOGUES)
+    ]
+    # The joined prefix texts are classified the same way
+    assert trajectories == SatisfactionClassifier.classify_prefixes(
+        classifier, dialogues
+    )
+
+
+def test_classify_dialogues(classifier: SatisfactionClassifierSVM) -> None:
+    """Tests that dialogues classified at once match one by one."""
+    dialogues = [
+        _dialogue(str(i), texts) for i, texts in enumerate(_DIALOGUES) if texts
+    ]
+
+    for last_n in (None, 1, 2):
+        assert classifier.classify_dialogues(dialogues, last_n) == [
+            classifier.classify_last_n_dialogue(dialogue, last_n)
+            for dialogue in dialogues
+        ]
@@ -0,0 +1,63 @@
+"""Tests for reading dialogue exports."""
+
+import io
+import json
+
+import pytest
+
+from dialoguekit.utils.dialogue_reader import _iter_json_array
+
+_ELEMENTS = [
+    {"conversation_id": "1", "conversation": [{"utterance": "Hi, [there]"}]},
+    {"conversation_id": "2", "text": 'a "quoted" {brace}', "score": 12345},
+    {"conversation_id": "3", "nested": {"list": [1, 2.5, None, True]}},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_iter_json_array_split_elements(chunk_size: int) -> None:
+    """Tests that elements and strings split across reads are decoded."""
+    f = io.StringIO(json.dumps(_ELEMENTS, indent=2))
+
+    assert list(_iter_json_array(f, chunk_size=chunk_size)) == _ELEMENTS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_iter_json_array_separators(chunk_size: int) -> None:
+    """Tests whitespace and commas between elements, and numbers split."""
+    f = io.StringIO('  \n [ {"a": 1}\n\t,  {"b": [2]} ,\n123456 , "x"  ]\n ')
+
+    assert list(_iter_json_array(f, chunk_size=chunk_size)) == [
+        {"a": 1},
+        {"b": [2]},
+        123456,
+        "x",
+    ]
+
+
+@pytest.mark.parametrize("content", ["[]", "  [ \n ]  "])
+def test_iter_json_array_empty(content: str) -> None:
+    """Tests that an empty array yields no elements."""
+    assert list(_iter_json_array(io.StringIO(content), chunk_size=1)) == []
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '[{"a": 1}, {"b": ',
+        '[{"a": 1}, {"b": "unterminated',
+        '[{"a": 1}',
+        '[{"a": 1},',
+        "[12",
+    ],
+)
+def test_iter_json_array_truncated(content: str) -> None:
+    """Tests that a truncated array raises instead of ending early."""
+    with pytest.raises(json.JSONDecodeError):
+        list(_iter_json_array(io.StringIO(content), chunk_size=2))
+
+
+def test_iter_json_array_not_array() -> None:
+    """Tests that a file without JSON array is rejected."""
+    with pytest.raises(ValueError):
+        list(_iter_json_array(io.StringIO('  {"a": 1}'), chunk_size=1))
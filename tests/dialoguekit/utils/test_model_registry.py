@@ -0,0 +1,117 @@
+"""Tests for the registry of loaded models."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from dialoguekit.utils.model_registry import ModelRegistry
+
+_KEY = ("text-generation", "model", "cpu", "None")
+
+
+def test_acquire_shared() -> None:
+    """Tests that a model is loaded once and reference counted."""
+    registry = ModelRegistry()
+    loader = MagicMock(return_value=object())
+
+    first = registry.acquire("text-generation", "model", loader, "cpu")
+    second = registry.acquire("text-generation", "model", loader, "cpu")
+
+    assert first is second
+    loader.assert_called_once()
+    assert registry.refcount("text-generation", "model", "cpu") == 2
+    # Models on other devices are loaded separately
+    registry.acquire("text-generation", "model", loader, "cuda")
+    assert loader.call_count == 2
+
+
+def test_acquire_concurrent() -> None:
+    """Tests that concurrent acquisitions wait for a single load."""
+    registry = ModelRegistry()
+
+    def load() -> object:
+        time.sleep(0.05)
+        return object()
+
+    loader = MagicMock(side_effect=load)
+    models = []
+    threads = [
+        threading.Thread(
+            target=lambda: models.append(
+                registry.acquire("text-generation", "model", loader, "cpu")
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    loader.assert_called_once()
+    assert len(models) == 4 and all(model is models[0] for model in models)
+    assert registry.refcount("text-generation", "model", "cpu") == 4
+
+
+def test_acquire_failed_loader() -> None:
+    """Tests that a failed load leaves no reference and can be retried."""
+    registry = ModelRegistry()
+    loader = MagicMock(side_effect=[RuntimeError("out of memory"), "model"])
+
+    with pytest.raises(RuntimeError):
+        registry.acquire("text-generation", "model", loader, "cpu")
+
+    assert registry.refcount("text-generation", "model", "cpu") == 0
+    assert _KEY not in registry
+    assert registry.acquire("text-generation", "model", loader, "cpu") == (
+        "model"
+    )
+    assert registry.refcount("text-generation", "model", "cpu") == 1
+
+
+def test_release() -> None:
+    """Tests that released models are kept until evicted."""
+    registry = ModelRegistry()
+    registry.acquire("text-generation", "model", lambda: "model", "cpu")
+    registry.acquire("text-generation", "other", lambda: "other", "cpu")
+
+    registry.release("text-generation", "model", "cpu")
+
+    assert registry.refcount("text-generation", "model", "cpu") == 0
+    assert _KEY in registry
+    # Only the models without references are evicted
+    assert registry.evict_unused() == 1
+    assert _KEY not in registry
+    assert ("text-generation", "other", "cpu", "None") in registry
+    assert registry.evict_unused() == 0
+
+
+def test_release_evict_on_release() -> None:
+    """Tests that models are dropped with their last reference."""
+    registry = ModelRegistry(evict_on_release=True)
+    loader = MagicMock(return_value=object())
+    registry.acquire("text-generation", "model", loader, "cpu")
+    registry.acquire("text-generation", "model", loader, "cpu")
+
+    registry.release("text-generation", "model", "cpu")
+    assert _KEY in registry
+    registry.release("text-generation", "model", "cpu")
+
+    assert _KEY not in registry
+    # The model is loaded again when acquired anew
+    registry.acquire("text-generation", "model", loader, "cpu")
+    assert loader.call_count == 2
+
+
+def test_release_not_acquired() -> None:
+    """Tests that releasing a model more than acquired is rejected."""
+    registry = ModelRegistry()
+    with pytest.raises(ValueError):
+        registry.release("text-generation", "model", "cpu")
+
+    registry.acquire("text-generation", "model", lambda: "model", "cpu")
+    registry.release("text-generation", "model", "cpu")
+    with pytest.raises(ValueError):
+        registry.release("text-generation", "model", "cpu")
@@ -47,7 +47,12 @@ def metric(dialogues: List[Dialogue]) -> Mock:
     mocked_metric = Mock(spec=Metric)
     mocked_metric.name = "mocked_metric"
     mocked_metric.evaluate_dialogue.return_value = 1
-    mocked_metric.evaluate_dialogues.return_value = [1 for _ in dialogues]
+    mocked_metric.required_fields = None
+    mocked_metric.requires_torch = False
+    mocked_metric.preprocessing_stages = []
+    mocked_metric.evaluate_dialogues.side_effect = lambda dialogues, **_: [
+        1 for _ in dialogues
+    ]
     return mocked_metric
 
 
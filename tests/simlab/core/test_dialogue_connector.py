@@ -7,9 +7,15 @@ import pytest
 
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.participant.participant import DialogueParticipant
+from dialoguekit.utils.dialogue_reader import json_to_dialogues
 from simlab.core.dialogue_connector import SimulationDialogueConnector
 from simlab.participant.wrapper_agent import WrapperAgent
 from simlab.participant.wrapper_user_simulator import WrapperUserSimulator
+from simlab.utils.dialogue_writer import close_dialogue_writer
+
+_EXPORT_PATH = (
+    "tests/simlab/data/dialogue_export/test_agent_test_user_simulator.jsonl"
+)
 
 
 @pytest.fixture
@@ -55,12 +61,19 @@ def test_dump_dialogue_history(
 
     assert not os.path.exists("tests/simlab/data/dialogue_export/")
     dialogue_connector._dump_dialogue_history()
-    assert os.path.exists(
-        "tests/simlab/data/dialogue_export/test_agent_test_user_simulator.json"
+    dialogue_connector.register_agent_utterance(
+        AnnotatedUtterance("Bye", DialogueParticipant.AGENT)
     )
+    dialogue_connector._dump_dialogue_history()
+    close_dialogue_writer(_EXPORT_PATH)
+    assert os.path.exists(_EXPORT_PATH)
+
+    # Each dialogue is appended as a new line
+    dialogues = json_to_dialogues(_EXPORT_PATH)
+    assert len(dialogues) == 2
+    assert [u.text for u in dialogues[0].utterances] == ["Hello", "Hi"]
+    assert [u.text for u in dialogues[1].utterances] == ["Bye"]
 
     # Clean up
-    os.remove(
-        "tests/simlab/data/dialogue_export/test_agent_test_user_simulator.json"
-    )
+    os.remove(_EXPORT_PATH)
     os.rmdir("tests/simlab/data/dialogue_export/")
@@ -0,0 +1,49 @@
+"""Tests for the evaluation cache and metric fingerprints."""
+
+from typing import List
+from unittest.mock import MagicMock
+
+from dialoguekit.core.dialogue import Dialogue
+from simlab.metrics.evaluation_cache import (
+    SQLiteEvaluationCache,
+    hash_dialogue,
+)
+from simlab.metrics.metric import Metric
+
+
+class ConstantMetric(Metric):
+    def __init__(self, value: float, name: str = "constant") -> None:
+        """Initializes a metric giving the same score to all dialogues."""
+        super().__init__(name)
+        self.value = value
+
+    def evaluate_dialogue(self, dialogue: Dialogue) -> float:
+        """Evaluates a dialogue."""
+        return self.value
+
+
+def test_metric_fingerprint() -> None:
+    """Tests that fingerprints depend on the constructor arguments."""
+    assert ConstantMetric(1).fingerprint() == ConstantMetric(1).fingerprint()
+    assert ConstantMetric(1).fingerprint() != ConstantMetric(2).fingerprint()
+    assert (
+        ConstantMetric(1).fingerprint()
+        != ConstantMetric(1, name="other").fingerprint()
+    )
+    assert ConstantMetric(MagicMock(fingerprint=None)).fingerprint() is None
+
+
+def test_sqlite_evaluation_cache(dialogues: List[Dialogue], tmp_path) -> None:
+    """Tests that scores are persisted per metric and dialogue."""
+    path = str(tmp_path / "cache.sqlite")
+    hashes = [hash_dialogue(dialogue) for dialogue in dialogues]
+    assert len(set(hashes)) == len(dialogues)
+
+    cache = SQLiteEvaluationCache(path)
+    cache.set_many("metric", {hashes[0]: 0.5})
+    cache.close()
+
+    cache = SQLiteEvaluationCache(path)
+    assert cache.get_many("metric", hashes) == {hashes[0]: 0.5}
+    assert cache.get_many("other_metric", hashes) == {}
+    cache.close()
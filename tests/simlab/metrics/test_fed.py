@@ -0,0 +1,169 @@
+"""Tests for the scoring of FED examples."""
+
+from typing import List
+from unittest.mock import patch
+
+import pytest
+import torch
+import torch.nn.functional as F
+from transformers import GPT2Config, GPT2LMHeadModel
+
+from simlab.metrics.discourse import fed
+from simlab.metrics.discourse.fed import _MAX_INPUT_LENGTH, FEDScorer
+
+_VOCAB_SIZE = 64
+
+
+class _Tokenizer:
+    """Tokenizer of space-separated token IDs."""
+
+    eos_token_id = 0
+
+    def tokenize(self, text: str) -> List[str]:
+        """Splits a text on whitespace."""
+        return text.split()
+
+    def convert_tokens_to_ids(self, tokens: List[str]) -> List[int]:
+        """Converts tokens to IDs, the end of utterance token being 0."""
+        return [
+            0 if token == "<|endoftext|>" else int(token) for token in tokens
+        ]
+
+
+@pytest.fixture(scope="module")
+def scorer() -> FEDScorer:
+    """Returns a scorer with a tiny randomly initialized GPT-2 model."""
+    torch.manual_seed(0)
+    model = GPT2LMHeadModel(
+        GPT2Config(
+            vocab_size=_VOCAB_SIZE,
+            n_positions=_MAX_INPUT_LENGTH,
+            n_embd=16,
+            n_layer=1,
+            n_head=2,
+        )
+    )
+    tokenizer_patch = patch.object(
+        fed.AutoTokenizer, "from_pretrained", return_value=_Tokenizer()
+    )
+    model_patch = patch.object(
+        fed.AutoModelWithLMHead, "from_pretrained", return_value=model
+    )
+    with tokenizer_patch, model_patch:
+        return fed.FEDScorer("tiny-gpt2", device="cpu")
+
+
+def _full_sequence_loss(scorer: FEDScorer, input_ids: List[int]) -> float:
+    """Computes the loss of a sequence without cache nor padding."""
+    input_tensor = torch.tensor([input_ids])
+    with torch.no_grad():
+        logits = scorer.model(input_tensor).logits
+    return F.cross_entropy(logits[0, :-1], input_tensor[0, 1:]).item()
+
+
+def _random_ids(generator: torch.Generator, length: int) -> List[int]:
+    """Returns random token IDs, excluding the end of utterance token."""
+    return torch.randint(
+        1, _VOCAB_SIZE, (length,), generator=generator
+    ).tolist()
+
+
+def test_score_continuations(scorer: FEDScorer) -> None:
+    """Tests that prefix and continuation losses match full sequences."""
+    generator = torch.Generator().manual_seed(1)
+    prefix_ids = _random_ids(generator, 20)
+    continuations = [_random_ids(generator, n) for n in (1, 5, 3, 9, 2)]
+
+    losses = scorer._score_continuations(prefix_ids, continuations, 2)
+
+    assert losses == pytest.approx(
+        [
+            _full_sequence_loss(scorer, prefix_ids + continuation)
+            for continuation in continuations
+        ],
+        abs=1e-5,
+    )
+
+
+def test_score_sequences(scorer: FEDScorer) -> None:
+    """Tests that padded batches match sequences scored one by one."""
+    generator = torch.Generator().manual_seed(2)
+    sequences = [_random_ids(generator, n) for n in (12, 4, 30, 7)]
+
+    losses = scorer._score_sequences(sequences, 3)
+
+    assert losses == pytest.approx(
+        [_full_sequence_loss(scorer, sequence) for sequence in sequences],
+        abs=1e-5,
+    )
+
+
+def test_score_dialogue_truncated(scorer: FEDScorer) -> None:
+    """Tests examples sharing the prefix and examples truncated with it."""
+    generator = torch.Generator().manual_seed(3)
+    dialogue_ids = _random_ids(generator, _MAX_INPUT_LENGTH - 8)
+    short_example = " ".join(map(str, _random_ids(generator, 3)))
+    long_example = " ".join(map(str, _random_ids(generator, 12)))
+    dialogue_text = " ".join(map(str, dialogue_ids))
+
+    with patch.object(
+        scorer, "_score_sequences", wraps=scorer._score_sequences
+    ) as score_sequences:
+        scores = scorer._score_dialogue(
+            dialogue_text, [short_example, long_example], 4
+        )
+    # Only the example exceeding the maximum input length is truncated
+    (truncated_sequences, _), _ = score_sequences.call_args
+    assert len(truncated_sequences) == 1
+    assert len(truncated_sequences[0]) == _MAX_INPUT_LENGTH
+
+    prefix_ids = scorer._tokenize_prefix(dialogue_text)
+    assert scores[short_example] == pytest.approx(
+        _full_sequence_loss(
+            scorer, prefix_ids + scorer._tokenize_example(short_example)
+        ),
+        abs=1e-5,
+    )
+    assert scores[long_example] == pytest.approx(
+        _full_sequence_loss(
+            scorer,
+            scorer._truncate(
+                prefix_ids + scorer._tokenize_example(long_example)
+            ),
+        ),
+        abs=1e-5,
+    )
+
+
+def test_score_dialogues_batched(scorer: FEDScorer) -> None:
+    """Tests that prefixes of different lengths are batched correctly."""
+    generator = torch.Generator().manual_seed(4)
+    dialogue_texts = [
+        " ".join(map(str, _random_ids(generator, n))) for n in (15, 4, 27)
+    ]
+    examples = [
+        " ".join(map(str, _random_ids(generator, n))) for n in (2, 6, 1)
+    ]
+
+    with patch.object(
+        scorer.model, "forward", wraps=scorer.model.forward
+    ) as forward:
+        scores = scorer._score_dialogues(
+            [(dialogue_text, examples) for dialogue_text in dialogue_texts], 2
+        )
+    # Two batches of prefixes, then five batches of continuations
+    assert forward.call_count == 7
+
+    for dialogue_text in dialogue_texts:
+        prefix_ids = scorer._tokenize_prefix(dialogue_text)
+        assert [scores[dialogue_text][example] for example in examples] == (
+            pytest.approx(
+                [
+                    _full_sequence_loss(
+                        scorer, prefix_ids + scorer._tokenize_example(example)
+                    )
+                    for example in examples
+                ],
+                abs=1e-5,
+            )
+        )
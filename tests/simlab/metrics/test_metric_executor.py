@@ -0,0 +1,95 @@
+"""Tests for the metric executor."""
+
+from typing import Any, Dict, Hashable, List, Optional
+
+import pytest
+
+from dialoguekit.core.dialogue import Dialogue
+from simlab.metrics.metric import Metric
+from simlab.metrics.metric_executor import MetricExecutor
+from simlab.metrics.preprocessing import PreprocessingStage
+
+
+class LengthMetric(Metric):
+    def __init__(
+        self, name: str, stage: PreprocessingStage, offset: int = 0
+    ) -> None:
+        """Initializes a metric scoring the number of utterances."""
+        super().__init__(name)
+        self.stage = stage
+        self.offset = offset
+
+    @property
+    def preprocessing_stages(self) -> List[PreprocessingStage]:
+        """Returns the counting of utterances."""
+        return [self.stage]
+
+    def evaluate_dialogue(self, dialogue: Dialogue) -> float:
+        """Evaluates a dialogue."""
+        return self.evaluate_dialogues([dialogue])[0]
+
+    def evaluate_dialogues(
+        self,
+        dialogues: List[Dialogue],
+        preprocessed: Optional[Dict[Hashable, List[Any]]] = None,
+    ) -> List[float]:
+        """Evaluates multiple dialogues."""
+        return [
+            length + self.offset
+            for length in self.stage.get_output(dialogues, preprocessed)
+        ]
+
+
+@pytest.fixture
+def calls() -> List[str]:
+    """Returns the list of stages run."""
+    return []
+
+
+@pytest.fixture
+def stage(calls: List[str]) -> PreprocessingStage:
+    """Returns a stage counting utterances, depending on another stage."""
+
+    def get_utterances(dialogues: List[Dialogue]) -> List[List[str]]:
+        calls.append("utterances")
+        return [[u.text for u in d.utterances] for d in dialogues]
+
+    def count(
+        dialogues: List[Dialogue], utterances: List[List[str]]
+    ) -> List[int]:
+        calls.append("count")
+        return [len(texts) for texts in utterances]
+
+    utterances_stage = PreprocessingStage("utterances", get_utterances)
+    return PreprocessingStage("count", count, [utterances_stage])
+
+
+def test_evaluate_shared_stages(
+    dialogues: List[Dialogue],
+    calls: List[str],
+    stage: PreprocessingStage,
+) -> None:
+    """Tests that shared stages are run once and metrics get their output."""
+    torch_metric = LengthMetric("torch_metric", stage, offset=1)
+    torch_metric.requires_torch = True
+    metrics = [LengthMetric("metric", stage), torch_metric]
+
+    with MetricExecutor(metrics) as executor:
+        results = executor.evaluate(dialogues)
+
+    lengths = [len(dialogue.utterances) for dialogue in dialogues]
+    assert results == {
+        "metric": lengths,
+        "torch_metric": [length + 1 for length in lengths],
+    }
+    assert calls == ["utterances", "count"]
+
+
+def test_evaluate_without_executor(
+    dialogues: List[Dialogue], stage: PreprocessingStage
+) -> None:
+    """Tests that metrics compute their stages when not preprocessed."""
+    metric = LengthMetric("metric", stage)
+    assert metric.evaluate_dialogues(dialogues) == [
+        len(dialogue.utterances) for dialogue in dialogues
+    ]
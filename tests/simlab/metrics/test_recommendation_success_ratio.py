@@ -0,0 +1,165 @@
+"""Tests for the recommendation success ratio metric."""
+
+import random
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.intent import Intent
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.participant.participant import DialogueParticipant
+from simlab.metrics.utility.recommendation_success_ratio import (
+    RecommendationSuccessRatio,
+)
+
+
+@pytest.fixture
+def success_ratio() -> RecommendationSuccessRatio:
+    """Returns a recommendation success ratio metric with mocked NLUs."""
+    nlu = Mock()
+    nlu.extract_dialogue_acts_batch.side_effect = lambda utterances: [
+        [] for _ in utterances
+    ]
+    return RecommendationSuccessRatio(
+        user_nlu=nlu,
+        agent_nlu=nlu,
+        reject_intent_labels=["reject"],
+        accept_intent_labels=["accept"],
+        recommendation_intent_labels=["recommend"],
+    )
+
+
+def _annotated_dialogue(
+    conversation_id: str, turns: List[List[str]]
+) -> Dialogue:
+    """Creates a dialogue alternating agent and user utterances.
+
+    Args:
+        conversation_id: Conversation ID.
+        turns: Intent labels of each utterance.
+
+    Returns:
+        Annotated dialogue.
+    """
+    dialogue = Dialogue("agent", "user", conversation_id)
+    for i, labels in enumerate(turns):
+        participant = (
+            DialogueParticipant.AGENT
+            if i % 2 == 0
+            else DialogueParticipant.USER
+        )
+        dialogue.add_utterance(
+            AnnotatedUtterance(
+                "text",
+                participant=participant,
+                dialogue_acts=[DialogueAct(Intent(label)) for label in labels],
+            )
+        )
+    return dialogue
+
+
+def test_success_ratio(success_ratio: RecommendationSuccessRatio) -> None:
+    """Tests the ratio of successful rounds of a dialogue."""
+    dialogue = _annotated_dialogue(
+        "1",
+        [
+            ["greet"],
+            ["request"],
+            ["recommend"],
+            ["accept"],
+            ["recommend"],
+            ["reject"],
+            ["recommend"],
+            ["accept", "reject"],
+            ["recommend"],
+        ],
+    )
+    # Rounds: greeting, accepted, rejected, accepted
+    assert success_ratio.evaluate_dialogues([dialogue]) == [0.5]
+
+
+def test_success_ratio_matches_rounds(
+    success_ratio: RecommendationSuccessRatio,
+) -> None:
+    """Tests that the ratios match the rounds found utterance by utterance."""
+    rng = random.Random(0)
+    labels = ["recommend", "accept", "reject", "other"]
+    dialogues = [
+        _annotated_dialogue(
+            str(i),
+            [
+                rng.sample(labels, rng.randint(0, 2))
+                for _ in range(rng.randint(0, 10))
+            ],
+        )
+        for i in range(50)
+    ]
+
+    expected = []
+    for dialogue in dialogues:
+        rounds = success_ratio.get_recommendation_rounds(dialogue)
+        successful = sum(
+            success_ratio.is_recommendation_accepted(round) for round in rounds
+        )
+        expected.append(successful / len(rounds) if rounds else 0.0)
+    assert success_ratio.evaluate_dialogues(dialogues) == pytest.approx(
+        expected
+    )
+
+
+def test_close_shared_nlu(success_ratio: RecommendationSuccessRatio) -> None:
+    """Tests that an NLU module shared by both participants is closed once."""
+    success_ratio.close()
+
+    success_ratio.user_nlu.close.assert_called_once()
+
+
+def test_evaluate_dialogue_matches_batch() -> None:
+    """Tests that dialogues annotated one by one score as in a batch."""
+    nlu = Mock()
+    nlu.extract_dialogue_acts_batch.side_effect = lambda utterances: [
+        [DialogueAct(Intent(utterance.text))] for utterance in utterances
+    ]
+    success_ratio = RecommendationSuccessRatio(
+        user_nlu=nlu,
+        agent_nlu=nlu,
+        reject_intent_labels=["reject"],
+        accept_intent_labels=["accept"],
+        recommendation_intent_labels=["recommend"],
+    )
+    turns = [
+        ["recommend", "accept", "recommend", "reject", "recommend"],
+        ["greet", "request", "recommend", "accept", "recommend"],
+        ["recommend", "other"],
+    ]
+
+    def _dialogues() -> List[Dialogue]:
+        dialogues = []
+        for i, labels in enumerate(turns):
+            dialogue = Dialogue("agent", "user", str(i))
+            for j, label in enumerate(labels):
+                participant = (
+                    DialogueParticipant.AGENT
+                    if j % 2 == 0
+                    else DialogueParticipant.USER
+                )
+                dialogue.add_utterance(Utterance(label, participant))
+            dialogues.append(dialogue)
+        return dialogues
+
+    dialogues = _dialogues()
+    scores = [success_ratio.evaluate_dialogue(d) for d in dialogues]
+
+    assert scores == success_ratio.evaluate_dialogues(_dialogues())
+    assert scores == [0.5, 0.5, 0.0]
+    # Evaluating a dialogue annotates its utterances
+    assert all(
+        isinstance(utterance, AnnotatedUtterance)
+        and utterance.dialogue_acts == [DialogueAct(Intent(utterance.text))]
+        for dialogue in dialogues
+        for utterance in dialogue.utterances
+    )
@@ -0,0 +1,139 @@
+"""Tests for the success classification rate metric."""
+
+import re
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.participant.participant import DialogueParticipant
+from simlab.metrics.utility.success_classification_rate import (
+    SuccessClassificationRate,
+)
+
+
+class _Tokenizer:
+    """Tokenizer of whitespace-separated words."""
+
+    def __call__(self, text: str, **kwargs: Any) -> Dict[str, Any]:
+        """Returns the character offsets of the words of a text."""
+        return {
+            "offset_mapping": [
+                match.span() for match in re.finditer(r"\S+", text)
+            ]
+        }
+
+
+class _Classifier:
+    """Zero-shot classifier of transcripts mentioning a great movie."""
+
+    def __init__(self) -> None:
+        """Initializes the classifier with a tokenizer and a model."""
+        self.tokenizer = _Tokenizer()
+        self.model = MagicMock()
+        self.model.config._commit_hash = "revision"
+        self.inputs: List[str] = []
+
+    def __call__(
+        self, transcripts: List[str], labels: List[str], **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Classifies transcripts as aligned if they contain "great"."""
+        self.inputs.extend(transcripts)
+        return [
+            {
+                "labels": (
+                    labels if "great" in transcript else list(reversed(labels))
+                )
+            }
+            for transcript in transcripts
+        ]
+
+
+@pytest.fixture
+def classifier() -> _Classifier:
+    """Returns a stub classifier provided by the model registry."""
+    classifier = _Classifier()
+    registry = MagicMock()
+    registry.acquire.return_value = classifier
+    with patch(
+        "simlab.metrics.utility.success_classification_rate."
+        "get_model_registry",
+        return_value=registry,
+    ):
+        yield classifier
+
+
+def _dialogue(conversation_id: str, texts: List[str]) -> Dialogue:
+    """Creates a dialogue alternating agent and user utterances.
+
+    Args:
+        conversation_id: Conversation ID.
+        texts: Texts of the utterances.
+
+    Returns:
+        Dialogue.
+    """
+    dialogue = Dialogue("agent", "user", conversation_id)
+    for i, text in enumerate(texts):
+        participant = (
+            DialogueParticipant.AGENT
+            if i % 2 == 0
+            else DialogueParticipant.USER
+        )
+        dialogue.add_utterance(Utterance(text, participant=participant))
+    return dialogue
+
+
+@pytest.mark.parametrize(
+    "truncation_side,expected",
+    [
+        ("left", "great movie.\nUSER: Thanks!"),
+        ("right", "AGENT: Watch this great"),
+    ],
+)
+def test_truncate_transcript(
+    classifier: _Classifier, truncation_side: str, expected: str
+) -> None:
+    """Tests that transcripts are cut at the offsets of the kept tokens."""
+    metric = SuccessClassificationRate(
+        max_transcript_tokens=4, truncation_side=truncation_side
+    )
+    dialogue = _dialogue("1", ["Watch this great movie.", "Thanks!"])
+
+    assert metric._format_transcript(dialogue) == expected
+
+
+def test_transcript_within_limit(classifier: _Classifier) -> None:
+    """Tests that transcripts within the token limit are kept whole."""
+    metric = SuccessClassificationRate(max_transcript_tokens=7)
+    dialogue = _dialogue("1", ["Watch this great movie.", "Thanks!"])
+
+    assert (
+        metric._format_transcript(dialogue)
+        == "AGENT: Watch this great movie.\nUSER: Thanks!"
+    )
+
+
+def test_invalid_truncation_side(classifier: _Classifier) -> None:
+    """Tests that an unknown truncation side is rejected."""
+    with pytest.raises(ValueError):
+        SuccessClassificationRate(truncation_side="middle")
+
+
+def test_evaluate_dialogues_order(classifier: _Classifier) -> None:
+    """Tests that scores follow the dialogues despite the sorted batches."""
+    metric = SuccessClassificationRate()
+    dialogues = [
+        _dialogue("1", ["Hi"]),
+        _dialogue("2", ["Watch this great movie, it is a classic."]),
+        _dialogue("3", ["Bye"]),
+        _dialogue("4", ["A great one."]),
+    ]
+
+    assert metric.evaluate_dialogues(dialogues) == [0.0, 1.0, 0.0, 1.0]
+    # The longest transcripts are classified first
+    assert [len(transcript) for transcript in classifier.inputs] == sorted(
+        (len(transcript) for transcript in classifier.inputs), reverse=True
+    )
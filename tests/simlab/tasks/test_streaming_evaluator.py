@@ -0,0 +1,47 @@
+"""Tests for the streaming evaluator."""
+
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from simlab.tasks import Task
+from simlab.tasks.streaming_evaluator import StreamingEvaluator
+
+
+@pytest.fixture
+def dialogues_data() -> List[Dict[str, Any]]:
+    """Returns dialogues in dictionary format."""
+    with open("tests/simlab/data/dialogues.json") as f:
+        return json.load(f)
+
+
+def test_streaming_evaluation(
+    task: Task, dialogues_data: List[Dict[str, Any]]
+) -> None:
+    """Tests that all submitted dialogues are evaluated by batches."""
+    evaluator = StreamingEvaluator(task, batch_size=4, max_queue_size=2)
+    for dialogue_data in dialogues_data * 5:
+        evaluator.submit(dialogue_data)
+    results = evaluator.finish()
+
+    assert results == {"mocked_metric": [1] * 10}
+    batch_sizes = [
+        len(call.args[0])
+        for call in task.metrics[0].evaluate_dialogues.call_args_list
+    ]
+    assert sum(batch_sizes) == 10
+    assert max(batch_sizes) <= 4
+
+
+def test_streaming_evaluation_failure(
+    task: Task, dialogues_data: List[Dict[str, Any]]
+) -> None:
+    """Tests that a failed evaluation is reported when finishing."""
+    task.metrics[0].evaluate_dialogues.side_effect = ValueError("failure")
+    evaluator = StreamingEvaluator(task, max_queue_size=1)
+    for dialogue_data in dialogues_data * 3:
+        evaluator.submit(dialogue_data)
+
+    with pytest.raises(RuntimeError):
+        evaluator.finish()
@@ -1,8 +1,14 @@
 """Tests for task module."""
 
+import math
 from typing import List
+from unittest.mock import patch
 
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.participant.participant import DialogueParticipant
+from dialoguekit.utils.model_registry import ModelRegistry
+from simlab.metrics.evaluation_cache import SQLiteEvaluationCache
 from simlab.tasks import Task
 
 
@@ -27,3 +33,86 @@ def test_evaluation(task: Task, dialogues: List[Dialogue]) -> None:
     assert len(results) == 1
     assert len(results["mocked_metric"]) == 2
     assert all([result == 1 for result in results["mocked_metric"]])
+
+
+def test_evaluation_generator(task: Task, dialogues: List[Dialogue]) -> None:
+    """Tests evaluate method with dialogues given by a generator."""
+    results = task.evaluation(
+        (dialogue for dialogue in dialogues * 3), batch_size=4
+    )
+
+    assert len(results["mocked_metric"]) == 6
+    assert [
+        len(call.args[0])
+        for call in task.metrics[0].evaluate_dialogues.call_args_list
+    ] == [4, 2]
+
+
+def test_required_fields(task: Task) -> None:
+    """Tests the union of the fields required by the metrics."""
+    assert task.required_fields is None
+
+    task.metrics[0].required_fields = {"utterance", "participant"}
+    assert task.required_fields == {"utterance", "participant"}
+
+
+def test_evaluation_cache(
+    task: Task, dialogues: List[Dialogue], tmp_path
+) -> None:
+    """Tests that cached scores are not computed again."""
+    cache = SQLiteEvaluationCache(str(tmp_path / "cache.sqlite"))
+    metric = task.metrics[0]
+    metric.fingerprint.return_value = "mocked_metric_fingerprint"
+
+    results = task.evaluation(dialogues, cache=cache)
+    assert results == {"mocked_metric": [1, 1]}
+    assert metric.evaluate_dialogues.call_count == 1
+
+    results = task.evaluation(dialogues, cache=cache)
+    assert results == {"mocked_metric": [1, 1]}
+    assert metric.evaluate_dialogues.call_count == 1
+
+    # Only the new dialogue is evaluated
+    new_dialogue = Dialogue("agent", "user", "new_conversation")
+    new_dialogue.add_utterance(Utterance("Hello", DialogueParticipant.USER))
+    results = task.evaluation(dialogues + [new_dialogue], cache=cache)
+    assert results == {"mocked_metric": [1, 1, 1]}
+    assert metric.evaluate_dialogues.call_count == 2
+    assert metric.evaluate_dialogues.call_args.args[0] == [new_dialogue]
+    cache.close()
+
+
+def test_evaluation_cache_nan(
+    task: Task, dialogues: List[Dialogue], tmp_path
+) -> None:
+    """Tests that NaN scores are returned but not cached."""
+    cache = SQLiteEvaluationCache(str(tmp_path / "cache.sqlite"))
+    metric = task.metrics[0]
+    metric.fingerprint.return_value = "mocked_metric_fingerprint"
+    metric.evaluate_dialogues.side_effect = lambda dialogues, **_: [
+        float("nan") if i == 0 else 1.0 for i in range(len(dialogues))
+    ]
+
+    results = task.evaluation(dialogues, cache=cache)
+    assert math.isnan(results["mocked_metric"][0])
+    assert results["mocked_metric"][1] == 1.0
+
+    # Only the dialogue with a NaN score is evaluated again
+    task.evaluation(dialogues, cache=cache)
+    assert metric.evaluate_dialogues.call_args.args[0] == [dialogues[0]]
+    cache.close()
+
+
+def test_close(task: Task) -> None:
+    """Tests that closing the task frees the models of its metrics."""
+    registry = ModelRegistry()
+    registry.acquire("text-generation", "model", lambda: "model")
+    task.metrics[0].close.side_effect = lambda: registry.release(
+        "text-generation", "model"
+    )
+
+    with patch("simlab.tasks.task.get_model_registry", return_value=registry):
+        task.close()
+
+    task.metrics[0].close.assert_called_once()
+    assert ("text-generation", "model", None, None) not in registry
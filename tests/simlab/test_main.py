@@ -1,5 +1,7 @@
 """Tests for the main module."""
 
+from threading import Barrier
+from typing import List, Set
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,6 +13,8 @@ from simlab.core.run_configuration import (
     RunConfiguration,
 )
 from simlab.main import (
+    _run_cleanup_steps,
+    evaluate_participant_pair,
     generate_synthetic_dialogues,
     load_configuration,
     main,
@@ -20,6 +24,7 @@ from simlab.participant.wrapper_agent import WrapperAgent
 from simlab.participant.wrapper_user_simulator import WrapperUserSimulator
 from simlab.simulation_platform import SimulationPlatform
 from simlab.tasks import Task
+from simlab.tasks.streaming_evaluator import StreamingEvaluator
 from simlab.utils.configuration_readers.base_configuration_reader import (
     BaseConfigurationReader,
 )
@@ -53,6 +58,7 @@ def test_parse_args(monkeypatch) -> None:
     )
     assert parsed_args.registry_repository == "simlab-test-registry"
     assert parsed_args.output_dir == "tests/simlab/data/dialogue_export"
+    assert parsed_args.max_parallel_pairs == 1
 
 
 def test_parse_args_missing_configuration(monkeypatch) -> None:
@@ -112,6 +118,42 @@ def test_generate_synthetic_dialogues(
     )
 
 
+def test_generate_synthetic_dialogues_concurrent(
+    information_need: InformationNeed,
+) -> None:
+    """Tests the generate_synthetic_dialogues function with concurrency."""
+    mocked_simulation_platform = MagicMock(spec=SimulationPlatform)
+    user_simulator = WrapperUserSimulator("test_simulator")
+    agent = WrapperAgent("test_agent")
+
+    with patch.object(WrapperUserSimulator, "set_information_need"):
+        generate_synthetic_dialogues(
+            mocked_simulation_platform,
+            user_simulator,
+            agent,
+            [information_need] * 5,
+            "tests/simlab/data/dialogue_export",
+            max_concurrent_dialogues=3,
+        )
+
+    assert mocked_simulation_platform.connect.call_count == 5
+    conversation_ids = set()
+    for call in mocked_simulation_platform.connect.call_args_list:
+        user_key, connected_user, connected_agent, _, conversation_id = (
+            call.args
+        )
+        # Each conversation is held by its own copies of the participants
+        assert connected_user is not user_simulator
+        assert connected_agent is not agent
+        assert connected_user.id == "test_simulator"
+        assert connected_user.conversation_id == conversation_id
+        assert connected_agent.conversation_id == conversation_id
+        assert user_key == f"test_simulator_{conversation_id}"
+        conversation_ids.add(conversation_id)
+    assert len(conversation_ids) == 5
+    assert mocked_simulation_platform.disconnect.call_count == 5
+
+
 def test_main(task: Task) -> None:
     """Tests the main function."""
     # Mock dependencies
@@ -139,8 +181,11 @@ def test_main(task: Task) -> None:
         patch("simlab.main.DockerRegistryMetadata") as mocked_docker_metadata,
         patch("simlab.main.MongoDBConnector") as mocked_mongo_connector,
         patch("simlab.main.insert_record") as mocked_insert_record,
-        patch("simlab.main.json_to_dialogues") as mocked_json_to_dialogues,
+        patch("simlab.main.iter_dialogues") as mocked_iter_dialogues,
         patch("simlab.main.start_participant") as mocked_start_participant,
+        patch(
+            "simlab.main.docker_prefetch_images"
+        ) as mocked_docker_prefetch_images,
         patch(
             "simlab.main.docker_stop_container"
         ) as mocked_docker_stop_container,
@@ -149,7 +194,7 @@ def test_main(task: Task) -> None:
         ) as mocked_clean_local_docker_registry,
     ):
 
-        mocked_json_to_dialogues.return_value = [MagicMock(spec=Dialogue)]
+        mocked_iter_dialogues.return_value = [MagicMock(spec=Dialogue)] * 2
         mocked_start_participant.return_value = (
             MagicMock(spec=str),
             [7000],
@@ -164,8 +209,166 @@ def test_main(task: Task) -> None:
             "tests/simlab/data/dialogue_export/",
         )
 
-        mocked_json_to_dialogues.assert_called_once_with(
+        mocked_iter_dialogues.assert_called_once_with(
             "tests/simlab/data/dialogue_export/"
-            "test_agent_test_user_simulator.json"
+            "test_agent_test_user_simulator.jsonl",
+            fields=None,
         )
         mocked_insert_record.assert_called_once()
+        prefetched_images = mocked_docker_prefetch_images.call_args.args[0]
+        assert list(prefetched_images) == [
+            "template_agent",
+            "template_user_simulator",
+        ]
+
+
+def test_main_parallel_pairs(task: Task) -> None:
+    """Tests the main function with concurrent pairs."""
+    mocked_configuration = MagicMock(spec=RunConfiguration)
+    mocked_configuration.name = "test_run"
+    mocked_configuration.public = True
+    mocked_configuration.task = task
+    mocked_configuration.agent_configurations = [
+        MagicMock(
+            spec=ParticipantConfiguration,
+            image="template_agent",
+            custom_parameters={},
+            participant=MagicMock(spec=WrapperAgent, id=f"test_agent_{i}"),
+        )
+        for i in range(2)
+    ]
+    mocked_configuration.user_simulator_configurations = [
+        MagicMock(
+            spec=ParticipantConfiguration,
+            image="template_user_simulator",
+            custom_parameters={},
+            participant=MagicMock(
+                spec=WrapperUserSimulator, id=f"test_user_simulator_{i}"
+            ),
+        )
+        for i in range(2)
+    ]
+    with (
+        patch("simlab.main.insert_record") as mocked_insert_record,
+        patch("simlab.main.iter_dialogues") as mocked_iter_dialogues,
+        patch("simlab.main.start_participant") as mocked_start_participant,
+        patch("simlab.main.docker_prefetch_images"),
+        patch("simlab.main.docker_stop_container"),
+        patch("simlab.utils.container_pool.configure_participant"),
+    ):
+        # All pairs have to be running at the same time to pass the barrier
+        barrier = Barrier(4, timeout=5)
+
+        def _iter_dialogues(_: str, fields: Set[str]) -> List[Dialogue]:
+            barrier.wait()
+            return [MagicMock(spec=Dialogue)] * 2
+
+        mocked_iter_dialogues.side_effect = _iter_dialogues
+        mocked_start_participant.side_effect = lambda _, __, port, ___: (
+            MagicMock(spec=str),
+            [port],
+        )
+
+        main(
+            mocked_configuration,
+            MagicMock(),
+            MagicMock(),
+            "tests/simlab/data/dialogue_export/",
+            max_parallel_pairs=4,
+        )
+
+        assert mocked_insert_record.call_count == 4
+        # Ports bound by concurrent pairs must not overlap
+        agent_ports = [
+            call.args[2] for call in mocked_start_participant.call_args_list
+        ]
+        assert len(set(agent_ports)) == len(agent_ports)
+        assert {
+            call.args[0] for call in mocked_iter_dialogues.call_args_list
+        } == {
+            f"tests/simlab/data/dialogue_export/test_agent_{i}_"
+            f"test_user_simulator_{j}.jsonl"
+            for i in range(2)
+            for j in range(2)
+        }
+
+
+def test_main_duplicate_pairs(task: Task) -> None:
+    """Tests the main function with pairs sharing the same IDs."""
+    agent_configuration = MagicMock(
+        spec=ParticipantConfiguration,
+        participant=MagicMock(spec=WrapperAgent, id="test_agent"),
+    )
+    mocked_configuration = MagicMock(spec=RunConfiguration)
+    mocked_configuration.task = task
+    mocked_configuration.agent_configurations = [
+        agent_configuration,
+        agent_configuration,
+    ]
+    mocked_configuration.user_simulator_configurations = [
+        MagicMock(
+            spec=ParticipantConfiguration,
+            participant=MagicMock(
+                spec=WrapperUserSimulator, id="test_user_simulator"
+            ),
+        )
+    ]
+
+    with pytest.raises(ValueError):
+        main(mocked_configuration, MagicMock(), MagicMock(), "output_dir")
+
+
+def test_run_cleanup_steps(capsys) -> None:
+    """Tests that a failed cleanup step does not skip the next ones."""
+    calls = []
+
+    def prune() -> None:
+        calls.append("prune")
+        raise RuntimeError("Docker daemon unavailable")
+
+    def evict() -> None:
+        calls.append("evict")
+
+    _run_cleanup_steps([prune, evict])
+
+    assert calls == ["prune", "evict"]
+    assert "Docker daemon unavailable" in capsys.readouterr().out
+
+
+def test_evaluate_participant_pair_streaming_failure(task: Task) -> None:
+    """Tests that the streaming evaluator stops when containers fail."""
+    evaluators: List[StreamingEvaluator] = []
+
+    def _create_evaluator(*args, **kwargs) -> StreamingEvaluator:
+        evaluators.append(StreamingEvaluator(*args, **kwargs))
+        return evaluators[-1]
+
+    mocked_configuration = MagicMock(spec=RunConfiguration)
+    mocked_configuration.task = task
+    container_pool = MagicMock()
+    container_pool.acquire.side_effect = RuntimeError("Container failed")
+
+    with patch("simlab.main.StreamingEvaluator", side_effect=_create_evaluator):
+        with pytest.raises(RuntimeError, match="Container failed"):
+            evaluate_participant_pair(
+                MagicMock(
+                    spec=ParticipantConfiguration,
+                    participant=MagicMock(spec=WrapperAgent, id="test_agent"),
+                ),
+                MagicMock(
+                    spec=ParticipantConfiguration,
+                    participant=MagicMock(
+                        spec=WrapperUserSimulator, id="test_user_simulator"
+                    ),
+                ),
+                MagicMock(spec=SimulationPlatform),
+                mocked_configuration,
+                "output_dir",
+                MagicMock(),
+                container_pool,
+                streaming_evaluation=True,
+            )
+
+    assert len(evaluators) == 1
+    assert not evaluators[0]._worker.is_alive()
+    container_pool.release.assert_not_called()
@@ -54,3 +54,13 @@ def test_disconnect(sim_platform: SimulationPlatform) -> None:
         "test_agent",
         "test_user_simulator",
     ) not in sim_platform._active_agent_user_pairs.keys()
+
+
+def test_notify_dialogue_finished(sim_platform: SimulationPlatform) -> None:
+    """Tests that the dialogue listeners are notified."""
+    listener = MagicMock()
+    sim_platform.add_dialogue_listener(listener)
+
+    sim_platform.notify_dialogue_finished({"conversation ID": "1"})
+
+    listener.assert_called_once_with({"conversation ID": "1"})
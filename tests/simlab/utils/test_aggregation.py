@@ -0,0 +1,130 @@
+"""Tests for the aggregation of evaluation scores."""
+
+import numpy as np
+import pytest
+
+from dialoguekit.core.dialogue import Dialogue
+from simlab.utils.aggregation import (
+    aggregate_scores,
+    information_need_key,
+    to_grouped_array,
+)
+
+
+def test_aggregate_scores() -> None:
+    """Tests the summary statistics of scores."""
+    values = [1, 2, 3, 4, 5]
+    results = aggregate_scores(values)
+
+    assert results["values"] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert results["mean"] == 3.0
+    assert results["std"] == pytest.approx(np.std(values, ddof=1))
+    assert results["median"] == 3.0
+    assert results["min"] == 1.0
+    assert results["max"] == 5.0
+    assert results["q1"] == 2.0
+    assert results["q3"] == 4.0
+    assert results["ci_low"] <= results["mean"] <= results["ci_high"]
+    assert "groups" not in results
+
+
+def test_aggregate_scores_single_value() -> None:
+    """Tests that a single score has a standard deviation of 0."""
+    results = aggregate_scores([0.5])
+
+    assert results["mean"] == 0.5
+    assert results["std"] == 0.0
+    assert results["ci_low"] == results["ci_high"] == 0.5
+
+
+def test_aggregate_scores_empty() -> None:
+    """Tests that the statistics of no scores are None."""
+    results = aggregate_scores([])
+
+    assert results["values"] == []
+    assert results["mean"] is None
+    assert results["ci_low"] is None
+
+
+def test_aggregate_scores_groups() -> None:
+    """Tests the aggregation of scores per group."""
+    results = aggregate_scores([1, 3, 5, 4], groups=["a", "a", "b", None])
+
+    assert results["mean"] == 3.25
+    assert results["groups"] == [
+        {"group": "a", "mean": 2.0, "count": 2},
+        {"group": "b", "mean": 5.0, "count": 1},
+        {"group": None, "mean": 4.0, "count": 1},
+    ]
+
+
+def test_aggregate_scores_nan() -> None:
+    """Tests that NaN scores are excluded from all statistics and counted."""
+    values = [1, float("nan"), 3, 5, float("nan")]
+    results = aggregate_scores(values, groups=["a", "a", "a", "b", "c"])
+
+    assert results["num_nan"] == 2
+    assert results["mean"] == 3.0
+    assert results["median"] == 3.0
+    assert results["std"] == pytest.approx(2.0)
+    assert 1.0 <= results["ci_low"] <= results["ci_high"] <= 5.0
+    assert results["groups"] == [
+        {"group": "a", "mean": 2.0, "count": 2},
+        {"group": "b", "mean": 5.0, "count": 1},
+        {"group": "c", "mean": None, "count": 0},
+    ]
+
+
+def test_aggregate_scores_only_nan() -> None:
+    """Tests that the statistics of NaN scores only are None."""
+    results = aggregate_scores([float("nan")] * 2)
+
+    assert results["num_nan"] == 2
+    assert results["mean"] is None
+    assert results["ci_low"] is None
+
+
+def test_to_grouped_array() -> None:
+    """Tests that groups of different sizes are padded and masked."""
+    array, mask, keys = to_grouped_array([1, 2, 3], groups=["a", "b", "a"])
+
+    assert keys == ["a", "b"]
+    np.testing.assert_array_equal(array, [[1, 3], [2, 0]])
+    np.testing.assert_array_equal(mask, [[True, True], [True, False]])
+
+
+def test_information_need_key() -> None:
+    """Tests that equal information needs have the same key."""
+    dialogue_1 = Dialogue("agent", "user", "1")
+    dialogue_1.metadata["information_need"] = {"b": 1, "a": 2}
+    dialogue_2 = Dialogue("agent", "user", "2")
+    dialogue_2.metadata["information_need"] = {"a": 2, "b": 1}
+
+    assert information_need_key(dialogue_1) == information_need_key(dialogue_2)
+    assert information_need_key(Dialogue("agent", "user", "3")) is None
+
+
+def test_information_need_key_fulfilled_slots() -> None:
+    """Tests that the key does not depend on the fulfilled slots."""
+    constraints = {"genre": "comedy"}
+    dialogue_1 = Dialogue("agent", "user", "1")
+    dialogue_1.metadata["information_need"] = {
+        "constraints": constraints,
+        "requested_slots": ["year"],
+        "fulfilled_slots": {"rating": "7.5"},
+    }
+    dialogue_2 = Dialogue("agent", "user", "2")
+    dialogue_2.metadata["information_need"] = {
+        "constraints": constraints,
+        "requested_slots": ["rating"],
+        "fulfilled_slots": {"year": "1994"},
+    }
+    dialogue_3 = Dialogue("agent", "user", "3")
+    dialogue_3.metadata["information_need"] = {
+        "constraints": {"genre": "drama"},
+        "requested_slots": ["rating", "year"],
+        "fulfilled_slots": {},
+    }
+
+    assert information_need_key(dialogue_1) == information_need_key(dialogue_2)
+    assert information_need_key(dialogue_1) != information_need_key(dialogue_3)
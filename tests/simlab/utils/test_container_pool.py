@@ -0,0 +1,108 @@
+"""Tests for the pool of participant containers."""
+
+from typing import List, Optional, Tuple
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from simlab.core.run_configuration import ParticipantConfiguration
+from simlab.participant.wrapper_agent import WrapperAgent
+from simlab.utils.container_pool import ContainerPool
+from simlab.utils.participant_api.utils_api_calls import ContextMode
+from simlab.utils.port_allocator import PortAllocator
+
+
+def _start_container(
+    _, participant_configuration, port: int, max_port: Optional[int]
+) -> Tuple[str, List[int]]:
+    """Simulates the start of a participant's container."""
+    participant_configuration.participant.uri = f"http://localhost:{port}"
+    return f"container_{port}", [port]
+
+
+def _participant_configuration(id: str) -> ParticipantConfiguration:
+    """Returns the configuration of an agent using the same image."""
+    return MagicMock(
+        spec=ParticipantConfiguration,
+        image="template_agent",
+        custom_parameters={"id": id},
+        participant=MagicMock(spec=WrapperAgent, id=id),
+    )
+
+
+@pytest.fixture
+def container_pool() -> ContainerPool:
+    """Returns a container pool with mocked Docker commands."""
+    return ContainerPool(
+        MagicMock(),
+        PortAllocator(base_port=7000, block_size=10),
+        MagicMock(side_effect=_start_container),
+        MagicMock(),
+    )
+
+
+def test_reuse_container(container_pool: ContainerPool) -> None:
+    """Tests that a container is reconfigured for the next pair."""
+    container_pool.reserve("template_agent", 2)
+    first_agent = _participant_configuration("agent_1")
+    second_agent = _participant_configuration("agent_2")
+
+    container = container_pool.acquire(first_agent)
+    container_pool.release(container)
+    with patch(
+        "simlab.utils.container_pool.configure_participant",
+        return_value=ContextMode.DELTA,
+    ) as mocked_configure_participant:
+        assert container_pool.acquire(second_agent) is container
+
+    mocked_configure_participant.assert_called_once_with(
+        "http://localhost:7000", "agent_2", {"id": "agent_2"}
+    )
+    assert second_agent.participant.uri == "http://localhost:7000"
+    assert second_agent.participant.context_mode == ContextMode.DELTA
+    container_pool._start_container.assert_called_once()
+    container_pool._stop_container.assert_not_called()
+
+    # The container is stopped after its last pair
+    container_pool.release(container)
+    container_pool._stop_container.assert_called_once_with("container_7000")
+
+
+def test_concurrent_pairs(container_pool: ContainerPool) -> None:
+    """Tests that concurrent pairs are given their own containers."""
+    container_pool.reserve("template_agent", 2)
+
+    containers = [
+        container_pool.acquire(_participant_configuration(f"agent_{i}"))
+        for i in range(2)
+    ]
+
+    assert containers[0].ports != containers[1].ports
+    assert container_pool._start_container.call_count == 2
+    for container in containers:
+        container_pool.release(container)
+    assert container_pool._stop_container.call_count == 2
+
+
+def test_release_failed_container(container_pool: ContainerPool) -> None:
+    """Tests that a container in an unknown state is not reused."""
+    container_pool.reserve("template_agent", 2)
+    container = container_pool.acquire(_participant_configuration("agent"))
+
+    container_pool.release(container, reuse=False)
+
+    container_pool._stop_container.assert_called_once_with("container_7000")
+    # The ports of the stopped container can be allocated again
+    assert container_pool.port_allocator.allocate() == range(7000, 7010)
+
+
+def test_close(container_pool: ContainerPool) -> None:
+    """Tests that idle containers are stopped when closing the pool."""
+    container_pool.reserve("template_agent", 3)
+    container = container_pool.acquire(_participant_configuration("agent"))
+    container_pool.release(container)
+    container_pool._stop_container.assert_not_called()
+
+    container_pool.close()
+
+    container_pool._stop_container.assert_called_once_with("container_7000")
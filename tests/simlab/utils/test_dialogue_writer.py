@@ -0,0 +1,45 @@
+"""Tests for the JSONL dialogue writer."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from simlab.utils.dialogue_writer import (
+    close_dialogue_writer,
+    get_dialogue_writer,
+)
+
+
+def test_get_dialogue_writer_shared(tmp_path) -> None:
+    """Tests that writers are shared per export file."""
+    path = os.path.join(tmp_path, "agent_user.jsonl")
+    writer = get_dialogue_writer(path)
+
+    assert writer is get_dialogue_writer(path)
+    close_dialogue_writer(path)
+    assert writer is not get_dialogue_writer(path)
+    close_dialogue_writer(path)
+
+
+def test_dialogue_writer_append(tmp_path) -> None:
+    """Tests that concurrent dialogues are appended as separate lines."""
+    path = os.path.join(tmp_path, "export", "agent_user.jsonl")
+    writer = get_dialogue_writer(path)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(
+            executor.map(
+                lambda i: writer.write({"conversation_id": str(i)}), range(50)
+            )
+        )
+    close_dialogue_writer(path)
+
+    # A new writer appends to the existing export
+    get_dialogue_writer(path).write({"conversation_id": "50"})
+    close_dialogue_writer(path)
+
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert sorted(int(line["conversation_id"]) for line in lines) == list(
+        range(51)
+    )
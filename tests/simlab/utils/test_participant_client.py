@@ -0,0 +1,64 @@
+"""Tests for the participant API clients."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from simlab.utils.participant_api.participant_client import (
+    AsyncParticipantClient,
+    ParticipantClient,
+    close_participant_client,
+    get_participant_client,
+)
+
+
+def test_get_participant_client_shared() -> None:
+    """Tests that clients are shared per participant URI."""
+    client = get_participant_client("http://localhost:7000/")
+
+    assert client is get_participant_client("http://localhost:7000")
+    assert client is not get_participant_client("http://localhost:7001")
+
+    close_participant_client("http://localhost:7000")
+    close_participant_client("http://localhost:7001")
+    assert client is not get_participant_client("http://localhost:7000")
+    close_participant_client("http://localhost:7000")
+
+
+def test_participant_client_post() -> None:
+    """Tests that requests reuse the session with the default timeout."""
+    client = ParticipantClient("http://localhost:7000", timeout=3)
+
+    with patch.object(client._session, "post") as mocked_post:
+        client.post("/configure", json={"id": "agent"})
+        client.post("/configure", json={"id": "agent"}, timeout=1)
+
+    assert mocked_post.call_args_list[0].args == (
+        "http://localhost:7000/configure",
+    )
+    assert mocked_post.call_args_list[0].kwargs == {
+        "json": {"id": "agent"},
+        "timeout": 3,
+    }
+    assert mocked_post.call_args_list[1].kwargs["timeout"] == 1
+    client.close()
+
+
+def test_async_participant_client_post() -> None:
+    """Tests the asynchronous client."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url == "http://localhost:7000/receive_utterance"
+        return httpx.Response(200, json={"message": "Hello"})
+
+    async def run() -> None:
+        client = AsyncParticipantClient("http://localhost:7000")
+        client._client = httpx.AsyncClient(
+            base_url=client.uri, transport=httpx.MockTransport(handler)
+        )
+        response = await client.post("/receive_utterance", json={})
+        await client.aclose()
+        assert response.json() == {"message": "Hello"}
+
+    asyncio.run(run())
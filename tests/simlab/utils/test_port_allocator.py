@@ -0,0 +1,57 @@
+"""Tests for the port allocator."""
+
+import pytest
+
+from simlab.utils.port_allocator import PortAllocator
+
+
+def test_allocate_non_overlapping_ranges() -> None:
+    """Tests that allocated ranges do not overlap."""
+    allocator = PortAllocator(base_port=7000, block_size=10, max_port=7039)
+
+    ranges = [allocator.allocate() for _ in range(4)]
+
+    assert ranges[0] == range(7000, 7010)
+    assert ranges[-1] == range(7030, 7040)
+    ports = [port for r in ranges for port in r]
+    assert len(ports) == len(set(ports))
+
+
+def test_allocate_exhausted() -> None:
+    """Tests allocation when all ranges are in use."""
+    allocator = PortAllocator(base_port=7000, block_size=10, max_port=7019)
+    allocator.allocate()
+    allocator.allocate()
+
+    with pytest.raises(RuntimeError):
+        allocator.allocate()
+
+
+def test_release() -> None:
+    """Tests that released ranges are reused, lowest first."""
+    allocator = PortAllocator(base_port=7000, block_size=10)
+    first = allocator.allocate()
+    allocator.allocate()
+
+    allocator.release(first)
+
+    assert allocator.allocate() == first
+
+
+@pytest.mark.parametrize(
+    "ports",
+    [range(7005, 7015), range(7000, 7005), range(7010, 7020)],
+)
+def test_release_invalid_range(ports: range) -> None:
+    """Tests release of ranges that were not allocated."""
+    allocator = PortAllocator(base_port=7000, block_size=10)
+    allocator.allocate()
+
+    with pytest.raises(ValueError):
+        allocator.release(ports)
+
+
+def test_invalid_block_size() -> None:
+    """Tests initialization with an invalid block size."""
+    with pytest.raises(ValueError):
+        PortAllocator(block_size=0)
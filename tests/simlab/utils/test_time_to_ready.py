@@ -0,0 +1,24 @@
+"""Tests for the statistics on the time to ready of containers."""
+
+import pytest
+
+from simlab.utils.time_to_ready import (
+    get_time_to_ready_stats,
+    record_time_to_ready,
+    reset_time_to_ready_stats,
+)
+
+
+def test_time_to_ready_stats() -> None:
+    """Tests that times to ready are aggregated per image."""
+    reset_time_to_ready_stats()
+    record_time_to_ready("agent", 1.0)
+    record_time_to_ready("agent", 3.0)
+    record_time_to_ready("user_simulator", 0.5)
+
+    assert get_time_to_ready_stats() == [
+        {"image": "agent", "count": 2, "mean": pytest.approx(2.0), "max": 3.0},
+        {"image": "user_simulator", "count": 1, "mean": 0.5, "max": 0.5},
+    ]
+    reset_time_to_ready_stats()
+    assert get_time_to_ready_stats() == []
@@ -0,0 +1,170 @@
+"""Tests for the participant API utilities."""
+
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from dialoguekit.core import Utterance
+from dialoguekit.participant import DialogueParticipant
+from simlab.participant.wrapper_agent import WrapperAgent
+from simlab.utils.participant_api.utils_api_calls import (
+    ContextMode,
+    configure_participant,
+    wait_for_participant,
+)
+
+
+@pytest.mark.parametrize(
+    "response_json, expected_mode",
+    [
+        ({"message": "Configured.", "context_mode": "delta"}, "delta"),
+        ({"message": "Configured.", "context_mode": "full"}, "full"),
+        ({"message": "Configured."}, "full"),
+        ({"message": "Configured.", "context_mode": "unknown"}, "full"),
+        ({"message": "Configured.", "context_mode": ["delta"]}, "full"),
+        (["Configured."], "full"),
+        ("Configured.", "full"),
+        (None, "full"),
+    ],
+)
+def test_configure_participant_context_mode(
+    response_json: Any, expected_mode: str
+) -> None:
+    """Tests the negotiation of the context mode."""
+    mocked_client = MagicMock()
+    mocked_client.post.return_value = MagicMock(
+        status_code=201, json=MagicMock(return_value=response_json)
+    )
+    with patch(
+        "simlab.utils.participant_api.utils_api_calls.get_participant_client",
+        return_value=mocked_client,
+    ):
+        context_mode = configure_participant(
+            "http://localhost:7000", "agent", {"key": "value"}
+        )
+
+    assert context_mode == ContextMode(expected_mode)
+    assert mocked_client.post.call_args.kwargs["json"] == {
+        "id": "agent",
+        "parameters": {"key": "value"},
+        "context_modes": ["full", "delta"],
+    }
+
+
+def test_configure_participant_failure() -> None:
+    """Tests that a failed configuration raises an error."""
+    mocked_client = MagicMock()
+    mocked_client.post.return_value = MagicMock(status_code=400)
+    with patch(
+        "simlab.utils.participant_api.utils_api_calls.get_participant_client",
+        return_value=mocked_client,
+    ):
+        with pytest.raises(RuntimeError):
+            configure_participant("http://localhost:7000", "agent", {})
+
+
+@pytest.mark.parametrize(
+    "context_mode, has_context",
+    [(ContextMode.FULL, True), (ContextMode.DELTA, False)],
+)
+def test_receive_utterance_context_mode(
+    context_mode: ContextMode, has_context: bool
+) -> None:
+    """Tests that the context is only sent in full context mode."""
+    agent = WrapperAgent("test_agent")
+    agent.context_mode = context_mode
+    agent._dialogue_connector = MagicMock()
+    agent._dialogue_connector._user.id = "test_user"
+    agent._dialogue_connector.dialogue_history.conversation_id = "conv_1"
+    agent._dialogue_connector.dialogue_history.utterances = [
+        Utterance("Hello", DialogueParticipant.AGENT),
+        Utterance("Hi", DialogueParticipant.USER),
+    ]
+
+    with patch(
+        "simlab.participant.wrapper_agent.get_utterance_response"
+    ) as mocked_get_utterance_response:
+        agent.receive_utterance(Utterance("Hi", DialogueParticipant.USER))
+
+    request_data = mocked_get_utterance_response.call_args.args[1]
+    assert request_data["message"] == "Hi"
+    assert request_data["conversation_id"] == "conv_1"
+    assert ("context" in request_data) == has_context
+    if has_context:
+        assert request_data["context"] == ["Hello", "Hi"]
+
+
+def test_wait_for_participant_backoff() -> None:
+    """Tests that readiness is polled until the readiness path succeeds."""
+    mocked_client = MagicMock()
+    mocked_client.get.side_effect = [
+        requests.exceptions.ConnectionError(),
+        MagicMock(status_code=503),
+        MagicMock(status_code=200),
+    ]
+    with patch(
+        "simlab.utils.participant_api.utils_api_calls.get_participant_client",
+        return_value=mocked_client,
+    ):
+        time_to_ready = wait_for_participant(
+            "http://localhost:7000",
+            readiness_path="/ready",
+            initial_delay=0.001,
+        )
+
+    assert time_to_ready >= 0
+    assert mocked_client.get.call_count == 3
+    assert mocked_client.get.call_args.args == ("/ready",)
+
+
+def test_wait_for_participant_stopped() -> None:
+    """Tests that waiting fails as soon as the participant stops."""
+    stopped = threading.Event()
+    mocked_client = MagicMock()
+
+    def _get(*args, **kwargs) -> None:
+        stopped.set()
+        raise requests.exceptions.ConnectionError()
+
+    mocked_client.get.side_effect = _get
+    with patch(
+        "simlab.utils.participant_api.utils_api_calls.get_participant_client",
+        return_value=mocked_client,
+    ):
+        with pytest.raises(RuntimeError, match="stopped"):
+            wait_for_participant(
+                "http://localhost:7000", stopped=stopped, initial_delay=60
+            )
+
+
+@pytest.mark.parametrize(
+    "statuses, ready",
+    [(["starting", "healthy"], True), (["starting", "unhealthy"], False)],
+)
+def test_wait_for_participant_health_status(
+    statuses: list, ready: bool
+) -> None:
+    """Tests that the health status takes precedence over the API."""
+    health_status = MagicMock(side_effect=statuses)
+    with patch(
+        "simlab.utils.participant_api.utils_api_calls.get_participant_client"
+    ) as mocked_get_participant_client:
+        if ready:
+            wait_for_participant(
+                "http://localhost:7000",
+                health_status=health_status,
+                initial_delay=0.001,
+            )
+        else:
+            with pytest.raises(RuntimeError, match="unhealthy"):
+                wait_for_participant(
+                    "http://localhost:7000",
+                    health_status=health_status,
+                    initial_delay=0.001,
+                )
+
+    assert health_status.call_count == 2
+    mocked_get_participant_client.assert_not_called()